@@ -22,7 +22,7 @@ else:
     sys.exit(2)
 
 # Pattoo libraries
-from pattoo_shared.configuration import ServerConfig as Config
+from pattoo.configuration import ConfigIngester as Config
 from pattoo_shared import files
 from pattoo_shared import log
 from pattoo_shared import converter
@@ -58,7 +58,7 @@ def main():
     success = files.process_cache(
         batch_size=args.batch_size,
         max_duration=args.max_duration,
-        script=True)
+        fileage=args.fileage)
     sys.exit(int(not success))
 
 
@@ -102,6 +102,14 @@ you are memory or database connection constrained. Default=500''')
 The maximum time in seconds that the script should run. This reduces the risk \
 of not keeping up with the cache data updates. Default=3600''')
 
+    parser.add_argument(
+        '-f', '--fileage',
+        default=config.fileage(),
+        type=int,
+        help='''\
+The minimum age in seconds of files to process. Use 0 to process all \
+completed files without delay. Default={}'''.format(config.fileage()))
+
     # Return
     args = parser.parse_args()
     return args
@@ -28,9 +28,13 @@ from pattoo_shared import files as shared_files
 from pattoo_shared.agent import Agent, AgentCLI
 from pattoo.constants import PATTOO_INGESTERD_NAME, PATTOO_INGESTER_SCRIPT
 from pattoo.configuration import ConfigIngester as Config
-from pattoo import sysinfo
-from pattoo.ingest import files
+from pattoo.configuration import ConfigAgentAPId
+from pattoo.ingest import files, watch
+from pattoo.ingest.pool import WorkerPool
+from pattoo.ingest.coordinate import Coordinator
+from pattoo.ingest.batch import BatchSizer
 from pattoo.db.db import connectivity
+from pattoo.db.table import pair
 
 
 class PollingAgent(Agent):
@@ -68,14 +72,50 @@ class PollingAgent(Agent):
         script = '{}{}{}'.format(
             _BIN_DIRECTORY, os.sep, PATTOO_INGESTER_SCRIPT)
 
+        # Pre-load the Pair cache if key-value pairs are looked up by this
+        # process instead of the worker processes. It persists across ingest
+        # cycles.
+        pair_cache = pair.cache()
+        workers = config.multiprocessing() is True and (
+            config.single_pass() is True or (
+                ConfigAgentAPId().cache_backend() != 'segment' and True in [
+                    config.parse_in_workers(), config.streaming(),
+                    config.pipeline()]))
+        if use_script is False and workers is False:
+            pair_cache.warm()
+
+        # Start worker processes that persist across ingest cycles
+        pool = None
+        if use_script is False and config.multiprocessing() is True:
+            pool = WorkerPool()
+            pool.start()
+
+        # Share the cache with ingesters on other servers
+        coordinator = None
+        if use_script is False and config.coordinate() is True:
+            coordinator = Coordinator()
+
+        # Adjust the number of files per batch across ingest cycles,
+        # starting with the configured batch_size
+        sizer = BatchSizer(
+            config.batch_size(),
+            duration=config.batch_duration(),
+            memory=config.batch_max_memory() * 1048576)
+
+        # Ingest data as soon as it arrives
+        if use_script is False and config.event_mode() is True:
+            watch.process_events(
+                pool=pool, coordinator=coordinator, sizer=sizer)
+            return
+
         # Post data to the remote server
         while True:
             # Get start time
             ts_start = time()
 
-            # Check lockfile status
-            if use_script is True:
-                _running = check_lockfile()
+            # Check lockfile status. Don't run at the same time as a
+            # manually started ingester script.
+            _running = check_lockfile()
 
             # Process
             if _running is False:
@@ -85,12 +125,26 @@ class PollingAgent(Agent):
                     success = not bool(_result)
                 else:
                     # Process cache with function
-                    success = files.process_cache()
+                    success = files.process_cache(
+                        pool=pool, coordinator=coordinator, sizer=sizer)
 
                 if bool(success) is False:
                     log_message = ('''\
 Ingester failed to run. Please check log files for possible causes.''')
                     log.log2warning(20029, log_message)
+
+                # Report Pair cache usage to help with sizing
+                stats = pair_cache.stats()
+                if pool is not None:
+                    _stats = pool.pair_stats()
+                else:
+                    _stats = {'hits': 0, 'misses': 0}
+                log_message = ('''\
+Pair cache: {} of {} entries used, {} hits, {} misses. Worker process Pair \
+caches: {} hits, {} misses\
+'''.format(stats['entries'], stats['size'], stats['hits'], stats['misses'],
+           _stats['hits'], _stats['misses']))
+                log.log2debug(20188, log_message)
             else:
                 log_message = ('''\
 Ingester is unexpectedly still running. Check your parameters of error logs \
@@ -113,7 +167,10 @@ for possible causes.''')
 
 
 def check_lockfile():
-    """Delete lockfile if found and ingester is not running.
+    """Determine whether the ingester script is running.
+
+    The script locks the ingester lock file while it runs. The lock is
+    released automatically if it stops unexpectedly.
 
     Args:
         None
@@ -122,23 +179,8 @@ def check_lockfile():
         running: True if ingester script is running
 
     """
-    # Initialize key variables
-    agent_name = 'pattoo_ingester'
-    config = Config()
-    lockfile = shared_files.lock_file(agent_name, config)
-
-    # Script running
-    running = sysinfo.process_running(PATTOO_INGESTER_SCRIPT)
-
-    # Delete lockfile if found and ingester is not running.
-    # Caused by possible crash.
-    if os.path.exists(lockfile) is True and running is False:
-        os.remove(lockfile)
-        log_message = ('''\
-Lock file {} found, but the {} script is not running\
-'''.format(lockfile, PATTOO_INGESTER_SCRIPT))
-        log.log2warning(20030, log_message)
-
+    # Check the lock
+    running = files.locked()
     return running
 
 
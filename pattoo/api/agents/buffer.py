@@ -0,0 +1,225 @@
+"""Pattoo agent API write buffer.
+
+Agent postings are queued in memory and a background thread appends them to
+the segment log in batches. This keeps disk latency out of the request path
+when many agents post at the same time.
+
+"""
+
+# Standard imports
+import atexit
+import queue
+import sys
+import threading
+import time
+
+# Import project libraries
+from pattoo_shared import log
+
+
+class Buffer():
+    """Queue agent postings and write them to the segment log in batches."""
+
+    def __init__(self, writer, max_items=10000, flush_items=1000,
+                 flush_age=0.5, fallback=None):
+        """Initialize the class.
+
+        Args:
+            writer: SegmentWriter object
+            max_items: Maximum number of postings to queue
+            flush_items: Number of queued postings that triggers a write
+            flush_age: Maximum number of seconds a posting is queued
+            fallback: Function to save a queued posting if the writer fails.
+                Called with the queued posting. Returns True if successful.
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._writer = writer
+        self._queue = queue.Queue(maxsize=max(1, max_items))
+        self._flush_items = max(1, flush_items)
+        self._flush_age = flush_age
+        self._fallback = fallback
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def put(self, data):
+        """Queue a posting.
+
+        Args:
+            data: Agent posting data
+
+        Returns:
+            result: True if successful. False if the buffer is full.
+
+        """
+        # Start writing in the background. The thread is started on first
+        # use so that it runs in the process handling the requests.
+        self._start()
+
+        # Queue without waiting
+        try:
+            self._queue.put_nowait(data)
+            result = True
+        except queue.Full:
+            result = False
+        return result
+
+    def flush(self):
+        """Write all queued postings.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of postings written
+
+        """
+        # Initialize key variables
+        items = []
+
+        # Write
+        while True:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write(items)
+        result = len(items)
+        return result
+
+    def close(self):
+        """Stop the background thread and write all queued postings.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Stop the thread
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+            self._stop.clear()
+
+        # Write the remaining postings
+        self.flush()
+
+    def _start(self):
+        """Start the background thread if it isn't running.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Start
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self):
+        """Write queued postings until stopped. Runs in a thread.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        while self._stop.is_set() is False:
+            # Wait for the first posting of the batch
+            try:
+                items = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+
+            # Add postings until the batch is large or old enough
+            deadline = time.time() + self._flush_age
+            while len(items) < self._flush_items:
+                remaining = deadline - time.time()
+                if remaining <= 0 or self._stop.is_set() is True:
+                    break
+                try:
+                    items.append(
+                        self._queue.get(timeout=min(remaining, 0.1)))
+                except queue.Empty:
+                    continue
+            self._write(items)
+
+    def _write(self, items):
+        """Append postings to the segment log.
+
+        Args:
+            items: List of agent posting data
+
+        Returns:
+            None
+
+        """
+        # Nothing to do
+        if bool(items) is False:
+            return
+
+        # Write
+        try:
+            self._writer.extend(items)
+            return
+        except:
+            _exception = sys.exc_info()
+            log_message = ('''\
+Failed to write {} buffered agent postings'''.format(len(items)))
+            log.log2exception(20231, _exception, message=log_message)
+
+        # Save the postings one at a time instead. They are only lost if
+        # this also fails.
+        lost = len(items)
+        if self._fallback is not None:
+            lost = 0
+            for item in items:
+                try:
+                    success = self._fallback(item)
+                except:
+                    success = False
+                if bool(success) is False:
+                    lost += 1
+        if bool(lost) is True:
+            log_message = ('''\
+Dropped {} buffered agent postings that could not be saved'''.format(lost))
+            log.log2warning(20241, log_message)
+
+
+def buffer(writer, config, fallback=None):
+    """Create a Buffer that is flushed when the process exits.
+
+    Args:
+        writer: SegmentWriter object
+        config: ConfigAgentAPId object
+        fallback: Function to save a queued posting if the writer fails
+
+    Returns:
+        result: Buffer object
+
+    """
+    # Create the buffer
+    result = Buffer(
+        writer,
+        max_items=config.buffer_size(),
+        flush_items=config.buffer_flush_size(),
+        flush_age=config.buffer_flush_age(),
+        fallback=fallback)
+    atexit.register(result.close)
+    return result
@@ -18,9 +18,22 @@ from pattoo_shared.constants import CACHE_KEYS
 
 from pattoo.constants import PATTOO_API_AGENT_NAME
 from pattoo import configuration
+from pattoo.data import shard
+from pattoo import serialize
+from pattoo.segment import SegmentWriter
+from pattoo.api.agents.buffer import buffer
 
 encryption = encrypt.Encryption(PATTOO_API_AGENT_NAME)
 
+# Segment writer of the API process. Created when first used.
+_WRITER = None
+
+# Write buffer of the API process. Created when first used.
+_BUFFER = None
+
+# Direct database ingest queue of the API process. Created when first used.
+_DIRECT = None
+
 # Define the POST global variable
 POST = Blueprint('POST', __name__)
 
@@ -277,6 +290,7 @@ def _save_data(data, source):
 
     Args:
         data: Data dict received from agents
+        source: Unique Identifier of an pattoo agent
 
     Returns:
         success: True if successful
@@ -288,7 +302,6 @@ def _save_data(data, source):
 
     # Read configuration
     config = configuration.ConfigAgentAPId()
-    cache_dir = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
 
     # Abort if data isn't a list
     if isinstance(data, dict) is False:
@@ -308,36 +321,188 @@ def _save_data(data, source):
             log.log2warning(20018, log_message)
             return success
 
+    # Queue the data to be added directly to the database if configured.
+    # The data is cached if the queue is full.
+    if config.direct_ingest() is True:
+        if _direct(config).put((source, data)) is True:
+            success = True
+            return success
+
+    # Queue the data to be written to the segment log in batches if
+    # configured
+    if config.cache_backend() == 'segment' and config.buffer() is True:
+        if _buffer(config).put(data) is False:
+            log_message = 'Write buffer full. Rejecting agent posting.'
+            log.log2warning(20232, log_message)
+            abort(503, description='Write buffer full. Try again later.')
+        success = True
+        return success
+
+    # Cache the data
+    success = _cache(data, source, config=config)
+    return success
+
+
+def _cache(data, source, config=None):
+    """Save validated agent data to the cache for the ingester.
+
+    Args:
+        data: Data dict received from agents
+        source: Unique Identifier of an pattoo agent
+        config: ConfigAgentAPId object. Created if None.
+
+    Returns:
+        success: True if successful
+
+    """
+    # Initialize key variables
+    success = False
+
     # Extract key values from posting
     try:
         timestamp = data['pattoo_agent_timestamp']
+        pattoo_agent_id = data['pattoo_agent_id']
     except:
         _exception = sys.exc_info()
         log_message = ('API Failure')
         log.log2exception(20025, _exception, message=log_message)
         return success
 
+    # Read configuration
+    if config is None:
+        config = configuration.ConfigAgentAPId()
+    shards = config.cache_shards()
+    if bool(shards) is True:
+        cache_dir = config.cache_shard_directory(
+            shard(pattoo_agent_id, shards))
+    else:
+        cache_dir = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+    binary = config.cache_format() == 'msgpack'
+
+    # Append data to the segment log if configured
+    if config.cache_backend() == 'segment':
+        try:
+            _writer(config).append(data)
+        except:
+            _exception = sys.exc_info()
+            log_message = ('API Failure')
+            log.log2exception(20219, _exception, message=log_message)
+            return success
+        success = True
+        return success
+
     # Create filename. Add a suffix in the event the source is posting
-    # frequently.
+    # frequently. The extension shows the format of the data.
+    encoded = serialize.encode(data, binary=binary)
     suffix = str(randrange(100000)).zfill(6)
-    json_path = (
-        '{}{}{}_{}_{}.json'.format(
-            cache_dir, os.sep, timestamp, source, suffix))
-
-    # Create cache file
+    filepath = (
+        '{}{}{}_{}_{}{}'.format(
+            cache_dir, os.sep, timestamp, source, suffix,
+            serialize.suffix(encoded)))
+
+    # Create cache file. Write to a temporary file that the ingester ignores,
+    # then rename it so that the ingester never reads partial files.
+    temp_path = '{}.tmp'.format(filepath)
     try:
-        with open(json_path, 'w+') as temp_file:
-            json.dump(data, temp_file)
+        with open(temp_path, 'wb') as temp_file:
+            temp_file.write(encoded)
+        os.replace(temp_path, filepath)
     except Exception as err:
         log_message = '{}'.format(err)
         log.log2warning(20016, log_message)
+        _remove(temp_path)
         return success
     except:
         _exception = sys.exc_info()
         log_message = ('API Failure')
         log.log2exception(20017, _exception, message=log_message)
+        _remove(temp_path)
         return success
 
     # Return
     success = True
     return success
+
+
+def _writer(config):
+    """Get the segment writer of the API process.
+
+    Args:
+        config: ConfigAgentAPId object
+
+    Returns:
+        result: SegmentWriter object
+
+    """
+    # Create the writer once per process
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = SegmentWriter(
+            config.segment_directory(),
+            max_bytes=config.segment_size(),
+            max_age=config.segment_age(),
+            binary=config.cache_format() == 'msgpack')
+    result = _WRITER
+    return result
+
+
+def _buffer(config):
+    """Get the write buffer of the API process.
+
+    Args:
+        config: ConfigAgentAPId object
+
+    Returns:
+        result: Buffer object
+
+    """
+    # Create the buffer once per process. Postings that can't be written
+    # in a batch are cached one at a time as they are without the buffer.
+    # The source only names cache files, which the segment log doesn't use.
+    global _BUFFER
+    if _BUFFER is None:
+        _BUFFER = buffer(
+            _writer(config), config,
+            fallback=lambda data: _cache(data, None, config=config))
+    result = _BUFFER
+    return result
+
+
+def _direct(config):
+    """Get the direct database ingest queue of the API process.
+
+    Args:
+        config: ConfigAgentAPId object
+
+    Returns:
+        result: Buffer object
+
+    """
+    # Create the queue once per process. The database libraries are only
+    # imported when they are required.
+    global _DIRECT
+    if _DIRECT is None:
+        from pattoo.ingest.direct import Writer
+        _DIRECT = buffer(
+            Writer(_cache), config,
+            fallback=lambda item: _cache(item[1], item[0], config=config))
+    result = _DIRECT
+    return result
+
+
+def _remove(filepath):
+    """Delete a file if it exists.
+
+    Args:
+        filepath: File path
+
+    Returns:
+        None
+
+    """
+    # Delete
+    if os.path.exists(filepath) is True:
+        try:
+            os.remove(filepath)
+        except:
+            pass
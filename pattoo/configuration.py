@@ -12,6 +12,9 @@ from pattoo.constants import (
     PATTOO_API_WEB_NAME, PATTOO_API_AGENT_NAME,
     PATTOO_INGESTERD_NAME)
 
+# Agent cache shard directories already created by this process
+_SHARD_DIRECTORIES = set()
+
 
 class ConfigAPId(ServerConfig):
     """Class gathers all configuration information.
@@ -279,8 +282,8 @@ class ConfigAgentAPId(ServerConfig):
             result = int(intermediate)
         return result
 
-    def session_directory(self):
-        """Get directory for storing session infomation.
+    def cache_shards(self):
+        """Get cache_shards.
 
         Args:
             None
@@ -289,42 +292,131 @@ class ConfigAgentAPId(ServerConfig):
             result: result
 
         """
+        # Initialize key varibles
+        default = 0
+
         # Get result
-        result = '{}{}session'.format(self.cache_directory(), os.sep)
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'cache_shards'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
 
-        # Create directory if it doesn't exist
-        files.mkdir(result)
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
 
-        # Change filemode to 700
-        # Only allow the user to access the flash session folder
-        os.chmod(result, stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR)
+    def cache_shard_directory(self, shard):
+        """Get the agent cache subdirectory of a shard.
+
+        Args:
+            shard: Shard number
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        result = '{}{}{:03d}'.format(
+            self.agent_cache_directory(PATTOO_API_AGENT_NAME), os.sep, shard)
+
+        # Create directory if it doesn't exist. This is only checked once
+        # per process as it is done for every agent posting.
+        if result not in _SHARD_DIRECTORIES:
+            files.mkdir(result)
+            _SHARD_DIRECTORIES.add(result)
         return result
 
+    def cache_directories(self, shards=None):
+        """Get the agent cache directories.
 
-class ConfigIngester(ServerConfig):
-    """Class gathers all configuration information.
+        Args:
+            shards: List of shard numbers. The agent cache directory and the
+                subdirectories of all shards are returned if None. The agent
+                cache directory is only returned with the subdirectory of
+                shard 0 otherwise, so that files cached before sharding was
+                enabled are ingested.
 
-    Only processes the following YAML keys in the configuration file:
+        Returns:
+            result: List of directories
 
-        The value of the PATTOO_INGESTERD_NAME constant
+        """
+        # Get the directories of all shards
+        if shards is None:
+            shards = range(0, self.cache_shards())
+            result = [self.agent_cache_directory(PATTOO_API_AGENT_NAME)]
+        elif 0 in shards:
+            result = [self.agent_cache_directory(PATTOO_API_AGENT_NAME)]
+        else:
+            result = []
 
-    """
+        # Return
+        result.extend([self.cache_shard_directory(_) for _ in shards])
+        return result
 
-    def __init__(self):
-        """Initialize the class.
+    def cache_backend(self):
+        """Get cache_backend.
 
         Args:
             None
 
         Returns:
+            result: result
+
+        """
+        # Initialize key variables
+        default = 'file'
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'cache_backend'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            result = str(_result).lower().strip()
+            if result not in ['file', 'segment']:
+                result = default
+        return result
+
+    def cache_format(self):
+        """Get cache_format.
+
+        Args:
             None
 
+        Returns:
+            result: result
+
         """
-        # Instantiate the Config parent
-        ServerConfig.__init__(self)
+        # Initialize key variables
+        default = 'json'
 
-    def ingester_interval(self):
-        """Get ingester_interval.
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'cache_format'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            result = str(_result).lower().strip()
+            if result not in ['json', 'msgpack']:
+                result = default
+        return result
+
+    def buffer(self):
+        """Get buffer.
 
         Args:
             None
@@ -334,24 +426,49 @@ class ConfigIngester(ServerConfig):
 
         """
         # Get result
-        key = PATTOO_INGESTERD_NAME
-        sub_key = 'ingester_interval'
-        result = search(
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'buffer'
+        _result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
-        # Make sure we have an integer
-        try:
-            result = max(15, abs(int(result)))
-        except:
-            result = None
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
 
-        # Default to 1 hour
-        if result is None:
-            result = 3600
+    def buffer_size(self):
+        """Get buffer_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 10000
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'buffer_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
         return result
 
-    def graceful_timeout(self):
-        """Get graceful_timeout.
+    def buffer_flush_size(self):
+        """Get buffer_flush_size.
 
         Args:
             None
@@ -360,25 +477,56 @@ class ConfigIngester(ServerConfig):
             result: result
 
         """
+        # Initialize key varibles
+        default = 1000
+
         # Get result
-        key = PATTOO_INGESTERD_NAME
-        sub_key = 'graceful_timeout'
-        result = search(
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'buffer_flush_size'
+        _result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
-        # Make sure we have an integer
-        try:
-            result = int(result)
-        except:
-            result = None
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
 
-        # Default to 1 hour
-        if result is None:
-            result = 10
+    def buffer_flush_age(self):
+        """Get buffer_flush_age.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 0.5
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'buffer_flush_age'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, float(_result))
+            except:
+                result = default
         return result
 
-    def multiprocessing(self):
-        """Get multiprocessing.
+    def direct_ingest(self):
+        """Get direct_ingest.
 
         Args:
             None
@@ -388,20 +536,20 @@ class ConfigIngester(ServerConfig):
 
         """
         # Get result
-        key = PATTOO_INGESTERD_NAME
-        sub_key = 'multiprocessing'
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'direct_ingest'
         _result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
         # Return
         if _result is None:
-            result = True
+            result = False
         else:
             result = bool(_result)
         return result
 
-    def batch_size(self):
-        """Get batch_size.
+    def segment_size(self):
+        """Get segment_size.
 
         Args:
             None
@@ -411,11 +559,11 @@ class ConfigIngester(ServerConfig):
 
         """
         # Initialize key varibles
-        default = 500
+        default = 16777216
 
         # Get result
-        key = PATTOO_INGESTERD_NAME
-        sub_key = 'batch_size'
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'segment_size'
         _result = search(
             key, sub_key, self._server_yaml_configuration, die=False)
 
@@ -424,7 +572,719 @@ class ConfigIngester(ServerConfig):
             result = default
         else:
             try:
-                result = int(_result)
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def segment_age(self):
+        """Get segment_age.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 10
+
+        # Get result
+        key = PATTOO_API_AGENT_NAME
+        sub_key = 'segment_age'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def segment_directory(self):
+        """Get directory for storing agent cache segment files.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        result = '{}{}segments'.format(
+            self.agent_cache_directory(PATTOO_API_AGENT_NAME), os.sep)
+
+        # Create directory if it doesn't exist
+        files.mkdir(result)
+        return result
+
+    def session_directory(self):
+        """Get directory for storing session infomation.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        result = '{}{}session'.format(self.cache_directory(), os.sep)
+
+        # Create directory if it doesn't exist
+        files.mkdir(result)
+
+        # Change filemode to 700
+        # Only allow the user to access the flash session folder
+        os.chmod(result, stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR)
+        return result
+
+
+class ConfigIngester(ServerConfig):
+    """Class gathers all configuration information.
+
+    Only processes the following YAML keys in the configuration file:
+
+        The value of the PATTOO_INGESTERD_NAME constant
+
+    """
+
+    def __init__(self):
+        """Initialize the class.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Instantiate the Config parent
+        ServerConfig.__init__(self)
+
+    def ingester_interval(self):
+        """Get ingester_interval.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'ingester_interval'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Make sure we have an integer
+        try:
+            result = max(15, abs(int(result)))
+        except:
+            result = None
+
+        # Default to 1 hour
+        if result is None:
+            result = 3600
+        return result
+
+    def graceful_timeout(self):
+        """Get graceful_timeout.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'graceful_timeout'
+        result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Make sure we have an integer
+        try:
+            result = int(result)
+        except:
+            result = None
+
+        # Default to 1 hour
+        if result is None:
+            result = 10
+        return result
+
+    def multiprocessing(self):
+        """Get multiprocessing.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'multiprocessing'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = True
+        else:
+            result = bool(_result)
+        return result
+
+    def single_pass(self):
+        """Get single_pass.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'single_pass'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def parse_in_workers(self):
+        """Get parse_in_workers.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'parse_in_workers'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def streaming(self):
+        """Get streaming.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'streaming'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def stream_max_records(self):
+        """Get stream_max_records.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 100000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'stream_max_records'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def pipeline(self):
+        """Get pipeline.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'pipeline'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def pipeline_parsers(self):
+        """Get pipeline_parsers.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 2
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'pipeline_parsers'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def pipeline_writers(self):
+        """Get pipeline_writers.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = os.cpu_count() or 1
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'pipeline_writers'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def pipeline_queue_size(self):
+        """Get pipeline_queue_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 100
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'pipeline_queue_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def coordinate(self):
+        """Get coordinate.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'coordinate'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def event_mode(self):
+        """Get event_mode.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'event_mode'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = False
+        else:
+            result = bool(_result)
+        return result
+
+    def event_max_files(self):
+        """Get event_max_files.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 100
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'event_max_files'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def event_max_age(self):
+        """Get event_max_age.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 2
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'event_max_age'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, float(_result))
+            except:
+                result = default
+        return result
+
+    def batch_size(self):
+        """Get batch_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 500
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'batch_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = int(_result)
+            except:
+                result = default
+        return result
+
+    def batch_duration(self):
+        """Get batch_duration.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 0
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'batch_duration'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, float(_result))
+            except:
+                result = default
+        return result
+
+    def batch_max_memory(self):
+        """Get batch_max_memory.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 0
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'batch_max_memory'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def fileage(self):
+        """Get fileage.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 10
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'fileage'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def pair_cache_size(self):
+        """Get pair_cache_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 100000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'pair_cache_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def data_chunk_size(self):
+        """Get data_chunk_size.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 1000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'data_chunk_size'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
+            except:
+                result = default
+        return result
+
+    def bulk_load_threshold(self):
+        """Get bulk_load_threshold.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 0
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'bulk_load_threshold'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(0, int(_result))
+            except:
+                result = default
+        return result
+
+    def worker_max_tasks(self):
+        """Get worker_max_tasks.
+
+        Args:
+            None
+
+        Returns:
+            result: result
+
+        """
+        # Initialize key varibles
+        default = 1000
+
+        # Get result
+        key = PATTOO_INGESTERD_NAME
+        sub_key = 'worker_max_tasks'
+        _result = search(
+            key, sub_key, self._server_yaml_configuration, die=False)
+
+        # Return
+        if _result is None:
+            result = default
+        else:
+            try:
+                result = max(1, int(_result))
             except:
                 result = default
         return result
@@ -31,6 +31,12 @@ IDXTimestampValue = collections.namedtuple(
 ChecksumLookup = collections.namedtuple(
     'ChecksumLookup', 'idx_datapoint last_timestamp polling_interval')
 
+IngestCounters = collections.namedtuple(
+    'IngestCounters', 'agents records rows')
+
+# Maximum number of rows per bulk database query or insert statement
+DB_CHUNK_SIZE = 1000
+
 DbRowUser = collections.namedtuple(
     'DbRowUser',
     'username password first_name last_name enabled role password_expired')
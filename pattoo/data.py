@@ -1,5 +1,8 @@
 """Data manipulation functions used by pattoo."""
 
+# Standard imports
+import zlib
+
 
 def integerize(value):
     """Convert value to integer.
@@ -25,3 +28,41 @@ def integerize(value):
 
     # Return
     return result
+
+
+def chunks(items, size):
+    """Split a list into successive sublists of a maximum size.
+
+    Args:
+        items: List to split
+        size: Maximum number of entries per sublist
+
+    Returns:
+        result: List of sublists
+
+    """
+    # Initialize key variables
+    size = max(1, int(size))
+    items = list(items)
+
+    # Return
+    result = [items[_:_ + size] for _ in range(0, len(items), size)]
+    return result
+
+
+def shard(value, shards):
+    """Get the shard number of a value.
+
+    The same value is always assigned to the same shard, in every process.
+
+    Args:
+        value: Value to assign to a shard
+        shards: Number of shards
+
+    Returns:
+        result: Shard number
+
+    """
+    # Return
+    result = zlib.crc32(str(value).encode()) % max(1, int(shards))
+    return result
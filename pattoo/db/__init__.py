@@ -25,6 +25,10 @@ from pattoo.configuration import ConfigAPId as Config
 POOL = None
 URL = None
 
+# Pool of connections that allow LOAD DATA LOCAL INFILE statements. Created
+# on first use by bulk_pool()
+BULK_POOL = None
+
 
 def main():
     """Process agent data.
@@ -40,57 +44,94 @@ def main():
     use_mysql = True
     global POOL
     global URL
-    pool_timeout = 30
-    pool_recycle = min(10, pool_timeout - 10)
 
     # Get configuration
     config = Config()
 
-    # Define SQLAlchemy parameters from configuration
-    pool_size = config.db_pool_size()
-    max_overflow = config.db_max_overflow()
-
     # Create DB connection pool
     if use_mysql is True:
         URL = ('mysql+pymysql://{}:{}@{}/{}?charset=utf8mb4'.format(
             config.db_username(), config.db_password(),
             config.db_hostname(), config.db_name()))
 
-        # Fix for multiprocessing on pools.
-        # _add_engine_pidguard(QueuePool)
-
         # Add MySQL to the pool
-        db_engine = create_engine(
-            URL,
-            echo=False,
-            echo_pool=False,
-            encoding='utf8',
-            poolclass=QueuePool,
-            max_overflow=max_overflow,
-            pool_size=pool_size,
-            pool_pre_ping=True,
-            pool_recycle=pool_recycle,
-            pool_timeout=pool_timeout)
-
-        # Fix for multiprocessing on engines.
-        # _add_engine_pidguard(db_engine)
-
-        # Ensure connections are disposed before sharing engine.
-        db_engine.dispose()
-
-        # Create database session object
-        POOL = scoped_session(
-            sessionmaker(
-                autoflush=True,
-                autocommit=False,
-                bind=db_engine
-            )
-        )
+        POOL = _pool(config.db_pool_size(), config.db_max_overflow())
 
     else:
         POOL = None
 
 
+def bulk_pool():
+    """Get the pool of connections that allow LOAD DATA LOCAL INFILE.
+
+    The pool is created on first use, so "local_infile" is only enabled on
+    the connections of processes that bulk load data.
+
+    Args:
+        None
+
+    Returns:
+        BULK_POOL: Database session object
+
+    """
+    # Create the pool on first use. A single connection is normally used.
+    global BULK_POOL
+    if BULK_POOL is None and URL is not None:
+        BULK_POOL = _pool(
+            1, Config().db_max_overflow(), connect_args={'local_infile': True})
+    return BULK_POOL
+
+
+def _pool(pool_size, max_overflow, connect_args=None):
+    """Create a pool of database connections.
+
+    Args:
+        pool_size: Number of connections kept in the pool
+        max_overflow: Number of connections allowed in excess of pool_size
+        connect_args: Dict of database driver connection arguments
+
+    Returns:
+        result: Database session object
+
+    """
+    # Initialize key variables
+    pool_timeout = 30
+    pool_recycle = min(10, pool_timeout - 10)
+    if connect_args is None:
+        connect_args = {}
+
+    # Create the engine
+    db_engine = create_engine(
+        URL,
+        echo=False,
+        echo_pool=False,
+        encoding='utf8',
+        poolclass=QueuePool,
+        max_overflow=max_overflow,
+        pool_size=pool_size,
+        pool_pre_ping=True,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        connect_args=connect_args)
+
+    # Fix for multiprocessing on engines. Connections inherited from a
+    # parent process are discarded and recreated in the child process.
+    _add_engine_pidguard(db_engine)
+
+    # Ensure connections are disposed before sharing engine.
+    db_engine.dispose()
+
+    # Create database session object
+    result = scoped_session(
+        sessionmaker(
+            autoflush=True,
+            autocommit=False,
+            bind=db_engine
+        )
+    )
+    return result
+
+
 def _add_engine_pidguard(engine):
     """Add multiprocessing guards.
 
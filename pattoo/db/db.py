@@ -9,12 +9,12 @@ from sqlalchemy import and_
 
 # pattoo libraries
 from pattoo_shared import log
-from pattoo.db import POOL
+from pattoo.db import POOL, bulk_pool
 from pattoo.db.models import DataPoint
 
 
 @contextmanager
-def db_modify(error_code, die=True, close=True):
+def db_modify(error_code, die=True, close=True, bulk=False):
     """Provide a transactional scope around Update / Insert operations.
 
     From https://docs.sqlalchemy.org/en/13/orm/session_basics.html
@@ -24,6 +24,7 @@ def db_modify(error_code, die=True, close=True):
         die: Die if True
         close: Close session if True. GraphQL mutations sometimes require the
             session to remain open.
+        bulk: Use a connection that allows LOAD DATA LOCAL INFILE if True
 
     Returns:
         None
@@ -33,7 +34,10 @@ def db_modify(error_code, die=True, close=True):
     prefix = 'Unable to modify database.'
 
     # Create session from pool
-    session = POOL()
+    if bool(bulk) is True:
+        session = bulk_pool()()
+    else:
+        session = POOL()
 
     # Setup basic functions
     try:
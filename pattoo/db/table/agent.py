@@ -4,11 +4,13 @@
 from collections import namedtuple
 
 # PIP3 imports
-from sqlalchemy import and_
+from sqlalchemy import and_, tuple_
 
 # Import project libraries
+from pattoo import data
 from pattoo.db import db
 from pattoo.db.models import Agent
+from pattoo.constants import DB_CHUNK_SIZE
 
 
 def idx_exists(idx):
@@ -60,6 +62,87 @@ def idx_agent(agent_id, agent_target, agent_program):
     return _idx_agent
 
 
+def idx_agents(items):
+    """Get the db Agent.idx_agent values for multiple agents.
+
+    Agent table entries are created for agents that don't exist.
+
+    Args:
+        items: List of (agent_id, agent_target, agent_program) tuples
+
+    Returns:
+        result: Dict of Agent.idx_agent values keyed by
+            (agent_id, agent_target)
+
+    """
+    # Initialize key variables
+    rows = []
+    uniques = {}
+
+    # Make the agents unique
+    for agent_id, agent_target, agent_program in items:
+        uniques[(agent_id, agent_target)] = agent_program
+
+    # Get the pre-existing agents
+    result = exists_lookup(list(uniques.keys()))
+
+    # Create records in the Agent table
+    for (agent_id, agent_target), agent_program in sorted(uniques.items()):
+        if (agent_id, agent_target) in result:
+            continue
+        rows.append({
+            'agent_id': agent_id.encode(),
+            'agent_polled_target': agent_target.encode(),
+            'agent_program': agent_program.encode()})
+
+    if bool(rows) is True:
+        for chunk in data.chunks(rows, DB_CHUNK_SIZE):
+            with db.db_modify(20190, die=True) as session:
+                session.execute(
+                    Agent.__table__.insert().prefix_with(
+                        'IGNORE').values(chunk))
+        result.update(exists_lookup(
+            [_key for _key in uniques.keys() if _key not in result]))
+
+    # Return
+    return result
+
+
+def exists_lookup(items):
+    """Get the db Agent.idx_agent values for multiple Agents.
+
+    Args:
+        items: List of (agent_id, agent_target) tuples
+
+    Returns:
+        result: Dict of Agent.idx_agent values keyed by
+            (agent_id, agent_target)
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Encode the items
+    items = [(_id.encode(), _target.encode()) for _id, _target in items]
+
+    # Get the result
+    for chunk in data.chunks(items, DB_CHUNK_SIZE):
+        with db.db_query(20191) as session:
+            rows = session.query(
+                Agent.idx_agent,
+                Agent.agent_id,
+                Agent.agent_polled_target).filter(tuple_(
+                    Agent.agent_id, Agent.agent_polled_target).in_(chunk))
+
+        for row in rows:
+            result[(
+                row.agent_id.decode(),
+                row.agent_polled_target.decode())] = row.idx_agent
+
+    # Return
+    return result
+
+
 def exists(agent_id, agent_target):
     """Get the db Agent.idx_agent value for specific Agent.
 
@@ -4,9 +4,10 @@
 # Import project libraries
 from pattoo_shared.constants import MAX_KEYPAIR_LENGTH
 from pattoo_shared import log
+from pattoo import data
 from pattoo.db import db
 from pattoo.db.models import Chart
-from pattoo.constants import DbRowChart
+from pattoo.constants import DbRowChart, DB_CHUNK_SIZE
 
 
 def idx_exists(idx):
@@ -61,6 +62,35 @@ def exists(checksum):
     return result
 
 
+def exists_lookup(checksums):
+    """Get the Chart.idx_chart values for multiple checksums.
+
+    Args:
+        checksums: List of chart checksums
+
+    Returns:
+        result: Dict of Chart.idx_chart values keyed by checksum
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Encode the checksums
+    items = [checksum.encode() for checksum in checksums]
+
+    # Get checksums from database
+    for chunk in data.chunks(items, DB_CHUNK_SIZE):
+        with db.db_query(20192) as session:
+            rows = session.query(Chart.idx_chart, Chart.checksum).filter(
+                Chart.checksum.in_(chunk))
+
+        for row in rows:
+            result[row.checksum.decode()] = row.idx_chart
+
+    # Return
+    return result
+
+
 def insert_row(row):
     """Create a User table entry.
 
@@ -89,3 +119,34 @@ def insert_row(row):
         )
     with db.db_modify(20052, die=True) as session:
         session.add(row)
+
+
+def insert_rows(rows):
+    """Create multiple Chart table entries.
+
+    Args:
+        rows: List of DbRowChart objects
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    _rows = []
+
+    # Verify values
+    for row in rows:
+        if bool(row) is False or isinstance(row, DbRowChart) is False:
+            log_message = 'Invalid chart type being inserted'
+            log.log2die(20193, log_message)
+
+        # Add values to list for future insertion
+        _rows.append({
+            'name': row.name.strip()[:MAX_KEYPAIR_LENGTH].encode(),
+            'checksum': row.checksum.strip()[:MAX_KEYPAIR_LENGTH].encode(),
+            'enabled': int(bool(row.enabled))})
+
+    # Insert
+    for chunk in data.chunks(_rows, DB_CHUNK_SIZE):
+        with db.db_modify(20194, die=True) as session:
+            session.execute(Chart.__table__.insert().values(chunk))
@@ -6,9 +6,10 @@ from sqlalchemy import and_
 
 # Import project libraries
 from pattoo_shared import log
+from pattoo import data
 from pattoo.db import db
 from pattoo.db.models import ChartDataPoint
-from pattoo.constants import DbRowChartDataPoint
+from pattoo.constants import DbRowChartDataPoint, DB_CHUNK_SIZE
 
 
 def idx_exists(idx):
@@ -88,3 +89,37 @@ def insert_row(row):
         )
     with db.db_modify(20032, die=True) as session:
         session.add(row)
+
+
+def insert_rows(rows):
+    """Create multiple ChartDataPoint table entries.
+
+    Args:
+        rows: List of DbRowChartDataPoint objects
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    _rows = []
+
+    # Verify values
+    for row in rows:
+        if bool(row) is False or isinstance(
+                row, DbRowChartDataPoint) is False:
+            log_message = 'Invalid chart_datapoint type being inserted'
+            log.log2die(20195, log_message)
+
+        # Add values to list for future insertion
+        _rows.append({
+            'idx_chart': row.idx_chart,
+            'idx_datapoint': row.idx_datapoint,
+            'enabled': int(bool(row.enabled))})
+
+    # Insert
+    for chunk in data.chunks(_rows, DB_CHUNK_SIZE):
+        with db.db_modify(20196, die=True) as session:
+            session.execute(
+                ChartDataPoint.__table__.insert().prefix_with(
+                    'IGNORE').values(chunk))
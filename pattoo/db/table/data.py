@@ -3,45 +3,152 @@
 
 # Standard libraries
 from operator import attrgetter
+import os
+import tempfile
+import time
 
 # PIP libraries
-from sqlalchemy import and_
+from sqlalchemy import and_, case, text
+from sqlalchemy.dialects.mysql import insert
 
 # Import project libraries
+from pattoo_shared import log
+from pattoo import data
 from pattoo.db import db
 from pattoo.db.models import Data, DataPoint
+from pattoo.constants import DB_CHUNK_SIZE
+from pattoo.configuration import ConfigIngester as Config
 
 
-def insert_rows(items):
+def insert_rows(items, chunk_size=None):
     """Insert timeseries data.
 
     Args:
         items: List of IDXTimestampValue objects
+        chunk_size: Number of rows per INSERT statement. Uses the
+            "data_chunk_size" configuration value if None.
 
     Returns:
-        result: DataPoint.checksum value
+        result: Number of Data table rows processed
 
     """
     # Initialize key variables
-    _rows = []
-    last_timestamps = {}
-    polling_intervals = {}
+    result = 0
 
     # Fail safe checks
     if bool(items) is False:
-        return
-
-    # Update the data
-    for item in sorted(items, key=attrgetter('timestamp')):
-        # Insert data
-        value = round(item.value, 10)
-        _rows.append(
-            Data(idx_datapoint=item.idx_datapoint,
-                 timestamp=item.timestamp,
-                 value=value)
-        )
-
-        # Get the most recent timestamp for each idx_datapoint
+        return result
+    if chunk_size is None:
+        chunk_size = Config().data_chunk_size()
+
+    # Create an INSERT statement that makes replays of previously ingested
+    # data idempotent. Values are supplied in executemany() batches without
+    # creating ORM objects.
+    statement = insert(Data.__table__)
+    statement = statement.on_duplicate_key_update(
+        value=statement.inserted.value)
+
+    # Update the last_timestamp and insert the data in a single transaction.
+    # Both succeed or fail together, preventing 'Duplicate entry' errors in
+    # the event you need to re-run the ingester after a previous crash.
+    start = time.time()
+    with db.db_modify(20012, die=True) as session:
+        _update_datapoints(session, items)
+
+        # Insert in primary key order
+        for chunk in data.chunks(
+                sorted(items, key=attrgetter('idx_datapoint', 'timestamp')),
+                chunk_size):
+            session.execute(
+                statement,
+                [{'idx_datapoint': item.idx_datapoint,
+                  'timestamp': item.timestamp,
+                  'value': round(item.value, 10)} for item in chunk])
+            result += len(chunk)
+
+    # Log the insertion rate
+    _log_rate(result, time.time() - start)
+    return result
+
+
+def load_rows(items):
+    """Bulk load timeseries data using LOAD DATA LOCAL INFILE.
+
+    The data is written to a temporary tab separated file which is then
+    loaded by the database server. Falls back to insert_rows() if the load
+    fails, for example when "local_infile" is disabled on the server.
+
+    Args:
+        items: List of IDXTimestampValue objects
+
+    Returns:
+        result: Number of Data table rows processed
+
+    """
+    # Initialize key variables
+    result = 0
+    success = False
+    statement = text('''\
+LOAD DATA LOCAL INFILE :filename REPLACE INTO TABLE {} \
+FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' \
+(idx_datapoint, timestamp, value)'''.format(Data.__tablename__))
+
+    # Fail safe checks
+    if bool(items) is False:
+        return result
+
+    # Write the data to a temporary file in primary key order
+    start = time.time()
+    with tempfile.NamedTemporaryFile(
+            mode='w', suffix='.tsv', delete=False) as t_handle:
+        filename = t_handle.name
+        for item in sorted(
+                items, key=attrgetter('idx_datapoint', 'timestamp')):
+            t_handle.write('{}\t{}\t{:.10f}\n'.format(
+                item.idx_datapoint, item.timestamp, item.value))
+
+    # Update the last_timestamp and load the data in a single transaction.
+    try:
+        with db.db_modify(20203, die=False, bulk=True) as session:
+            _update_datapoints(session, items)
+            session.execute(statement, {'filename': filename})
+            session.commit()
+            success = True
+    finally:
+        os.remove(filename)
+
+    # Fall back to regular inserts
+    if bool(success) is False:
+        log_message = ('''\
+Bulk loading of {} Data table rows failed. Using regular inserts\
+'''.format(len(items)))
+        log.log2warning(20204, log_message)
+        result = insert_rows(items)
+        return result
+
+    # Log the insertion rate
+    result = len(items)
+    _log_rate(result, time.time() - start)
+    return result
+
+
+def _update_datapoints(session, items):
+    """Update the DataPoint last_timestamp and polling_interval values.
+
+    Args:
+        session: Database session
+        items: List of IDXTimestampValue objects
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    last_timestamps = {}
+    polling_intervals = {}
+
+    # Get the most recent timestamp for each idx_datapoint
+    for item in items:
         if item.idx_datapoint in last_timestamps:
             last_timestamps[item.idx_datapoint] = max(
                 item.timestamp, last_timestamps[item.idx_datapoint])
@@ -49,20 +156,34 @@ def insert_rows(items):
             last_timestamps[item.idx_datapoint] = item.timestamp
         polling_intervals[item.idx_datapoint] = item.polling_interval
 
-    # Update the last_timestamp
-    for idx_datapoint, timestamp in last_timestamps.items():
-        with db.db_modify(20047, die=False) as session:
-            session.query(DataPoint).filter(
-                and_(DataPoint.idx_datapoint == idx_datapoint,
-                     DataPoint.enabled == 1)).update(
-                         {'last_timestamp': timestamp,
-                          'polling_interval': int(
-                            polling_intervals[idx_datapoint])}
-                     )
-
-    # Update after updating the last timestamp. Helps to prevent
-    # 'Duplicate entry' errors in the event you need to re-run the ingester
-    # after a previous crash.
-    if bool(_rows) is True:
-        with db.db_modify(20012, die=True) as session:
-            session.add_all(_rows)
+    # Update many DataPoint rows per UPDATE ... CASE statement
+    for chunk in data.chunks(sorted(last_timestamps), DB_CHUNK_SIZE):
+        session.query(DataPoint).filter(
+            and_(DataPoint.idx_datapoint.in_(chunk),
+                 DataPoint.enabled == 1)).update(
+                     {'last_timestamp': case(
+                         {_: last_timestamps[_] for _ in chunk},
+                         value=DataPoint.idx_datapoint),
+                      'polling_interval': case(
+                         {_: int(polling_intervals[_]) for _ in chunk},
+                         value=DataPoint.idx_datapoint)},
+                     synchronize_session=False)
+
+
+def _log_rate(rows, duration):
+    """Log the Data table insertion rate.
+
+    Args:
+        rows: Number of rows inserted
+        duration: Duration of the insertion in seconds
+
+    Returns:
+        None
+
+    """
+    # Log
+    if bool(duration) is True:
+        log_message = ('''\
+Inserted {0} Data table rows in {1:.2f} seconds, {2:.2f} rows / second\
+'''.format(rows, duration, rows / duration))
+        log.log2debug(20200, log_message)
@@ -15,11 +15,13 @@ from pattoo_shared.constants import (
 
 
 # Import project libraries
+from pattoo import data
 from pattoo.db import db
 from pattoo.db.models import DataPoint as _DataPoint
 from pattoo.db.models import Data
 from pattoo.db.table import agent, chart, chart_datapoint
-from pattoo.constants import DbRowChart, DbRowChartDataPoint
+from pattoo.constants import (
+    DbRowChart, DbRowChartDataPoint, DB_CHUNK_SIZE)
 
 
 class DataPoint():
@@ -190,14 +192,15 @@ class DataPoint():
         if self.exists() is False:
             return result
 
-        # Normalize timestamp to match the start of the nones array. If not,
-        # we could get the starting timestamp of the result to have a "None"
-        # value
+        # Normalize timestamps to the polling interval. If not, we could get
+        # the starting timestamp of the result to have a "None" value
         ts_start = times.normalized_timestamp(_pi, timestamp=ts_start)
+        ts_last = times.normalized_timestamp(_pi, timestamp=ts_stop)
 
-        # Make sure we have entries for entire time range
-        timestamps = times.timestamps(ts_start, ts_stop, _pi)
-        nones = {_key: None for _key in timestamps}
+        # Make sure we have entries for entire time range. Missing values
+        # are NaN.
+        timestamps = np.arange(ts_start, ts_last + _pi, _pi, dtype=np.int64)
+        values = np.full(timestamps.size, np.nan)
 
         # Get data from database
         with db.db_query(20092) as session:
@@ -206,31 +209,40 @@ class DataPoint():
                 Data.idx_datapoint == self._idx_datapoint)).order_by(
                     Data.timestamp).all()
 
-        # Put values into a dict for ease of processing
-        for row in rows:
-            # Find the first timestamp in the sorted list that is greater than
-            # that found in the database
-            timestamp = times.normalized_timestamp(_pi, row.timestamp)
-            rounded_value = round(float(row.value), places)
-            nones[timestamp] = rounded_value
+        # Put the values in the array position of their normalized timestamp
+        if bool(rows) is True:
+            _timestamps = np.fromiter(
+                (row.timestamp for row in rows), dtype=np.int64,
+                count=len(rows))
+            _values = np.fromiter(
+                (row.value for row in rows), dtype=np.float64,
+                count=len(rows))
+            indices = (_timestamps - ts_start) // _pi
+
+            # Rows are sorted by timestamp. Use the last value of each
+            # polling interval.
+            valid = np.append(indices[1:] != indices[:-1], True)
+            valid &= (indices >= 0) & (indices < values.size)
+            values[indices[valid]] = np.round(_values[valid], places)
 
         if data_type in [DATA_INT, DATA_FLOAT]:
             # Process non-counter values
-            result = _response(nones)
+            result = _response(timestamps, values)
 
         elif data_type in [DATA_COUNT64, DATA_COUNT] and len(rows) > 1:
             # Process counter values by calculating the difference between
             # successive values
-            result = _counters(nones, _pi, places)
+            result = _counters(timestamps, values, _pi, places)
 
         return result
 
 
-def _counters(nones, polling_interval, places):
+def _counters(timestamps, values, polling_interval, places):
     """Create list of dicts of counter values retrieved from database.
 
     Args:
-        nones: Dict of values keyed by timestamp
+        timestamps: numpy array of timestamps
+        values: numpy array of values for each timestamp. NaN if absent.
         polling_interval: Polling interval
         places: Number of places to round values
 
@@ -238,24 +250,6 @@ def _counters(nones, polling_interval, places):
         result: List of key-value pair dicts
 
     """
-    # Initialize key variables
-    final = {}
-
-    # Create list of timestamps and values
-    timestamps = []
-    values = []
-    for timestamp, value in sorted(nones.items()):
-        timestamps.append(timestamp)
-        values.append(value)
-
-    # Remove first timestamp value as it isn't necessary
-    # after deltas are created
-    timestamps = timestamps[1:]
-
-    # Create an array for ease of readability.
-    # Convert to None values to nans to make deltas without errors
-    values_array = np.array(values).astype(np.float)
-
     '''
     Sometimes we'll get unsigned counter values in the database that roll over
     to zero. This result in a negative delta.
@@ -266,35 +260,35 @@ def _counters(nones, polling_interval, places):
     (value.current + integer.type.max - value.previous)
 
     '''
-    deltas = np.abs(np.diff(values_array))
-    for key, delta in enumerate(deltas):
-        # Null values means absent data and therefore no change
-        if np.isnan(delta):
-            tps = None
-        else:
-            # Calculate the value as a transaction per second value
-            tps = round((delta / polling_interval) * 1000, places)
-        final[timestamps[key]] = tps
-
-    # Return the result
-    result = _response(final)
+    deltas = np.abs(np.diff(values))
+
+    # Calculate the values as transaction per second values. NaN values mean
+    # absent data and therefore no change. Remove the first timestamp as it
+    # isn't necessary after deltas are created.
+    tps = np.round((deltas / polling_interval) * 1000, places)
+    result = _response(timestamps[1:], tps)
     return result
 
 
-def _response(nones):
+def _response(timestamps, values):
     """Create list of dicts.
 
     Args:
-        nones: Dict of values keyed by timestamp
+        timestamps: numpy array of timestamps
+        values: numpy array of values for each timestamp. NaN if absent.
 
     Returns:
-        result: List of key-value pair dicts
+        result: List of key-value pair dicts. Absent values are None.
 
     """
+    # Convert to python types, with None values for NaNs
+    _values = values.astype(object)
+    _values[np.isnan(values)] = None
+
     # Return a list of dicts
-    result = []
-    for timestamp, value in sorted(nones.items()):
-        result.append({'timestamp': timestamp, 'value': value})
+    result = [
+        {'timestamp': timestamp, 'value': value} for timestamp, value in zip(
+            timestamps.tolist(), _values.tolist())]
     return result
 
 
@@ -307,39 +301,118 @@ def idx_datapoint(pattoo_db_record):
     Returns:
         _idx_datapoint: DataPoint._idx_datapoint value. None if unsuccessful
 
+    """
+    # Create the required entries in the database
+    result = idx_datapoints([pattoo_db_record])
+    _idx_datapoint = result.get(pattoo_db_record.pattoo_checksum, False)
+
+    # Return
+    return _idx_datapoint
+
+
+def idx_datapoints(pattoo_db_records):
+    """Get the db DataPoint.idx_datapoint values for PattooDBrecord objects.
+
+    Creates the Agent, DataPoint, Chart and ChartDataPoint table entries
+    for all new checksums using multi-row inserts. Generated index values
+    are read back with one query per table.
+
+    Args:
+        pattoo_db_records: List of PattooDBrecord objects
+
+    Returns:
+        result: Dict of DataPoint.idx_datapoint values keyed by checksum
+
     """
     # Initialize key variables
-    checksum = pattoo_db_record.pattoo_checksum
-    data_type = pattoo_db_record.pattoo_data_type
-    polling_interval = pattoo_db_record.pattoo_agent_polling_interval
-    agent_id = pattoo_db_record.pattoo_agent_id
-    agent_target = pattoo_db_record.pattoo_agent_polled_target
-    agent_program = pattoo_db_record.pattoo_agent_program
-
-    # Create an entry in the database Checksum table
-    _idx_datapoint = checksum_exists(checksum)
-    if bool(_idx_datapoint) is False:
-        # Create a record in the Agent table
-        idx_agent = agent.idx_agent(agent_id, agent_target, agent_program)
-
-        # Create a record in the DataPoint table
-        insert_row(checksum, data_type, polling_interval, idx_agent)
-        _idx_datapoint = checksum_exists(checksum)
-
-        # Create a record in the Chart table
-        chart_checksum = data_.hashstring(
+    uniques = {}
+    rows = []
+    chart_checksums = {}
+
+    # Make the records unique by checksum
+    for pdbr in pattoo_db_records:
+        if pdbr.pattoo_checksum not in uniques:
+            uniques[pdbr.pattoo_checksum] = pdbr
+
+    # Get pre-existing entries. Return if there is nothing new
+    result = checksums_exist(list(uniques.keys()))
+    new = [
+        pdbr for checksum, pdbr in sorted(
+            uniques.items()) if checksum not in result]
+    if bool(new) is False:
+        return result
+
+    # Create records in the Agent table
+    idx_agents = agent.idx_agents(
+        [(pdbr.pattoo_agent_id,
+          pdbr.pattoo_agent_polled_target,
+          pdbr.pattoo_agent_program) for pdbr in new])
+
+    # Create records in the DataPoint table
+    for pdbr in new:
+        idx_agent = idx_agents.get(
+            (pdbr.pattoo_agent_id, pdbr.pattoo_agent_polled_target))
+        if bool(idx_agent) is False:
+            continue
+        rows.append(
+            (pdbr.pattoo_checksum,
+             pdbr.pattoo_data_type,
+             pdbr.pattoo_agent_polling_interval,
+             idx_agent))
+    insert_rows(rows)
+    created = checksums_exist([row[0] for row in rows])
+    result.update(created)
+
+    # Create records in the Chart table
+    for checksum in sorted(created.keys()):
+        chart_checksums[checksum] = data_.hashstring(
             '{}{}'.format(random.random(), checksum))
-        chart.insert_row(
-            DbRowChart(name='', checksum=chart_checksum, enabled=1))
-        idx_chart = chart.exists(chart_checksum)
+    chart.insert_rows(
+        [DbRowChart(name='', checksum=_, enabled=1)
+         for _ in chart_checksums.values()])
+    idx_charts = chart.exists_lookup(list(chart_checksums.values()))
+
+    # Create records in the ChartDataPoint table
+    chart_datapoint.insert_rows(
+        [DbRowChartDataPoint(
+            idx_chart=idx_charts[chart_checksum],
+            idx_datapoint=created[checksum],
+            enabled=1)
+         for checksum, chart_checksum in sorted(chart_checksums.items())
+         if chart_checksum in idx_charts])
+
+    # Return
+    return result
+
 
-        # Create a record in the ChartDataPoint table
-        chart_datapoint.insert_row(
-            DbRowChartDataPoint(
-                idx_chart=idx_chart, idx_datapoint=_idx_datapoint, enabled=1))
+def checksums_exist(checksums):
+    """Get the db _DataPoint.idx_datapoint values for multiple checksums.
+
+    Args:
+        checksums: List of PattooShared.converter.extract NamedTuple checksums
+
+    Returns:
+        result: Dict of _DataPoint.idx_datapoint values keyed by checksum
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Encode the checksums
+    items = [checksum.encode() for checksum in checksums]
+
+    # Get the result
+    for chunk in data.chunks(items, DB_CHUNK_SIZE):
+        with db.db_query(20197) as session:
+            rows = session.query(
+                _DataPoint.idx_datapoint, _DataPoint.checksum).filter(
+                    _DataPoint.checksum.in_(chunk))
+
+        for row in rows:
+            result[row.checksum.decode()] = row.idx_datapoint
 
     # Return
-    return _idx_datapoint
+    return result
 
 
 def checksum_exists(_checksum):
@@ -391,3 +464,34 @@ def insert_row(_checksum, data_type, polling_interval, idx_agent):
             data_type=data_type)
         with db.db_modify(20034, die=True) as session:
             session.add(_row)
+
+
+def insert_rows(items):
+    """Create multiple database _DataPoint table entries.
+
+    Args:
+        items: List of (checksum, data_type, polling_interval, idx_agent)
+            tuples
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    rows = []
+
+    # Filter invalid data
+    for _checksum, data_type, polling_interval, idx_agent in items:
+        if isinstance(_checksum, str) is True:
+            rows.append({
+                'checksum': _checksum.encode(),
+                'polling_interval': polling_interval,
+                'idx_agent': idx_agent,
+                'data_type': data_type})
+
+    # Insert. Ignore checksums created by concurrent ingesters
+    for chunk in data.chunks(rows, DB_CHUNK_SIZE):
+        with db.db_modify(20198, die=True) as session:
+            session.execute(
+                _DataPoint.__table__.insert().prefix_with(
+                    'IGNORE').values(chunk))
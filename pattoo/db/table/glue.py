@@ -2,11 +2,13 @@
 """Verifies the existence of various database data required for ingest."""
 
 # PIP libraries
-from sqlalchemy import and_
+from sqlalchemy import and_, tuple_
 
 # Import project libraries
+from pattoo import data
 from pattoo.db import db
 from pattoo.db.models import Pair, DataPoint, Glue
+from pattoo.constants import DB_CHUNK_SIZE
 
 
 def glue_exists(_idx_datapoint, idx_pair):
@@ -51,24 +53,52 @@ def insert_rows(idx_datapoint, _idx_pairs):
         None
 
     """
-    # Initialize key variables
-    rows = []
-
     # Create a list for processing if not available
     if isinstance(_idx_pairs, list) is False:
         _idx_pairs = [_idx_pairs]
 
-    # Iterate over _idx_pairs
-    for idx_pair in _idx_pairs:
-        pair_exists = glue_exists(idx_datapoint, idx_pair)
-        if bool(pair_exists) is False:
-            # Insert and get the new idx_datasource value
-            row = Glue(idx_pair=idx_pair, idx_datapoint=idx_datapoint)
-            rows.append(row)
+    # Insert
+    insert_batch([(idx_pair, idx_datapoint) for idx_pair in _idx_pairs])
+
+
+def insert_batch(items):
+    """Create db Glue table entries for an entire ingest batch.
+
+    Args:
+        items: List of (Pair.idx_pair, DataPoint.idx_datapoint) tuples
+
+    Returns:
+        None
+
+    Method:
+        1) Get the pre-existing entries with chunked queries on the Glue
+           table primary key.
+        2) Insert the difference using multi-row INSERT IGNORE statements.
+           Duplicate entries created by concurrent ingesters are ignored.
 
-    if bool(rows) is True:
+    """
+    # Initialize key variables
+    rows = []
+    wanted = set(
+        (int(idx_pair), int(idx_datapoint))
+        for idx_pair, idx_datapoint in items)
+
+    # Remove pre-existing entries
+    for chunk in data.chunks(sorted(wanted), DB_CHUNK_SIZE):
+        with db.db_query(20189) as session:
+            existing = session.query(
+                Glue.idx_pair, Glue.idx_datapoint).filter(
+                    tuple_(Glue.idx_pair, Glue.idx_datapoint).in_(chunk))
+        for row in existing:
+            wanted.discard((row.idx_pair, row.idx_datapoint))
+
+    # Insert the difference
+    for idx_pair, idx_datapoint in sorted(wanted):
+        rows.append({'idx_pair': idx_pair, 'idx_datapoint': idx_datapoint})
+    for chunk in data.chunks(rows, DB_CHUNK_SIZE):
         with db.db_modify(20002, die=True) as session:
-            session.add_all(rows)
+            session.execute(
+                Glue.__table__.insert().prefix_with('IGNORE').values(chunk))
 
 
 def idx_pairs(_idx_datapoints):
@@ -1,12 +1,208 @@
 #!/usr/bin/env python3
 """Pattoo classes querying the Pair table."""
 
+# Standard libraries
+from collections import OrderedDict
+from threading import Lock
+
 # PIP libraries
 from sqlalchemy import and_, tuple_
 
 # Import project libraries
+from pattoo_shared import log
+from pattoo import data
 from pattoo.db import db
 from pattoo.db.models import Pair
+from pattoo.constants import DB_CHUNK_SIZE
+from pattoo.configuration import ConfigIngester as Config
+
+# Process wide PairCache object. Created on first use by cache()
+_CACHE = None
+
+
+class PairCache():
+    """Size bounded LRU cache of Pair.idx_pair values.
+
+    Rows in the Pair table are never modified after they are created. Cached
+    idx_pair values therefore never become stale and can be kept for the
+    lifetime of the process.
+
+    """
+
+    def __init__(self, size=None):
+        """Initialize the class.
+
+        Args:
+            size: Maximum number of entries. Uses the "pair_cache_size"
+                configuration value if None. A size of 0 disables caching.
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        if size is None:
+            size = Config().pair_cache_size()
+        self._size = max(0, int(size))
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self._shared = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """Get the number of cached entries.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of entries
+
+        """
+        # Return
+        result = len(self._data)
+        return result
+
+    def get(self, items):
+        """Get cached idx_pair values.
+
+        Args:
+            items: List of (key, value) tuples
+
+        Returns:
+            result: Dict of Pair.idx_pair values keyed by (key, value) for
+                the items found in the cache
+
+        """
+        # Initialize key variables
+        result = {}
+        misses = 0
+
+        # Find entries, marking them as most recently used
+        with self._lock:
+            for item in items:
+                idx_pair = self._data.get(item)
+                if idx_pair is None:
+                    misses += 1
+                    continue
+                self._data.move_to_end(item)
+                result[item] = idx_pair
+            self.hits += len(result)
+            self.misses += misses
+
+        # Update the counters shared with the parent process
+        if self._shared is not None:
+            for counter, value in zip(self._shared, [len(result), misses]):
+                with counter.get_lock():
+                    counter.value += value
+
+        # Return
+        return result
+
+    def share(self, hits, misses):
+        """Also count hits and misses using counters shared by processes.
+
+        Args:
+            hits: multiprocessing Value object counting hits
+            misses: multiprocessing Value object counting misses
+
+        Returns:
+            None
+
+        """
+        # Save
+        self._shared = (hits, misses)
+
+    def update(self, lookup):
+        """Add idx_pair values to the cache.
+
+        Args:
+            lookup: Dict of Pair.idx_pair values keyed by (key, value)
+
+        Returns:
+            None
+
+        """
+        # Do nothing if disabled
+        if bool(self._size) is False:
+            return
+
+        # Add entries, evicting the least recently used ones if necessary
+        with self._lock:
+            for item, idx_pair in lookup.items():
+                self._data[item] = idx_pair
+                self._data.move_to_end(item)
+            while len(self._data) > self._size:
+                self._data.popitem(last=False)
+
+    def warm(self):
+        """Bulk load the most recently created pairs into the cache.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        lookup = {}
+
+        # Do nothing if disabled
+        if bool(self._size) is False:
+            return
+
+        # Get the data from the database
+        with db.db_query(20186) as session:
+            rows = session.query(
+                Pair.idx_pair, Pair.key, Pair.value).order_by(
+                    Pair.idx_pair.desc()).limit(self._size)
+
+        # Update the cache. Oldest entries first so that they get evicted first
+        for row in reversed(rows.all()):
+            lookup[(row.key.decode(), row.value.decode())] = row.idx_pair
+        self.update(lookup)
+
+        # Log
+        log_message = 'Loaded {} entries into the Pair cache'.format(
+            len(lookup))
+        log.log2debug(20187, log_message)
+
+    def stats(self):
+        """Get cache statistics.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of statistics
+
+        """
+        # Return
+        result = {
+            'size': self._size,
+            'entries': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses}
+        return result
+
+
+def cache():
+    """Get the process wide PairCache object.
+
+    Args:
+        None
+
+    Returns:
+        _CACHE: PairCache object
+
+    """
+    # Create the cache on first use
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = PairCache()
+    return _CACHE
 
 
 def pair_exists(key, value):
@@ -45,7 +241,15 @@ def insert_rows(items):
         items: List of lists, or list of key-value pairs
 
     Returns:
-        None
+        result: Dict of Pair.idx_pair values keyed by (key, value)
+
+    Method:
+        1) Get the idx_pair values of all pre-existing key-value pairs from
+           the PairCache, then from the database using chunked queries.
+        2) Insert the missing pairs using multi-row INSERT IGNORE statements.
+           Duplicate entries created by concurrent ingesters are ignored.
+        3) Get the idx_pair values of the newly inserted pairs and add all
+           the values to the PairCache.
 
     """
     # Initialize key variables
@@ -67,19 +271,68 @@ def insert_rows(items):
     for _kv in all_kvs:
         uniques[_kv] = None
 
+    # Get the pre-existing pairs. Only query the database for pairs that are
+    # not cached.
+    _cache = cache()
+    result = _cache.get(list(uniques.keys()))
+    result.update(idx_pairs_lookup(
+        [_kv for _kv in uniques.keys() if _kv not in result]))
+
     # Insert the key-value pairs into the database
     for (key, value), _ in uniques.items():
         # Skip pre-existing pairs
-        if bool(pair_exists(key, value)) is True:
+        if (key, value) in result:
             continue
 
         # Add values to list for future insertion
-        _row = Pair(key=key.encode(), value=value.encode())
-        _rows.append(_row)
+        _rows.append({'key': key.encode(), 'value': value.encode()})
 
     if bool(_rows) is True:
-        with db.db_modify(20007, die=True) as session:
-            session.add_all(_rows)
+        for chunk in data.chunks(_rows, DB_CHUNK_SIZE):
+            with db.db_modify(20007, die=True) as session:
+                session.execute(
+                    Pair.__table__.insert().prefix_with(
+                        'IGNORE').values(chunk))
+
+        # Get the idx_pair values of the new pairs
+        result.update(idx_pairs_lookup(
+            [(row['key'].decode(), row['value'].decode()) for row in _rows]))
+
+    # Update the cache
+    _cache.update(result)
+
+    # Return
+    return result
+
+
+def idx_pairs_lookup(_items):
+    """Get the db Pair table indices keyed by key-value pair.
+
+    Args:
+        _items: List of (key, value) tuples
+
+    Returns:
+        result: Dict of Pair.idx_pair values keyed by (key, value)
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Encode the items
+    items = [(key.encode(), value.encode()) for key, value in _items]
+
+    # Get the data from the database in chunks to limit the query size
+    for chunk in data.chunks(items, DB_CHUNK_SIZE):
+        with db.db_query(20185) as session:
+            rows = session.query(
+                Pair.idx_pair, Pair.key, Pair.value).filter(
+                    tuple_(Pair.key, Pair.value).in_(chunk))
+
+        for row in rows:
+            result[(row.key.decode(), row.value.decode())] = row.idx_pair
+
+    # Return
+    return result
 
 
 def idx_pairs(_items):
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Adaptive sizing of pattoo ingest batches."""
+
+# PIP3 imports
+import psutil
+
+# Import project libraries
+from pattoo_shared import log
+
+
+class BatchSizer():
+    """Adjust the number of cache files per ingest batch.
+
+    The size is tuned towards a target batch duration using the ingest rate
+    of previous batches, and reduced when the ingester uses too much memory.
+
+    """
+
+    def __init__(
+            self, size, duration=0, memory=0, minimum=1, maximum=100000):
+        """Initialize the class.
+
+        Args:
+            size: Initial number of files per batch
+            duration: Target duration of a batch in seconds. The size is only
+                adjusted for memory usage if 0.
+            memory: Maximum resident memory in bytes of the ingester and its
+                worker processes. Not limited if 0.
+            minimum: Minimum number of files per batch
+            maximum: Maximum number of files per batch
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._minimum = max(1, minimum)
+        self._maximum = max(self._minimum, maximum)
+        self._size = min(max(int(size), self._minimum), self._maximum)
+        self._duration = duration
+        self._memory = memory
+
+    def size(self):
+        """Get the number of files for the next batch.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of files
+
+        """
+        # Return
+        result = self._size
+        return result
+
+    def update(self, files, duration, records=0, pool=None):
+        """Adjust the batch size using the results of a batch.
+
+        Args:
+            files: Number of files processed
+            duration: Duration of the batch in seconds
+            records: Number of records processed
+            pool: WorkerPool object used to process the batch. The memory of
+                its worker processes counts towards the memory limit.
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        size = self._size
+
+        # Only measure memory usage if it is limited
+        if bool(self._memory) is True:
+            rss = _rss(pids=None if pool is None else pool.pids())
+            memory = ' Memory usage {:.0f}MB.'.format(rss / 1048576)
+        else:
+            rss = 0
+            memory = ''
+
+        # Reduce the size quickly if too much memory is used
+        if bool(self._memory) is True and rss >= self._memory:
+            size = size // 2
+
+        # Only full batches show how long a batch of this size takes
+        elif bool(self._duration) is True and files >= self._size:
+            # Change the size gradually towards the target duration
+            target = files * self._duration / max(duration, 0.001)
+            size = min(max(target, size / 2), size * 2)
+
+            # Don't grow when close to the memory limit
+            if bool(self._memory) is True and rss >= self._memory * 0.8:
+                size = min(size, self._size)
+
+        self._size = min(max(int(size), self._minimum), self._maximum)
+
+        # Log
+        log_message = ('''\
+Ingest batch of {} files and {} records took {:.2f}s, {:.2f} records / \
+second.{} Next batch size {} files\
+'''.format(files, records, duration, records / max(duration, 0.001), memory,
+           self._size))
+        log.log2debug(20238, log_message)
+
+
+def _rss(pids=None):
+    """Get the resident memory of the process and its worker processes.
+
+    Args:
+        pids: List of worker process IDs
+
+    Returns:
+        result: Resident memory in bytes
+
+    """
+    # Initialize key variables
+    result = psutil.Process().memory_info().rss
+    if pids is None:
+        pids = []
+
+    # Add the memory of the worker processes
+    for pid in pids:
+        try:
+            result += psutil.Process(pid).memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return result
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Coordinate pattoo ingesters running on multiple servers.
+
+Ingesters that share the agent cache claim disjoint cache shards using
+MySQL advisory locks. Each ingester claims an equal share of the shards.
+Locks are held by a dedicated database connection, so the shards of an
+ingester that dies are automatically released when its connection closes
+and are then claimed by the remaining ingesters.
+
+"""
+
+# Standard imports
+import math
+import sys
+
+# PIP3 imports
+from sqlalchemy import text
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.configuration import ConfigAPId
+from pattoo.configuration import ConfigAgentAPId
+from pattoo import db
+
+
+class Coordinator():
+    """Claim agent cache shards using MySQL advisory locks."""
+
+    def __init__(self, shards=None):
+        """Initialize the class.
+
+        Args:
+            shards: Number of cache shards. Uses the "cache_shards"
+                configuration value if None. The whole cache is treated as
+                a single shard if zero, or if the segment cache_backend is
+                used.
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        if shards is None:
+            config = ConfigAgentAPId()
+            if config.cache_backend() == 'segment':
+                shards = 0
+            else:
+                shards = config.cache_shards()
+        self._sharded = bool(shards) is True
+        self._shards = max(1, shards)
+        self._prefix = 'pattoo.{}'.format(ConfigAPId().db_name())
+        self._connection = None
+        self._slot = None
+        self._claimed = set()
+
+    def claim(self):
+        """Claim a fair share of the cache shards.
+
+        Args:
+            None
+
+        Returns:
+            result: List of claimed shard numbers to pass to
+                files.process_cache. None if the cache isn't sharded and
+                was claimed.
+
+        """
+        # Claim
+        try:
+            self._claim()
+        except:
+            _exception = sys.exc_info()
+            log_message = ('''\
+Unable to claim agent cache shards. Retrying during the next ingest cycle''')
+            log.log2exception(20235, _exception, message=log_message)
+            self.release()
+
+        # Return
+        if self._sharded is False and bool(self._claimed) is True:
+            result = None
+        else:
+            result = sorted(self._claimed)
+        return result
+
+    def release(self):
+        """Release all claimed shards.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Closing the connection releases all its locks
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except:
+                pass
+        self._connection = None
+        self._slot = None
+        self._claimed = set()
+
+    def _claim(self):
+        """Claim a fair share of the cache shards.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Use a dedicated connection that holds the locks
+        if self._connection is None:
+            self._connection = db.POOL.bind.connect()
+
+        # Forget shards that are no longer locked, for example if the
+        # database server restarted
+        self._claimed = set([
+            _ for _ in self._claimed if self._held(self._name('shard', _))])
+
+        # Register this ingester in a slot, to help count the ingesters
+        if self._slot is not None and self._held(
+                self._name('slot', self._slot)) is False:
+            self._slot = None
+        if self._slot is None:
+            for slot in range(0, self._shards):
+                if self._lock(self._name('slot', slot)) is True:
+                    self._slot = slot
+                    break
+
+        # There are more ingesters than shards
+        if self._slot is None:
+            for shard in sorted(self._claimed):
+                self._unlock(self._name('shard', shard))
+            self._claimed = set()
+            return
+
+        # Release shards in excess of a fair share
+        ingesters = self._ingesters()
+        share = int(math.ceil(self._shards / ingesters))
+        while len(self._claimed) > share:
+            shard = max(self._claimed)
+            self._unlock(self._name('shard', shard))
+            self._claimed.discard(shard)
+
+        # Claim shards up to a fair share. Start at a different shard in
+        # each slot to reduce contention between ingesters.
+        start = self._slot * share
+        for offset in range(0, self._shards):
+            if len(self._claimed) >= share:
+                break
+            shard = (start + offset) % self._shards
+            if shard in self._claimed:
+                continue
+            if self._lock(self._name('shard', shard)) is True:
+                self._claimed.add(shard)
+
+        # Log
+        log_message = ('''\
+Claimed agent cache shards {}. Fair share of {} for {} ingesters\
+'''.format(sorted(self._claimed), share, ingesters))
+        log.log2debug(20236, log_message)
+
+    def _ingesters(self):
+        """Get the number of ingesters registered in slots.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of ingesters
+
+        """
+        # Initialize key variables
+        names = [self._name('slot', _) for _ in range(0, self._shards)]
+        columns = ', '.join(
+            ['IS_USED_LOCK(:name{})'.format(_) for _ in range(len(names))])
+        arguments = dict(
+            [('name{}'.format(index), name) for index, name in enumerate(
+                names)])
+
+        # Return
+        row = self._connection.execute(
+            text('SELECT {}'.format(columns)), **arguments).fetchone()
+        result = max(1, len([_ for _ in row if _ is not None]))
+        return result
+
+    def _name(self, kind, number):
+        """Get the name of a lock.
+
+        Args:
+            kind: Kind of lock
+            number: Number of the lock
+
+        Returns:
+            result: Lock name. MySQL limits names to 64 characters.
+
+        """
+        # Return
+        suffix = '.{}.{}'.format(kind, number)
+        result = '{}{}'.format(self._prefix[:64 - len(suffix)], suffix)
+        return result
+
+    def _lock(self, name):
+        """Lock a name without waiting.
+
+        Args:
+            name: Lock name
+
+        Returns:
+            result: True if successful
+
+        """
+        # Return
+        value = self._connection.execute(
+            text('SELECT GET_LOCK(:name, 0)'), name=name).scalar()
+        result = value == 1
+        return result
+
+    def _unlock(self, name):
+        """Release a lock.
+
+        Args:
+            name: Lock name
+
+        Returns:
+            None
+
+        """
+        # Release
+        self._connection.execute(
+            text('SELECT RELEASE_LOCK(:name)'), name=name)
+
+    def _held(self, name):
+        """Determine whether the lock is held by this ingester.
+
+        Args:
+            name: Lock name
+
+        Returns:
+            result: True if held
+
+        """
+        # Return
+        value = self._connection.execute(
+            text('SELECT IS_USED_LOCK(:name) = CONNECTION_ID()'),
+            name=name).scalar()
+        result = value == 1
+        return result
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Pattoo ingestion of agent postings without using the cache.
+
+The pattoo_api_agentd daemon can add agent postings directly to the database
+in micro-batches. Postings are cached for the ingester as usual if they
+can't be written to the database.
+
+"""
+
+# Standard imports
+import sys
+import time
+
+# Import project libraries
+from pattoo_shared import log, converter
+from .records import process_db_records
+
+
+class Writer():
+    """Write agent postings to the database."""
+
+    def __init__(self, fallback, retry=30):
+        """Initialize the class.
+
+        Args:
+            fallback: Function to cache a posting that can't be written to
+                the database. Called with the posting data and its source.
+            retry: Seconds to cache postings after a database failure before
+                writing to the database again
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._fallback = fallback
+        self._retry = retry
+        self._failed = 0
+
+    def extend(self, items):
+        """Write agent postings to the database.
+
+        Args:
+            items: List of (source, data) tuples of agent postings
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        groups = {}
+
+        # Cache the postings while the database is unavailable
+        if time.time() - self._failed < self._retry:
+            self._cache(items)
+            return
+
+        # Group data by agent_id
+        for source, data in items:
+            pdbrs = converter.cache_to_keypairs(data)
+            if bool(pdbrs) is False:
+                log_message = ('''\
+Posting from source {} has invalid data. It will not be processed\
+'''.format(source))
+                log.log2info(20233, log_message)
+                continue
+            pattoo_agent_id = pdbrs[0].pattoo_agent_id
+            if pattoo_agent_id in groups:
+                groups[pattoo_agent_id][0].extend(pdbrs)
+                groups[pattoo_agent_id][1].append((source, data))
+            else:
+                groups[pattoo_agent_id] = (pdbrs, [(source, data)])
+
+        # Process data. Database errors stop the process by default, so
+        # all exceptions are caught.
+        for _, (pdbrs, postings) in sorted(groups.items()):
+            if time.time() - self._failed < self._retry:
+                self._cache(postings)
+                continue
+            try:
+                process_db_records(pdbrs)
+            except:
+                _exception = sys.exc_info()
+                log_message = ('''\
+Unable to write agent postings to the database. Caching them for \
+{}s'''.format(self._retry))
+                log.log2exception(20234, _exception, message=log_message)
+                self._failed = time.time()
+                self._cache(postings)
+
+    def _cache(self, items):
+        """Cache agent postings for the ingester.
+
+        Args:
+            items: List of (source, data) tuples of agent postings
+
+        Returns:
+            None
+
+        """
+        # Cache
+        for source, data in items:
+            self._fallback(data, source)
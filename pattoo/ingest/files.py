@@ -2,6 +2,9 @@
 """Pattoo classes that manage various data."""
 
 # Standard imports
+from collections import deque
+from operator import itemgetter
+import fcntl
 import os
 import time
 
@@ -9,35 +12,83 @@ import time
 # Import project libraries
 from pattoo_shared import log, files, converter
 from pattoo.configuration import ConfigIngester as Config
-from pattoo.constants import PATTOO_API_AGENT_NAME, PATTOO_INGESTER_NAME
-from .records import Records
+from pattoo.configuration import ConfigAgentAPId
+from pattoo.segment import SegmentReader
+from pattoo import serialize
+from pattoo.constants import PATTOO_INGESTER_NAME
+from .records import (
+    Records, ExceptionWrapper, process_db_records, read_file,
+    _process_files_exception, _process_data_exception)
+from .pool import WorkerPool
+from .batch import BatchSizer
+from .pipeline import Pipeline
+
+# File descriptor of the locked ingester lock file
+_LOCK = None
 
 
 class Cache():
     """Process ingest cache data."""
 
-    def __init__(self, batch_size=500, age=0):
+    def __init__(self, batch_size=500, age=0, shards=None):
         """Initialize the class.
 
         Args:
             batch_size: Number of files to read
             age: Minimum age of files to be read per batch
+            shards: List of cache shard numbers to read. All cache files are
+                read if None.
 
         Returns:
             None
 
         """
-        # Get cache directory
+        # Get cache directories
         config = Config()
-        directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        api_config = ConfigAgentAPId()
+        directories = api_config.cache_directories(shards=shards)
         self._batch_id = int(time.time() * 1000)
-
-        # Read data from cache. Stop if there is no data found.
-        self._data = files.read_json_files(
-            directory, die=False, age=age, count=batch_size)
+        self._parse_in_workers = config.parse_in_workers()
+        self._streaming = config.streaming()
+        self._pipeline = config.pipeline()
+        self._multiprocess = config.multiprocessing()
+        self._data = []
+        self._filepaths = []
+        self._reader = None
+
+        # Read records from sealed segments if the API uses a segment log
+        if api_config.cache_backend() == 'segment':
+            self._parse_in_workers = False
+            self._streaming = False
+            self._pipeline = False
+            self._reader = SegmentReader(
+                api_config.segment_directory(),
+                max_age=api_config.segment_age())
+            self._data = self._reader.read(count=batch_size)
+
+        # Only list the files if they will be read later
+        elif True in [
+                self._parse_in_workers, self._streaming, self._pipeline]:
+            for directory in directories:
+                self._filepaths.extend(_filepaths(
+                    directory, age=age,
+                    count=batch_size - len(self._filepaths)))
+                if len(self._filepaths) >= batch_size:
+                    break
+        else:
+            # Read data from cache. Stop if there is no data found.
+            for directory in directories:
+                self._data.extend(_read_json_files(
+                    directory, age=age, count=batch_size - len(self._data)))
+                if len(self._data) >= batch_size:
+                    break
+            self._filepaths = [filepath for filepath, _ in self._data]
 
         # Save the number of files read
-        self.files = len(self._data)
+        if self._reader is None:
+            self.files = len(self._filepaths)
+        else:
+            self.files = len(self._data)
 
     def records(self):
         """Create PattooDBrecord objects from cache directory.
@@ -53,8 +104,9 @@ class Cache():
         _cache = {}
         result = []
 
-        # Read data from files
-        for filepath, json_data in sorted(self._data):
+        # Read data from files. Segment records share the path of their
+        # segment, so only sort by path to keep them in the order written.
+        for filepath, json_data in sorted(self._data, key=itemgetter(0)):
             # Get data from JSON file. Convert to rows of key-pairs
             if bool(json_data) is True and isinstance(json_data, dict) is True:
                 pdbrs = converter.cache_to_keypairs(json_data)
@@ -79,6 +131,87 @@ File {} has invalid data. It will not be processed'''.format(filepath))
         # Return
         return result
 
+    def stream(self, max_records=None):
+        """Read PattooDBrecord objects from the cache files one at a time.
+
+        Files are read in groups by source. The records of each agent are
+        yielded once all the files of its source have been read, or when
+        the number of records in memory reaches max_records. The records of
+        an agent may therefore be yielded in several groups, which must be
+        processed in order.
+
+        Args:
+            max_records: Maximum number of PattooDBrecord objects to keep in
+                memory. Uses the "stream_max_records" configuration value if
+                None.
+
+        Yields:
+            pdbrs: List of PattooDBrecord objects for an agent_id
+
+        """
+        # Initialize key variables
+        _cache = {}
+        count = 0
+        if max_records is None:
+            max_records = Config().stream_max_records()
+
+        # Read the files of each source
+        for filepaths in self.sources():
+            for filepath in filepaths:
+                pdbrs = read_file(filepath)
+                if bool(pdbrs) is False:
+                    continue
+
+                # Group data by agent_id
+                pattoo_agent_id = pdbrs[0].pattoo_agent_id
+                if pattoo_agent_id in _cache:
+                    _cache[pattoo_agent_id].extend(pdbrs)
+                else:
+                    _cache[pattoo_agent_id] = pdbrs
+                count += len(pdbrs)
+
+                # Limit memory usage
+                if count >= max_records:
+                    for _, item in sorted(_cache.items()):
+                        yield item
+                    _cache = {}
+                    count = 0
+
+            # All the files of the source have been read
+            for _, item in sorted(_cache.items()):
+                yield item
+            _cache = {}
+            count = 0
+
+    def sources(self):
+        """Get the cache file paths grouped by source.
+
+        Args:
+            None
+
+        Returns:
+            result: List of lists of file paths grouped by source
+
+        """
+        # Initialize key variables
+        _cache = {}
+        result = []
+
+        # Group files by the source component of the filename
+        for filepath in sorted(self._filepaths):
+            source = _source(filepath)
+            if source in _cache:
+                _cache[source].append(filepath)
+            else:
+                _cache[source] = [filepath]
+
+        # Aggregate data
+        for _, item in sorted(_cache.items()):
+            result.append(item)
+
+        # Return
+        return result
+
     def purge(self):
         """Purge cache files.
 
@@ -89,11 +222,13 @@ File {} has invalid data. It will not be processed'''.format(filepath))
             None
 
         """
-        # Initialize key variables
-        filepaths = [filepath for filepath, _ in self._data]
+        # Save the progress through the segment log
+        if self._reader is not None:
+            self._reader.commit()
+            return
 
         # Delete cache files after processing
-        for filepath in filepaths:
+        for filepath in self._filepaths:
             if os.path.exists(filepath):
                 try:
                     os.remove(filepath)
@@ -102,16 +237,31 @@ File {} has invalid data. It will not be processed'''.format(filepath))
 Error deleting cache file {}.'''.format(filepath))
                     log.log2warning(20110, log_message)
 
-    def ingest(self):
+    def ingest(self, pool=None):
         """Ingest cache data into the database.
 
         Args:
-            None
+            pool: WorkerPool object to use for multiprocessing
 
         Returns:
             records: Number of records processed
 
         """
+        # Let the worker processes read the files
+        if self._parse_in_workers is True:
+            records = self._ingest_files(pool=pool)
+            return records
+
+        # Read, parse and write data concurrently
+        if self._pipeline is True:
+            records = self._ingest_pipeline(pool=pool)
+            return records
+
+        # Read files while previously read data is written to the database
+        if self._streaming is True:
+            records = self._ingest_stream(pool=pool)
+            return records
+
         # Process
         _data = self.records()
         if bool(_data) is True:
@@ -121,7 +271,7 @@ Processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
             log.log2debug(20004, log_message)
 
             # Add records to the database
-            _records = Records(_data)
+            _records = Records(_data, pool=pool)
             _records.ingest()
             self.purge()
 
@@ -130,20 +280,236 @@ Processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
 Finished processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
             log.log2debug(20117, log_message)
 
+        # Skip segment records without valid data
+        elif self._reader is not None:
+            self.purge()
+
         # Determine the number of key pairs read
         records = 0
         for item in _data:
             records += len(item)
         return records
 
+    def _ingest_files(self, pool=None):
+        """Ingest cache data by sending file paths to the worker processes.
+
+        Args:
+            pool: WorkerPool object to use for multiprocessing
 
-def process_cache(batch_size=500, max_duration=3600, fileage=10, script=False):
+        Returns:
+            records: Number of records processed
+
+        """
+        # Initialize key variables
+        records = 0
+        arguments = [(_, ) for _ in self.sources()]
+
+        # Nothing to do
+        if bool(arguments) is False:
+            return records
+
+        # Log
+        log_message = ('''\
+Processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
+        log.log2debug(20215, log_message)
+
+        # Process the files
+        if self._multiprocess is True:
+            if pool is None:
+                _pool = WorkerPool()
+                try:
+                    results = _pool.starmap(
+                        _process_files_exception, arguments)
+                finally:
+                    _pool.stop()
+            else:
+                results = pool.starmap(_process_files_exception, arguments)
+        else:
+            results = [_process_files_exception(*_) for _ in arguments]
+
+        # Test for exceptions
+        for result in results:
+            if isinstance(result, ExceptionWrapper):
+                result.re_raise()
+
+        # Delete the files
+        self.purge()
+
+        # Log
+        log_message = ('''\
+Finished processing ingest cache files. Batch ID: {}'''.format(self._batch_id))
+        log.log2debug(20216, log_message)
+
+        # Determine the number of key pairs read
+        records = sum([_.records for _ in results])
+        return records
+
+    def _ingest_pipeline(self, pool=None):
+        """Ingest cache data using concurrent pipeline stages.
+
+        Args:
+            pool: WorkerPool object to use for database writes
+
+        Returns:
+            records: Number of records processed
+
+        """
+        # Nothing to do
+        if bool(self._filepaths) is False:
+            return 0
+
+        # Log
+        log_message = ('''\
+Processing ingest cache files in a pipeline. Batch ID: {}\
+'''.format(self._batch_id))
+        log.log2debug(20228, log_message)
+
+        # Process
+        records = Pipeline(self, pool=pool).run()
+        self.purge()
+
+        # Log
+        log_message = ('''\
+Finished processing ingest cache files in a pipeline. Batch ID: {}\
+'''.format(self._batch_id))
+        log.log2debug(20229, log_message)
+        return records
+
+    def _ingest_stream(self, pool=None):
+        """Ingest cache data while it is being read from files.
+
+        Args:
+            pool: WorkerPool object to use for multiprocessing
+
+        Returns:
+            records: Number of records processed
+
+        """
+        # Initialize key variables
+        records = 0
+        pending = deque()
+        agents = {}
+
+        # Bulk load the Data table rows of large groups of agent records,
+        # as is done for the files processed by each worker when parsing in
+        # workers
+        threshold = Config().bulk_load_threshold()
+
+        # Nothing to do
+        if bool(self._filepaths) is False:
+            return records
+
+        # Log
+        log_message = ('''\
+Streaming ingest cache files. Batch ID: {}'''.format(self._batch_id))
+        log.log2debug(20222, log_message)
+
+        # Process each agent's data without waiting for the others to be read
+        if self._multiprocess is True:
+            if pool is None:
+                _pool = WorkerPool()
+            else:
+                _pool = pool
+
+            try:
+                # Limit the amount of queued data to limit memory usage
+                for pdbrs in self.stream():
+                    # The records of an agent may be split into several
+                    # groups. Process them in order, so that concurrent
+                    # workers don't create the same DataPoints or move the
+                    # last_timestamp backwards.
+                    pattoo_agent_id = pdbrs[0].pattoo_agent_id
+                    if pattoo_agent_id in agents:
+                        _stream_result(agents.pop(pattoo_agent_id))
+
+                    bulk = bool(threshold) is True and len(
+                        pdbrs) >= threshold
+                    result = _pool.apply_async(
+                        _process_data_exception, (pdbrs, bulk))
+                    pending.append((pattoo_agent_id, result))
+                    agents[pattoo_agent_id] = result
+                    records += len(pdbrs)
+                    while len(pending) > _pool.processes() * 2:
+                        _stream_result(_pending(pending, agents))
+
+                # Wait for the remaining results
+                while bool(pending) is True:
+                    _stream_result(_pending(pending, agents))
+            finally:
+                if pool is None:
+                    _pool.stop()
+        else:
+            for pdbrs in self.stream():
+                bulk = bool(threshold) is True and len(pdbrs) >= threshold
+                process_db_records(pdbrs, bulk=bulk)
+                records += len(pdbrs)
+
+        # Delete the files
+        self.purge()
+
+        # Log
+        log_message = ('''\
+Finished streaming ingest cache files. Batch ID: {}'''.format(self._batch_id))
+        log.log2debug(20223, log_message)
+        return records
+
+
+def _stream_result(result):
+    """Wait for the result of streamed data processing.
+
+    Args:
+        result: multiprocessing AsyncResult object
+
+    Returns:
+        None
+
+    """
+    # Test for exceptions
+    _result = result.get()
+    if isinstance(_result, ExceptionWrapper):
+        _result.re_raise()
+
+
+def _pending(pending, agents):
+    """Remove the oldest streamed data processing task from the queue.
+
+    Args:
+        pending: deque of (agent_id, AsyncResult) tuples
+        agents: Dict of the most recent AsyncResult keyed by agent_id
+
+    Returns:
+        result: AsyncResult of the task
+
+    """
+    # Stop tracking the agent's task
+    pattoo_agent_id, result = pending.popleft()
+    if agents.get(pattoo_agent_id) is result:
+        del agents[pattoo_agent_id]
+    return result
+
+
+def process_cache(
+        batch_size=None, max_duration=3600, fileage=None, pool=None,
+        shards=None, coordinator=None, sizer=None):
     """Ingest data.
 
     Args:
-        batch_size: Number of files to process at a time
+        batch_size: Number of files to process at a time. Uses the
+            "batch_size" configuration value if None.
         max_duration: Maximum duration
-        fileage: Minimum age of files to be processed in seconds
+        fileage: Minimum age of files to be processed in seconds. Uses the
+            "fileage" configuration value if None. All completed files are
+            processed without delay if 0.
+        pool: WorkerPool object to use for multiprocessing. A WorkerPool
+            that lasts for the duration of the function is used if None.
+        shards: List of cache shard numbers to process. All cache files are
+            processed if None.
+        coordinator: Coordinator object used to claim the shards to process
+            when ingesters on several servers share the cache. Overrides
+            shards.
+        sizer: BatchSizer object that adjusts the number of files per batch.
+            Passing the same object to each call keeps the size learned from
+            previous calls. Overrides batch_size.
 
     Returns:
         success: True if successful
@@ -165,61 +531,113 @@ def process_cache(batch_size=500, max_duration=3600, fileage=10, script=False):
     files_read = 0
     success = True
 
-    # Get cache directory
+    # Only process the shards claimed by this ingester
+    if coordinator is not None:
+        shards = coordinator.claim()
+        if shards is not None and bool(shards) is False:
+            log_message = 'No agent cache shards claimed by this ingester.'
+            log.log2debug(20237, log_message)
+            return success
+
+    # Get cache directories
     config = Config()
-    directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+    api_config = ConfigAgentAPId()
+    directories = api_config.cache_directories(shards=shards)
+    if fileage is None:
+        fileage = config.fileage()
+    zero_age = bool(fileage) is False
+    if sizer is None:
+        if batch_size is None:
+            batch_size = config.batch_size()
+        sizer = BatchSizer(
+            batch_size,
+            duration=config.batch_duration(),
+            memory=config.batch_max_memory() * 1048576)
 
     # Log what we are doing
     log_message = 'Processing ingest cache.'
     log.log2info(20085, log_message)
 
-    # Get the number of files in the directory
-    files_found = len(
-        [_ for _ in os.listdir(directory) if _.endswith('.json')])
-
-    # Create lockfile only if running as a script.
-    # The daemon has its own locking mechanism
-    if bool(script) is True:
-        success = _lock()
-        if bool(success) is False:
-            return bool(success)
-
-    # Process the files in batches to reduce the database connection count
-    # This can cause errors
-    while True:
-        # Agents constantly update files. We don't want an infinite loop
-        # situation where we always have files available that are newer than
-        # the desired fileage.
-        loopstart = time.time()
-        fileage = fileage + looptime
-
-        # Automatically stop if we are going on too long.(1 of 2)
-        duration = loopstart - start
-        if duration > max_duration:
-            log_message = ('''\
+    # Get the number of files in the directory. The number of records in
+    # segment logs is unknown until they are read.
+    if api_config.cache_backend() == 'segment':
+        files_found = None
+    else:
+        files_found = 0
+        for directory in directories:
+            files_found += len(
+                [_ for _ in os.listdir(directory) if _.endswith(
+                    serialize.SUFFIXES)])
+
+    # Lock the cache so that the ingester script and daemon never ingest
+    # at the same time
+    success = _lock()
+    if bool(success) is False:
+        return bool(success)
+
+    # Release the lock and stop temporary worker processes even if
+    # ingesting fails
+    _pool = None
+    try:
+        # Use the same worker processes for every batch
+        if pool is None and config.multiprocessing() is True:
+            _pool = WorkerPool()
+        else:
+            _pool = pool
+
+        # Process the files in batches to reduce the database connection
+        # count. This can cause errors
+        while True:
+            # Agents constantly update files. We don't want an infinite loop
+            # situation where we always have files available that are newer
+            # than the desired fileage. Files are only visible once
+            # completely written, so there is no need to do this when all
+            # files are processed regardless of age. The number of files
+            # found at the start limits the loop instead.
+            loopstart = time.time()
+            if zero_age is False:
+                fileage = fileage + looptime
+
+            # Automatically stop if we are going on too long.(1 of 2)
+            duration = loopstart - start
+            if duration > max_duration:
+                log_message = ('''\
 Stopping ingester after exceeding the maximum runtime duration of {}s. \
 This can be adjusted on the CLI.'''.format(max_duration))
-            log.log2info(20022, log_message)
-            break
-
-        # Automatically stop if we are going on too long.(2 of 2)
-        if files_read >= files_found:
-            # No need to log. This is an expected outcome.
-            break
-
-        # Read data from cache. Stop if there is no data found.
-        cache = Cache(batch_size=batch_size, age=fileage)
-        count = cache.ingest()
-
-        # Automatically stop if we are going on too long.(2 of 2)
-        if bool(cache.files) is False:
-            # No need to log. This is an expected outcome.
-            break
-
-        # Get the records processed, looptime and files read
-        records += count
-        files_read += cache.files
-        looptime = max(time.time() - loopstart, looptime)
+                log.log2info(20022, log_message)
+                break
+
+            # Automatically stop if we are going on too long.(2 of 2)
+            if files_found is not None and files_read >= files_found:
+                # No need to log. This is an expected outcome.
+                break
+
+            # Read data from cache. Stop if there is no data found.
+            cache = Cache(
+                batch_size=sizer.size(), age=fileage, shards=shards)
+            count = cache.ingest(pool=_pool)
+
+            # Automatically stop if we are going on too long.(2 of 2)
+            if bool(cache.files) is False:
+                # No need to log. This is an expected outcome.
+                break
+
+            # Get the records processed, looptime and files read
+            records += count
+            files_read += cache.files
+            looptime = max(time.time() - loopstart, looptime)
+
+            # Adjust the size of the next batch
+            sizer.update(
+                cache.files, time.time() - loopstart, records=count,
+                pool=_pool)
+    finally:
+        # Stop temporary worker processes
+        if pool is None and _pool is not None:
+            _pool.stop()
+
+        # Delete lockfile
+        success = _lock(delete=True)
 
     # Print result
     duration = time.time() - start
@@ -233,11 +651,6 @@ Agent cache ingest completed. {0} records processed in {1:.2f} seconds, \
         log_message = 'No files found to ingest'
         log.log2info(20021, log_message)
 
-    # Delete lockfile only if running as a script.
-    # The daemon has its own locking mechanism
-    if bool(script) is True:
-        success = _lock(delete=True)
-
     # Log what we are doing
     log_message = 'Finished processing ingest cache.'
     log.log2info(20020, log_message)
@@ -245,42 +658,187 @@ Agent cache ingest completed. {0} records processed in {1:.2f} seconds, \
     return bool(success)
 
 
-def _lock(delete=False):
-    """Create a lock file.
+def _filepaths(directory, age=0, count=None):
+    """Get the paths of cache files without reading them.
+
+    Args:
+        directory: Cache directory
+        age: Minimum age of files in seconds
+        count: Maximum number of file paths to return
+
+    Returns:
+        result: Sorted list of file paths
+
+    """
+    # Initialize key variables
+    result = []
+    now = time.time()
+
+    # Get files that are old enough
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(serialize.SUFFIXES) is False:
+            continue
+        filepath = os.path.join(directory, filename)
+
+        # Every file is complete. Only check ages if required.
+        if bool(age) is True:
+            try:
+                if now - os.path.getmtime(filepath) < age:
+                    continue
+            except OSError:
+                # The file may have been deleted
+                continue
+        result.append(filepath)
+
+        # Limit the number of files
+        if bool(count) is True and len(result) >= count:
+            break
+
+    # Return
+    return result
+
+
+def _read_json_files(directory, age=0, count=None):
+    """Read cache files.
+
+    Args:
+        directory: Cache directory
+        age: Minimum age of files in seconds
+        count: Maximum number of files to read
+
+    Returns:
+        result: Sorted list of (filepath, data) tuples. The data of files
+            that can't be read is an empty dict so that they are purged.
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Read the files
+    for filepath in _filepaths(directory, age=age, count=count):
+        try:
+            with open(filepath, 'rb') as f_handle:
+                data = serialize.decode(f_handle.read())
+        except:
+            log_message = ('''\
+Error reading file {}. It will not be processed'''.format(filepath))
+            log.log2info(20230, log_message)
+            data = {}
+        result.append((filepath, data))
+    return result
+
+
+def _source(filepath):
+    """Get the source component of a cache file path.
+
+    Cache filenames have the format "timestamp_source_suffix.json", or
+    "timestamp_source_suffix.msgpack" for binary data.
 
     Args:
-        delete: Delete the file if true
+        filepath: Cache file path
 
     Returns:
+        result: Source of the cache file
+
+    """
+    # Initialize key variables
+    filename = os.path.splitext(os.path.basename(filepath))[0]
+    parts = filename.split('_')
+
+    # Return the whole filename if it doesn't have the expected format
+    if len(parts) < 3:
+        result = filename
+    else:
+        result = '_'.join(parts[1:-1])
+    return result
+
+
+def locked():
+    """Determine whether an ingester holds the ingester lock file.
+
+    Args:
         None
 
+    Returns:
+        result: True if locked
+
+    """
+    # Initialize key variables
+    config = Config()
+    lockfile = files.lock_file(PATTOO_INGESTER_NAME, config)
+    result = False
+
+    # Locks are released when processes stop, so stale lock files are
+    # never locked
+    try:
+        fd = os.open(lockfile, os.O_RDONLY)
+    except OSError:
+        return result
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except OSError:
+        result = True
+    finally:
+        os.close(fd)
+    return result
+
+
+def _lock(delete=False):
+    """Lock the ingester lock file.
+
+    The file contains the process ID of the ingester holding the lock. The
+    lock is released automatically if the ingester stops unexpectedly.
+
+    Args:
+        delete: Unlock and delete the file if true
+
+    Returns:
+        success: True if successful
+
     """
     # Initialize key variables
+    global _LOCK
     config = Config()
     lockfile = files.lock_file(PATTOO_INGESTER_NAME, config)
     success = False
 
+    # Unlock
+    if bool(delete) is True:
+        if _LOCK is None:
+            log_message = ('Lockfile {} not locked.'.format(lockfile))
+            log.log2warning(20108, log_message)
+            return success
+        try:
+            os.remove(lockfile)
+            success = True
+        except:
+            log_message = ('Error deleting lockfile {}.'.format(lockfile))
+            log.log2warning(20107, log_message)
+        os.close(_LOCK)
+        _LOCK = None
+        return success
+
     # Lock
-    if bool(delete) is False:
-        if os.path.exists(lockfile) is True:
-            log_message = ('''\
-Lockfile {} exists. Will not start ingester script. Is another Ingester \
-instance running? If not, delete the lockfile and rerun this script.\
+    fd = os.open(lockfile, os.O_RDWR | os.O_CREAT, 0o640)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        # The file may have been deleted by its previous owner before it
+        # was locked
+        if os.fstat(fd).st_ino != os.stat(lockfile).st_ino:
+            raise BlockingIOError
+    except OSError:
+        os.close(fd)
+        log_message = ('''\
+Lockfile {} is locked. Will not ingest the cache. Another Ingester \
+instance is running.\
 '''.format(lockfile))
-            log.log2warning(20023, log_message)
-        else:
-            open(lockfile, 'a').close()
-            success = True
-    else:
-        if os.path.exists(lockfile) is True:
-            try:
-                os.remove(lockfile)
-                success = True
-            except:
-                log_message = ('Error deleting lockfile {}.'.format(lockfile))
-                log.log2warning(20107, log_message)
-        else:
-            log_message = ('Lockfile {} not found.'.format(lockfile))
-            log.log2warning(20108, log_message)
+        log.log2warning(20023, log_message)
+        return success
 
+    # Save the process ID of the owner
+    os.ftruncate(fd, 0)
+    os.write(fd, str(os.getpid()).encode())
+    _LOCK = fd
+    success = True
     return success
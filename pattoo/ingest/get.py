@@ -22,8 +22,8 @@ def pairs(pattoo_db_record):
     _pairs = key_value_pairs(pattoo_db_record)
 
     # Get list of pairs in the database
-    pair.insert_rows(_pairs)
-    result = pair.idx_pairs(_pairs)
+    lookup = pair.insert_rows(_pairs)
+    result = sorted(lookup.values())
 
     # Return
     return result
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""Pattoo pipelined ingestion of agent cache data.
+
+Cache data is processed by three concurrent stages connected by bounded
+queues:
+
+    1) A reader thread reads the contents of the cache files
+    2) Parser processes convert the contents to PattooDBrecord objects
+    3) Writer processes add the records to the database
+
+"""
+
+# Standard imports
+from collections import deque
+import queue
+import sys
+import threading
+import time
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.configuration import ConfigIngester as Config
+from .records import ExceptionWrapper, parse, _process_data_exception
+from .pool import WorkerPool
+
+# Parser processes that persist across ingest batches
+_PARSERS = None
+
+# Markers used in the reader queue
+_END_OF_SOURCE = 'end_of_source'
+_END_OF_FILES = 'end_of_files'
+
+
+class Stage():
+    """Throughput and queue depth statistics of a pipeline stage."""
+
+    def __init__(self, name):
+        """Initialize the class.
+
+        Args:
+            name: Name of the stage
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.name = name
+        self.items = 0
+        self.depth = 0
+        self._start = None
+        self._stop = None
+
+    def update(self, items=1, depth=0):
+        """Update the statistics.
+
+        Args:
+            items: Number of items processed
+            depth: Current depth of the queue feeding the stage
+
+        Returns:
+            None
+
+        """
+        # Update
+        now = time.time()
+        if self._start is None:
+            self._start = now
+        self._stop = now
+        self.items += items
+        self.depth = max(self.depth, depth)
+
+    def rate(self):
+        """Get the throughput of the stage.
+
+        Args:
+            None
+
+        Returns:
+            result: Items per second
+
+        """
+        # Initialize key variables
+        result = 0
+
+        # Return
+        if self._start is not None and self._stop > self._start:
+            result = self.items / (self._stop - self._start)
+        return result
+
+    def summary(self):
+        """Get a summary of the statistics.
+
+        Args:
+            None
+
+        Returns:
+            result: Summary string
+
+        """
+        # Return
+        result = ('''\
+{0}: {1} items, {2:.2f} items / second, maximum queue depth {3}\
+'''.format(self.name, self.items, self.rate(), self.depth))
+        return result
+
+
+class Pipeline():
+    """Ingest cache files using concurrent stages."""
+
+    def __init__(self, cache, pool=None):
+        """Initialize the class.
+
+        Args:
+            cache: files.Cache object
+            pool: WorkerPool object to use for database writes. A temporary
+                WorkerPool is used if None.
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        config = Config()
+        self._cache = cache
+        self._pool = pool
+        self._queue_size = config.pipeline_queue_size()
+        self._parsers = config.pipeline_parsers()
+        self._writers = config.pipeline_writers()
+        self.stages = [Stage('read'), Stage('parse'), Stage('write')]
+        self._error = None
+
+    def run(self):
+        """Run the pipeline until all the cache files are processed.
+
+        Args:
+            None
+
+        Returns:
+            records: Number of records processed
+
+        """
+        # Initialize key variables
+        (_, parse_stage, _) = self.stages
+        records = 0
+        parsing = deque()
+        writing = deque()
+        groups = {}
+        raw = queue.Queue(maxsize=self._queue_size)
+        parsers = parser_pool(self._parsers)
+        if self._pool is None:
+            writers = WorkerPool()
+        else:
+            writers = self._pool
+
+        # Start reading files
+        reader = threading.Thread(target=self._read, args=(raw, ))
+        reader.daemon = True
+        reader.start()
+
+        try:
+            while True:
+                item = raw.get()
+                if item == _END_OF_FILES:
+                    break
+
+                # All the files of a source have been sent for parsing
+                if item == _END_OF_SOURCE:
+                    while bool(parsing) is True:
+                        self._parsed(parsing.popleft(), groups)
+                    records += self._write(groups, writing, writers)
+                    groups = {}
+                    continue
+
+                # Parse
+                (filepath, text) = item
+                parsing.append(parsers.apply_async(parse, (filepath, text)))
+                parse_stage.update(items=0, depth=len(parsing))
+                while len(parsing) > self._queue_size:
+                    self._parsed(parsing.popleft(), groups)
+
+            # Wait for the remaining writes
+            while bool(writing) is True:
+                self._written(writing.popleft())
+        finally:
+            if self._pool is None:
+                writers.stop()
+
+            # Make sure the reader isn't blocked by a full queue after errors
+            while reader.is_alive() is True:
+                try:
+                    raw.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+        # Report errors reading files
+        if self._error is not None:
+            self._error.re_raise()
+
+        # Log the statistics of each stage to help find bottlenecks
+        for stage in self.stages:
+            log.log2debug(20224, 'Ingest pipeline {}'.format(stage.summary()))
+        return records
+
+    def _read(self, raw):
+        """Read cache files in order of source. Runs in a thread.
+
+        Args:
+            raw: Queue.Queue object for the file contents
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        (read_stage, _, _) = self.stages
+
+        try:
+            for filepaths in self._cache.sources():
+                for filepath in filepaths:
+                    try:
+                        with open(filepath, 'rb') as f_handle:
+                            text = f_handle.read()
+                    except:
+                        log_message = ('''\
+Error reading file {}. It will not be processed'''.format(filepath))
+                        log.log2info(20226, log_message)
+                        continue
+                    raw.put((filepath, text))
+                    read_stage.update(depth=raw.qsize())
+                raw.put(_END_OF_SOURCE)
+        except Exception as error:
+            self._error = ExceptionWrapper(error)
+        except:
+            _exception = sys.exc_info()
+            log.log2exception(20227, _exception)
+        finally:
+            raw.put(_END_OF_FILES)
+
+    def _parsed(self, result, groups):
+        """Add parsed PattooDBrecord objects to groups by agent_id.
+
+        Args:
+            result: multiprocessing AsyncResult object of the parser
+            groups: Dict of PattooDBrecord object lists keyed by agent_id
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        (_, parse_stage, _) = self.stages
+
+        # Group data by agent_id
+        pdbrs = result.get()
+        parse_stage.update()
+        if bool(pdbrs) is False:
+            return
+        pattoo_agent_id = pdbrs[0].pattoo_agent_id
+        if pattoo_agent_id in groups:
+            groups[pattoo_agent_id].extend(pdbrs)
+        else:
+            groups[pattoo_agent_id] = pdbrs
+
+    def _write(self, groups, writing, writers):
+        """Send agent data to the writer processes.
+
+        Args:
+            groups: Dict of PattooDBrecord object lists keyed by agent_id
+            writing: Deque of pending writer AsyncResult objects
+            writers: WorkerPool object for the writer processes
+
+        Returns:
+            records: Number of records sent
+
+        """
+        # Initialize key variables
+        (_, _, write_stage) = self.stages
+        records = 0
+
+        # Process
+        for _, pdbrs in sorted(groups.items()):
+            writing.append(
+                writers.apply_async(_process_data_exception, (pdbrs, )))
+            records += len(pdbrs)
+            write_stage.update(items=0, depth=len(writing))
+            while len(writing) > self._writers:
+                self._written(writing.popleft())
+        return records
+
+    def _written(self, result):
+        """Wait for the result of a writer process.
+
+        Args:
+            result: multiprocessing AsyncResult object of the writer
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        (_, _, write_stage) = self.stages
+
+        # Test for exceptions
+        _result = result.get()
+        write_stage.update()
+        if isinstance(_result, ExceptionWrapper):
+            _result.re_raise()
+
+
+def parser_pool(processes):
+    """Get the parser processes of the ingest pipeline.
+
+    Args:
+        processes: Number of parser processes
+
+    Returns:
+        result: WorkerPool object
+
+    """
+    # Create the parser processes once
+    global _PARSERS
+    if _PARSERS is None or _PARSERS.processes() != processes:
+        if _PARSERS is not None:
+            _PARSERS.stop()
+        _PARSERS = WorkerPool(processes=processes, database=False)
+    result = _PARSERS
+    return result
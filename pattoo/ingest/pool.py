@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Pattoo long lived pool of ingest worker processes."""
+
+# Standard imports
+from multiprocessing import get_context, cpu_count, TimeoutError
+from time import time
+import os
+import sys
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.configuration import ConfigIngester as Config
+from pattoo.db import db
+from pattoo.db.table import pair
+
+
+class WorkerPool():
+    """Long lived pool of ingest worker processes.
+
+    Worker processes are started once and reused for every ingest batch. Each
+    worker creates its database engine once when it imports pattoo, warms its
+    Pair cache when it starts, and keeps its process wide caches between
+    batches. Workers are replaced after completing a configurable number of
+    tasks.
+
+    """
+
+    def __init__(
+            self, processes=None, max_tasks=None, timeout=60, database=True,
+            interval=300):
+        """Initialize the class.
+
+        Args:
+            processes: Number of worker processes. Defaults to the CPU count
+            max_tasks: Number of tasks a worker completes before it is
+                replaced. Uses the "worker_max_tasks" configuration value if
+                None.
+            timeout: Seconds to wait for workers to respond to health checks
+            database: Verify database connectivity when workers start if True
+            interval: Minimum number of seconds between the health checks
+                done before running tasks
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        if processes is None:
+            processes = cpu_count()
+        if max_tasks is None:
+            max_tasks = Config().worker_max_tasks()
+        self._processes = max(1, int(processes))
+        self._max_tasks = max_tasks
+        self._timeout = timeout
+        self._database = bool(database)
+        self._interval = interval
+        self._checked = 0
+        self._pool = None
+        self._context = get_context('spawn')
+
+        # Pair cache hits and misses of all the workers
+        self._pair_hits = self._context.Value('Q', 0)
+        self._pair_misses = self._context.Value('Q', 0)
+
+    def processes(self):
+        """Get the number of worker processes.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of worker processes
+
+        """
+        # Return
+        result = self._processes
+        return result
+
+    def start(self):
+        """Start the worker processes.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Do nothing if already started
+        if self._pool is not None:
+            return
+
+        # Create a pool of sub process resources
+        if self._database is True:
+            initializer = _initialize
+            initargs = (self._pair_hits, self._pair_misses)
+        else:
+            initializer = None
+            initargs = ()
+        self._pool = self._context.Pool(
+            processes=self._processes,
+            initializer=initializer,
+            initargs=initargs,
+            maxtasksperchild=self._max_tasks)
+        self._checked = time()
+
+        # Log
+        log_message = 'Started {} ingest worker processes'.format(
+            self._processes)
+        log.log2debug(20205, log_message)
+
+    def stop(self):
+        """Stop the worker processes.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Do nothing if not started
+        if self._pool is None:
+            return
+
+        # Wait for all the processes to end
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+
+    def restart(self):
+        """Replace all the worker processes.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Terminate unresponsive workers
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+        # Start again
+        self.start()
+
+    def pids(self):
+        """Get the process IDs of the worker processes.
+
+        Args:
+            None
+
+        Returns:
+            result: List of process IDs. Empty if the workers aren't started.
+
+        """
+        # Initialize key variables
+        result = []
+
+        # The multiprocessing Pool keeps its worker Process objects in _pool
+        if self._pool is not None:
+            result = [
+                _.pid for _ in self._pool._pool if _.pid is not None]
+        return result
+
+    def pair_stats(self):
+        """Get the Pair cache statistics of the worker processes.
+
+        Args:
+            None
+
+        Returns:
+            result: Dict of the Pair cache hits and misses of all the worker
+                processes since the WorkerPool was created
+
+        """
+        # Return
+        result = {
+            'hits': self._pair_hits.value,
+            'misses': self._pair_misses.value}
+        return result
+
+    def healthy(self):
+        """Determine whether the worker processes respond to tasks.
+
+        A trivial task is sent for each worker process. Any worker can answer
+        more than one of them, so this detects a pool that no longer runs
+        tasks rather than a single unresponsive worker. The tasks count
+        towards the number of tasks a worker completes before it is replaced.
+
+        Args:
+            None
+
+        Returns:
+            result: True if healthy
+
+        """
+        # Initialize key variables
+        result = False
+
+        # Fail if not started
+        if self._pool is None:
+            return result
+
+        # Send a trivial task for each worker
+        try:
+            responses = [
+                self._pool.apply_async(_ping) for _ in range(
+                    self._processes)]
+            for response in responses:
+                response.get(timeout=self._timeout)
+            result = True
+        except TimeoutError:
+            log_message = ('''\
+Ingest worker processes did not respond within {}s\
+'''.format(self._timeout))
+            log.log2warning(20206, log_message)
+        except:
+            _exception = sys.exc_info()
+            log.log2exception(20207, _exception)
+        self._checked = time()
+
+        # Return
+        return result
+
+    def starmap(self, func, arguments):
+        """Run a function against a list of argument tuples.
+
+        Args:
+            func: Function to run
+            arguments: List of argument tuples
+
+        Returns:
+            result: List of function results
+
+        """
+        # Make sure the workers are usable. Health checks use up worker
+        # tasks, so they are only done every "interval" seconds.
+        if self._pool is None:
+            self.start()
+        elif time() - self._checked >= self._interval:
+            if self.healthy() is False:
+                self.restart()
+
+        # Process
+        result = self._pool.starmap(func, arguments)
+        return result
+
+    def apply_async(self, func, arguments):
+        """Run a function in a worker process without waiting for the result.
+
+        The worker processes are started if required.
+
+        Args:
+            func: Function to run
+            arguments: Tuple of function arguments
+
+        Returns:
+            result: multiprocessing AsyncResult object
+
+        """
+        # Start the workers if required
+        self.start()
+
+        # Process
+        result = self._pool.apply_async(func, arguments)
+        return result
+
+
+def _initialize(hits=None, misses=None):
+    """Initialize a worker process.
+
+    Args:
+        hits: multiprocessing Value object counting Pair cache hits
+        misses: multiprocessing Value object counting Pair cache misses
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    _cache = pair.cache()
+    if hits is not None and misses is not None:
+        _cache.share(hits, misses)
+
+    # The database engine of the worker process is created once, when
+    # pattoo.db is imported. Make sure it works before accepting tasks.
+    if db.connectivity(die=False) is True:
+        # Pair lookups are done by the workers. Load their Pair cache.
+        _cache.warm()
+
+
+def _ping():
+    """Respond to a WorkerPool health check.
+
+    Args:
+        None
+
+    Returns:
+        result: Process ID of the worker
+
+    """
+    # Return
+    result = os.getpid()
+    return result
@@ -2,11 +2,8 @@
 """Pattoo classes that manage various data."""
 
 # Standard imports
-from multiprocessing import get_context, cpu_count
-
+from multiprocessing import cpu_count
 import sys
-import time
-import random
 
 # PIP3 imports
 import tblib.pickling_support
@@ -15,9 +12,13 @@ tblib.pickling_support.install()
 
 # Import project libraries
 from pattoo_shared.constants import DATA_NONE, DATA_STRING
-from pattoo_shared import log
-from pattoo.constants import IDXTimestampValue, ChecksumLookup
+from pattoo_shared import log, converter
+from pattoo.constants import (
+    IDXTimestampValue, ChecksumLookup, IngestCounters)
+from pattoo.data import shard
+from pattoo import serialize
 from pattoo.ingest import get
+from pattoo.ingest.pool import WorkerPool
 from pattoo.db import misc
 from pattoo.db.table import pair, glue, data, datapoint
 from pattoo.configuration import ConfigIngester as Config
@@ -68,13 +69,15 @@ class ExceptionWrapper():
 class Records():
     """Process data using multiprocessing."""
 
-    def __init__(self, pattoo_db_records_lists):
+    def __init__(self, pattoo_db_records_lists, pool=None):
         """Initialize the class.
 
         Args:
             pattoo_db_records_lists: List of PattooDBrecord oject lists
                 grouped by source and sorted by timestamp. This data is
                 obtained from PattooShared.converter.extract
+            pool: WorkerPool object to use for multiprocessing. A temporary
+                WorkerPool is used if None.
 
         Returns:
             None
@@ -87,14 +90,18 @@ class Records():
         self._arguments = [
             (_, ) for _ in pattoo_db_records_lists if bool(_) is True]
         self._multiprocess = config.multiprocessing()
-        self._pool_size = cpu_count()
+        self._single_pass = config.single_pass()
+        self._pool = pool
+        self.counters = IngestCounters(agents=0, records=0, rows=0)
+
+        # Use bulk loading of Data table rows for very large batches
+        threshold = config.bulk_load_threshold()
+        rows = sum([len(_[0]) for _ in self._arguments])
+        self._bulk = bool(threshold) is True and rows >= threshold
 
     def multiprocess_pairs(self):
         """Update rows in the Pair database table if necessary.
 
-        Do all multiprocessing outside of the class for consistent results
-        without unexpected hanging waiting for pool.join() to happen.
-
         Args:
             None
 
@@ -104,17 +111,10 @@ class Records():
         """
         # Initialize key variables
         pattoo_db_records_lists_tuple = self._arguments
-        pool_size = self._pool_size
-
-        # Create a pool of sub process resources
-        with get_context('spawn').Pool(processes=pool_size) as pool:
 
-            # Create sub processes from the pool
-            per_process_key_value_pairs = pool.starmap(
-                _process_kvps_exception, pattoo_db_records_lists_tuple)
-
-        # Wait for all the processes to end and get results
-        pool.join()
+        # Process the records using the worker processes
+        per_process_key_value_pairs = self._starmap(
+            _process_kvps_exception, pattoo_db_records_lists_tuple)
 
         # Test for exceptions
         for result in per_process_key_value_pairs:
@@ -127,9 +127,6 @@ class Records():
     def multiprocess_data(self):
         """Insert rows into the Data and DataPoint tables as necessary.
 
-        Do all multiprocessing outside of the class for consistent results
-        without unexpected hanging waiting for pool.join() to happen.
-
         Args:
             None
 
@@ -138,29 +135,131 @@ class Records():
 
         """
         # Initialize key variables
-        pattoo_db_records_lists_tuple = self._arguments
-        pool_size = self._pool_size
+        pattoo_db_records_lists_tuple = [
+            (_[0], ) for _ in self._arguments]
 
         # Troubleshooting log
         log_message = 'Processing {} agents from cache'.format(
             len(pattoo_db_records_lists_tuple))
         log.log2debug(20009, log_message)
 
-        # Create a pool of sub process resources
-        with get_context('spawn').Pool(processes=pool_size) as pool:
+        # Bulk load the data of all agents at once
+        if self._bulk is True:
+            self._load([([_[0]], ) for _ in self._arguments])
+            return
 
-            # Create sub processes from the pool
-            results = pool.starmap(
-                _process_data_exception, pattoo_db_records_lists_tuple)
+        # Process the records using the worker processes
+        results = self._starmap(
+            _process_data_exception, pattoo_db_records_lists_tuple)
 
-        # Wait for all the processes to end and get results
-        pool.join()
+        # Test for exceptions
+        for result in results:
+            if isinstance(result, ExceptionWrapper):
+                result.re_raise()
+
+    def multiprocess_shards(self):
+        """Process all agent data in a single pass per worker process.
+
+        Agents are divided into one shard per worker process using their
+        agent_id values. Each worker process resolves key-value pairs,
+        creates new datapoints and inserts the data for all the agents in its
+        shard. Only counters and errors are returned.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        agents = 0
+        records = 0
+        rows = 0
+        if self._pool is not None:
+            count = self._pool.processes()
+        else:
+            count = cpu_count()
+        shards = [[] for _ in range(count)]
+
+        # Assign agents to shards
+        for (pattoo_db_records, ) in self._arguments:
+            shards[shard(
+                pattoo_db_records[0].pattoo_agent_id, count)].append(
+                    pattoo_db_records)
+        arguments = [(_, self._bulk) for _ in shards if bool(_) is True]
+
+        # Troubleshooting log
+        log_message = 'Processing {} agents from cache in {} shards'.format(
+            len(self._arguments), len(arguments))
+        log.log2debug(20208, log_message)
+
+        # Process the records using the worker processes
+        results = self._starmap(_process_shard_exception, arguments)
 
         # Test for exceptions
         for result in results:
             if isinstance(result, ExceptionWrapper):
                 result.re_raise()
 
+        # Aggregate counters
+        for result in results:
+            agents += result.agents
+            records += result.records
+            rows += result.rows
+        self.counters = IngestCounters(
+            agents=agents, records=records, rows=rows)
+
+    def _load(self, arguments):
+        """Bulk load the Data table rows of all agents in a single load.
+
+        The worker processes create the required DataPoint table entries and
+        return the Data table rows, which are then written to a single file
+        and loaded into the database.
+
+        Args:
+            arguments: List of argument tuples for _data_rows_exception
+
+        Returns:
+            result: Number of Data table rows processed
+
+        """
+        # Get the rows from the worker processes
+        results = self._starmap(_data_rows_exception, arguments)
+
+        # Test for exceptions
+        for result in results:
+            if isinstance(result, ExceptionWrapper):
+                result.re_raise()
+
+        # Load
+        result = data.load_rows([item for _ in results for item in _])
+        return result
+
+    def _starmap(self, func, arguments):
+        """Run a function in the worker processes.
+
+        Args:
+            func: Function to run
+            arguments: List of argument tuples
+
+        Returns:
+            result: List of function results
+
+        """
+        # Use the long lived WorkerPool if available
+        if self._pool is not None:
+            result = self._pool.starmap(func, arguments)
+            return result
+
+        # Otherwise use a temporary one
+        pool = WorkerPool()
+        try:
+            result = pool.starmap(func, arguments)
+        finally:
+            pool.stop()
+        return result
+
     def singleprocess_pairs(self):
         """Update rows in the Pair database table if necessary.
 
@@ -192,9 +291,8 @@ class Records():
 
         """
         # Process data
-        for item in self._arguments:
-            row = item[0]
-            process_db_records(row)
+        process_db_records_lists(
+            [_[0] for _ in self._arguments], bulk=self._bulk)
 
     def ingest(self):
         """Insert rows into the Data and DataPoint tables as necessary.
@@ -207,7 +305,11 @@ class Records():
 
         """
         # Update
-        if self._multiprocess is True:
+        if self._multiprocess is True and self._single_pass is True:
+            # Process pairs and data in a single pass
+            self.multiprocess_shards()
+
+        elif self._multiprocess is True:
             # Process pairs
             self.multiprocess_pairs()
 
@@ -238,20 +340,6 @@ def _process_kvps_exception(pattoo_db_records):
     # Initialize key variables
     result = []
 
-    '''
-    Sleep for a short random time. We have seen where on very fast systems
-    SQLAlchemy will hang the creation of multiprocessing subprocesses. The
-    typical behaviour is the creation of one fewer
-    pattoo.db._add_engine_pidguard() log messages than agents to process.
-    These messages correspond to the creation of a subprocess which immediately
-    invalidates a parent process's DB connection that will cause errors
-    if used, which provided the clue to the source of the problem.
-
-    Though SQLAlchemy isn't used by key_value_pairs. It's added as a
-    future precaution in case it does.
-    '''
-    time.sleep((random.random() / 10) + 0.1)
-
     # Execute
     try:
         result = get.key_value_pairs(pattoo_db_records)
@@ -267,7 +355,7 @@ def _process_kvps_exception(pattoo_db_records):
     return result
 
 
-def _process_data_exception(pattoo_db_records):
+def _process_data_exception(pattoo_db_records, bulk=False):
     """Insert all data values for an agent into database.
 
     Traps any exceptions and return them for processing. Very helpful in
@@ -275,27 +363,15 @@ def _process_data_exception(pattoo_db_records):
 
     Args:
         pattoo_db_records: List of dicts read from cache files.
+        bulk: Bulk load Data table rows if True
 
     Returns:
         None
 
     """
-    # Initialize
-
-    '''
-    Sleep for a short random time. We have seen where on very fast systems
-    SQLAlchemy will hang the creation of multiprocessing subprocesses. The
-    typical behaviour is the creation of one fewer
-    pattoo.db._add_engine_pidguard() log messages than agents to process.
-    These messages correspond to the creation of a subprocess which immediately
-    invalidates a parent process's DB connection that will cause errors
-    if used, which provided the clue to the source of the problem.
-    '''
-    time.sleep((random.random() / 10) + 0.1)
-
     # Execute
     try:
-        process_db_records(pattoo_db_records)
+        process_db_records(pattoo_db_records, bulk=bulk)
     except Exception as error:
         _exception = sys.exc_info()
         log.log2exception(20132, _exception)
@@ -308,14 +384,285 @@ def _process_data_exception(pattoo_db_records):
     return None
 
 
-def process_db_records(pattoo_db_records):
+def _process_shard_exception(pattoo_db_records_lists, bulk=False):
+    """Insert all data values for a shard of agents into database.
+
+    Traps any exceptions and return them for processing. Very helpful in
+    troubleshooting multiprocessing
+
+    Args:
+        pattoo_db_records_lists: List of PattooDBrecord oject lists grouped
+            by agent_id
+        bulk: Bulk load the Data table rows of the shard at once using
+            LOAD DATA LOCAL INFILE if True
+
+    Returns:
+        result: IngestCounters object
+
+    """
+    # Initialize key variables
+    agents = 0
+    records = 0
+    rows = 0
+
+    # Execute. Only agents with records are counted.
+    try:
+        pattoo_db_records_lists = [
+            _ for _ in pattoo_db_records_lists if bool(_) is True]
+        rows = process_db_records_lists(pattoo_db_records_lists, bulk=bulk)
+        records = sum([len(_) for _ in pattoo_db_records_lists])
+        agents = len(pattoo_db_records_lists)
+    except Exception as error:
+        _exception = sys.exc_info()
+        log.log2exception(20209, _exception)
+        return ExceptionWrapper(error)
+    except:
+        _exception = sys.exc_info()
+        log.log2exception_die(20210, _exception)
+
+    # Return
+    result = IngestCounters(agents=agents, records=records, rows=rows)
+    return result
+
+
+def _data_rows_exception(pattoo_db_records_lists):
+    """Get the Data table rows of agents without writing them to the database.
+
+    Traps any exceptions and return them for processing. Very helpful in
+    troubleshooting multiprocessing
+
+    Args:
+        pattoo_db_records_lists: List of PattooDBrecord oject lists grouped
+            by agent_id
+
+    Returns:
+        result: List of IDXTimestampValue objects
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Execute
+    try:
+        for pattoo_db_records in pattoo_db_records_lists:
+            result.extend(data_rows(pattoo_db_records))
+    except Exception as error:
+        _exception = sys.exc_info()
+        log.log2exception(20239, _exception)
+        return ExceptionWrapper(error)
+    except:
+        _exception = sys.exc_info()
+        log.log2exception_die(20240, _exception)
+
+    # Return
+    return result
+
+
+def _process_files_exception(filepaths):
+    """Insert all data values from a list of cache files into database.
+
+    Traps any exceptions and return them for processing. Very helpful in
+    troubleshooting multiprocessing
+
+    Args:
+        filepaths: List of cache file paths
+
+    Returns:
+        result: IngestCounters object
+
+    """
+    # Execute
+    try:
+        result = process_files(filepaths)
+    except Exception as error:
+        _exception = sys.exc_info()
+        log.log2exception(20211, _exception)
+        return ExceptionWrapper(error)
+    except:
+        _exception = sys.exc_info()
+        log.log2exception_die(20212, _exception)
+
+    # Return
+    return result
+
+
+def process_files(filepaths):
+    """Insert all data values from a list of cache files into database.
+
+    Args:
+        filepaths: List of cache file paths
+
+    Returns:
+        result: IngestCounters object
+
+    """
+    # Initialize key variables
+    _cache = {}
+    threshold = Config().bulk_load_threshold()
+
+    # Read data from files
+    for filepath in sorted(filepaths):
+        pdbrs = read_file(filepath)
+        if bool(pdbrs) is False:
+            continue
+
+        # Group data by agent_id
+        pattoo_agent_id = pdbrs[0].pattoo_agent_id
+        if pattoo_agent_id in _cache:
+            _cache[pattoo_agent_id].extend(pdbrs)
+        else:
+            _cache[pattoo_agent_id] = pdbrs
+
+    # Use bulk loading of Data table rows for very large batches
+    records = sum([len(_) for _ in _cache.values()])
+    bulk = bool(threshold) is True and records >= threshold
+
+    # Process data
+    rows = process_db_records_lists(
+        [pdbrs for _, pdbrs in sorted(_cache.items())], bulk=bulk)
+
+    # Return
+    result = IngestCounters(agents=len(_cache), records=records, rows=rows)
+    return result
+
+
+def read_file(filepath):
+    """Read PattooDBrecord objects from a cache file.
+
+    Args:
+        filepath: Cache file path
+
+    Returns:
+        result: List of PattooDBrecord objects. Empty if the file is invalid
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Read the file
+    try:
+        with open(filepath, 'rb') as f_handle:
+            text = f_handle.read()
+    except:
+        log_message = ('''\
+Error reading file {}. It will not be processed'''.format(filepath))
+        log.log2info(20213, log_message)
+        return result
+
+    # Convert
+    result = parse(filepath, text)
+    return result
+
+
+def parse(filepath, text):
+    """Convert the contents of a cache file to PattooDBrecord objects.
+
+    Args:
+        filepath: Cache file path
+        text: Contents of the cache file as str or bytes
+
+    Returns:
+        result: List of PattooDBrecord objects. Empty if the file is invalid
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Decode the contents
+    try:
+        json_data = serialize.decode(text)
+    except:
+        log_message = ('''\
+Error reading file {}. It will not be processed'''.format(filepath))
+        log.log2info(20225, log_message)
+        return result
+
+    # Get data from JSON file. Convert to rows of key-pairs
+    if bool(json_data) is True and isinstance(json_data, dict) is True:
+        result = converter.cache_to_keypairs(json_data)
+        if bool(result) is False:
+            log_message = ('''\
+File {} has invalid data. It will not be processed'''.format(filepath))
+            log.log2info(20214, log_message)
+            result = []
+    return result
+
+
+def process_db_records_lists(pattoo_db_records_lists, bulk=False):
+    """Insert all data values for several agents into database.
+
+    Args:
+        pattoo_db_records_lists: List of PattooDBrecord oject lists grouped
+            by agent_id
+        bulk: Bulk load the Data table rows of all the agents at once using
+            LOAD DATA LOCAL INFILE if True
+
+    Returns:
+        result: Number of Data table rows processed
+
+    """
+    # Initialize key variables
+    result = 0
+    items = []
+
+    # Insert the data of each agent
+    if bool(bulk) is False:
+        for pattoo_db_records in pattoo_db_records_lists:
+            result += process_db_records(pattoo_db_records)
+        return result
+
+    # Load the data of all agents at once
+    for pattoo_db_records in pattoo_db_records_lists:
+        items.extend(data_rows(pattoo_db_records))
+    if bool(items) is True:
+        result = data.load_rows(items)
+    return result
+
+
+def process_db_records(pattoo_db_records, bulk=False):
     """Insert all data values for an agent into database.
 
     Args:
         pattoo_db_records: List of dicts read from cache files.
+        bulk: Bulk load Data table rows using LOAD DATA LOCAL INFILE if True
 
     Returns:
-        None
+        result: Number of Data table rows processed
+
+    """
+    # Get the data
+    items = data_rows(pattoo_db_records)
+
+    # Update the data table
+    if bool(items) is True:
+        if bool(bulk) is True:
+            data.load_rows(items)
+        else:
+            data.insert_rows(items)
+
+    # Log message
+    if bool(pattoo_db_records) is True:
+        log_message = ('''\
+Finished cache data processing for agent_id: {}'''.format(
+            pattoo_db_records[0].pattoo_agent_id))
+        log.log2debug(20113, log_message)
+
+    # Return
+    result = len(items)
+    return result
+
+
+def data_rows(pattoo_db_records):
+    """Get the Data table rows for an agent's data.
+
+    DataPoint table entries are created for new data, but the Data table is
+    not updated.
+
+    Args:
+        pattoo_db_records: List of dicts read from cache files.
+
+    Returns:
+        result: List of IDXTimestampValue objects
 
     Method:
         1) Get all the idx_datapoint and idx_pair values that exist in the
@@ -323,24 +670,28 @@ def process_db_records(pattoo_db_records):
            from the same source.
         2) Add these idx values to tracking memory variables for speedy lookup
         3) Ignore non numeric data values sent
-        4) Add data to the database. If new checksum values are found in the
-           PattooDBrecord data, then create the new index values to the
-           database, update the tracking memory variables before hand.
+        4) Create the index values for all new checksum values found in the
+           PattooDBrecord data in a single batch, then update the tracking
+           memory variables.
+        5) Return the data to add to the Data table.
 
     """
     # Initialize key variables
     _data = {}
+    values = []
+    new_datapoints = {}
+    result = []
 
     # Return if there is nothint to process
     if bool(pattoo_db_records) is False:
-        return
+        return result
 
     # Get DataPoint.idx_datapoint and idx_pair values from db. This is used to
     # speed up the process by reducing the need for future database access.
     agent_id = pattoo_db_records[0].pattoo_agent_id
     checksum_table = misc.agent_checksums(agent_id)
 
-    # Process data
+    # Get the numeric data values
     for pdbr in pattoo_db_records:
         # We only want to insert non-string, non-None values
         if pdbr.pattoo_data_type in [DATA_NONE, DATA_STRING]:
@@ -351,30 +702,39 @@ def process_db_records(pattoo_db_records):
             float_value = float(pdbr.pattoo_value)
         except:
             continue
+        values.append((pdbr, float_value))
+
+    # Entries not in database. Update the database for all new checksums at
+    # once and get the required idx_datapoint values
+    unknowns = [
+        pdbr for pdbr, _ in values
+        if pdbr.pattoo_checksum not in checksum_table]
+    if bool(unknowns) is True:
+        idx_datapoints = datapoint.idx_datapoints(unknowns)
+        for pdbr in unknowns:
+            idx_datapoint = idx_datapoints.get(pdbr.pattoo_checksum)
+            if bool(idx_datapoint) is False:
+                continue
+            if pdbr.pattoo_checksum in checksum_table:
+                continue
 
+            # Update the lookup table
+            checksum_table[
+                pdbr.pattoo_checksum] = ChecksumLookup(
+                    idx_datapoint=idx_datapoint,
+                    polling_interval=int(
+                        pdbr.pattoo_agent_polling_interval),
+                    last_timestamp=1)
+
+            # Track for the Glue table update
+            new_datapoints[idx_datapoint] = pdbr
+
+    # Process data
+    for pdbr, float_value in values:
         # Get the idx_datapoint value for the PattooDBrecord
-        if pdbr.pattoo_checksum in checksum_table:
-            # Get last_timestamp for existing idx_datapoint entry
-            idx_datapoint = checksum_table[
-                pdbr.pattoo_checksum].idx_datapoint
-        else:
-            # Entry not in database. Update the database and get the
-            # required idx_datapoint
-            idx_datapoint = datapoint.idx_datapoint(pdbr)
-            if bool(idx_datapoint) is True:
-                # Update the lookup table
-                checksum_table[
-                    pdbr.pattoo_checksum] = ChecksumLookup(
-                        idx_datapoint=idx_datapoint,
-                        polling_interval=int(
-                            pdbr.pattoo_agent_polling_interval),
-                        last_timestamp=1)
-
-                # Update the Glue table
-                idx_pairs = get.pairs(pdbr)
-                glue.insert_rows(idx_datapoint, idx_pairs)
-            else:
-                continue
+        if pdbr.pattoo_checksum not in checksum_table:
+            continue
+        idx_datapoint = checksum_table[pdbr.pattoo_checksum].idx_datapoint
 
         # Append item to items
         if pdbr.pattoo_timestamp > checksum_table[
@@ -397,11 +757,39 @@ def process_db_records(pattoo_db_records):
                     timestamp=pdbr.pattoo_timestamp,
                     value=float_value)
 
-    # Update the data table
-    if bool(_data) is True:
-        data.insert_rows(list(_data.values()))
+    # Update the Glue table for all new DataPoint entries at once
+    if bool(new_datapoints) is True:
+        _glue(new_datapoints)
 
-    # Log message
-    log_message = ('''\
-Finished cache data processing for agent_id: {}'''.format(agent_id))
-    log.log2debug(20113, log_message)
+    # Return
+    result = list(_data.values())
+    return result
+
+
+def _glue(new_datapoints):
+    """Create Glue table entries for new DataPoint table entries.
+
+    Args:
+        new_datapoints: Dict of PattooDBrecord objects keyed by
+            DataPoint.idx_datapoint
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    rows = []
+
+    # Get the key-value pairs of every new DataPoint in a single pass
+    kvps = {
+        idx_datapoint: get.key_value_pairs(pdbr)
+        for idx_datapoint, pdbr in new_datapoints.items()}
+    lookup = pair.insert_rows(list(kvps.values()))
+
+    # Update the Glue table
+    for idx_datapoint, _kvps in sorted(kvps.items()):
+        for _kv in _kvps:
+            idx_pair = lookup.get(_kv)
+            if bool(idx_pair) is True:
+                rows.append((idx_pair, idx_datapoint))
+    glue.insert_batch(rows)
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""Pattoo event driven ingestion of agent cache data."""
+
+# Standard imports
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo.configuration import ConfigIngester as Config
+from pattoo.configuration import ConfigAgentAPId
+from pattoo.segment import SEALED, SegmentReader
+from pattoo import serialize
+from . import files
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct('iIII')
+
+
+class Watcher():
+    """Wait for new files in a directory.
+
+    Uses inotify where available, otherwise the directory is scanned at
+    regular intervals.
+
+    """
+
+    def __init__(
+            self, directories, suffix='.json', interval=1, use_inotify=True):
+        """Initialize the class.
+
+        Args:
+            directories: List of directories to watch
+            suffix: Filename suffix, or tuple of suffixes, of the files to
+                watch
+            interval: Seconds between directory scans if inotify is not
+                available
+            use_inotify: Use inotify if True. Directory scans are useful for
+                network filesystems that don't support inotify.
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._directories = directories
+        self._suffix = suffix
+        self._interval = interval
+        self._fd = None
+        self._seen = set()
+
+        # Try to use inotify
+        if bool(use_inotify) is True:
+            try:
+                self._fd = _inotify(directories)
+            except (OSError, AttributeError) as error:
+                log_message = ('''\
+Unable to watch directories {} using inotify. Scanning them every {}s \
+instead. Reason: {}'''.format(directories, interval, error))
+                log.log2info(20220, log_message)
+        if self._fd is None:
+            self._seen = self._scan()
+
+    def inotify(self):
+        """Determine whether inotify is being used.
+
+        Args:
+            None
+
+        Returns:
+            result: True if inotify is used
+
+        """
+        # Return
+        result = self._fd is not None
+        return result
+
+    def wait(self, timeout):
+        """Wait for new files.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            result: Number of new files found
+
+        """
+        # Wait
+        if self._fd is not None:
+            result = self._events(timeout)
+        else:
+            result = self._poll(timeout)
+        return result
+
+    def close(self):
+        """Stop watching the directory.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Close
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _events(self, timeout):
+        """Wait for inotify events.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            result: Number of new files found
+
+        """
+        # Initialize key variables
+        result = 0
+
+        # Wait without polling
+        (readable, _, _) = select.select([self._fd], [], [], max(0, timeout))
+        if bool(readable) is False:
+            return result
+
+        # Count the new files
+        try:
+            buffer = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return result
+        offset = 0
+        while offset + _EVENT.size <= len(buffer):
+            (_, mask, _, length) = _EVENT.unpack_from(buffer, offset)
+            name = buffer[
+                offset + _EVENT.size:offset + _EVENT.size + length].rstrip(
+                    b'\0').decode(errors='replace')
+            offset += _EVENT.size + length
+
+            # Too many events. Treat the directory as full.
+            if bool(mask & IN_Q_OVERFLOW) is True:
+                result += len(self._scan())
+            elif name.endswith(self._suffix) is True:
+                result += 1
+        return result
+
+    def _poll(self, timeout):
+        """Scan the directory for new files.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            result: Number of new files found
+
+        """
+        # Initialize key variables
+        result = 0
+        stop = time.time() + max(0, timeout)
+
+        # Scan until new files are found or the timeout expires
+        while True:
+            current = self._scan()
+            result = len(current - self._seen)
+            self._seen = current
+            remaining = stop - time.time()
+            if bool(result) is True or remaining <= 0:
+                break
+            time.sleep(min(self._interval, remaining))
+        return result
+
+    def _scan(self):
+        """Get the paths of the files in the directories.
+
+        Args:
+            None
+
+        Returns:
+            result: Set of file paths
+
+        """
+        # Initialize key variables
+        result = set()
+
+        # Return
+        for directory in self._directories:
+            with os.scandir(directory) as entries:
+                result.update(
+                    [_.path for _ in entries if _.name.endswith(
+                        self._suffix)])
+        return result
+
+
+def process_events(pool=None, batches=None, coordinator=None, sizer=None):
+    """Ingest agent cache data as soon as it arrives.
+
+    A micro-batch is ingested once the "event_max_files" number of new files
+    arrive, or "event_max_age" seconds after the first unprocessed file
+    arrives, whichever comes first. The cache is also swept every
+    "ingester_interval" seconds in case any files were missed. Idle active
+    segments of the segment cache_backend are sealed while waiting so that
+    their records are ingested without waiting for the next sweep.
+
+    Args:
+        pool: WorkerPool object to use for multiprocessing
+        batches: Number of micro-batches to process before returning. Runs
+            forever if None.
+        coordinator: Coordinator object used to claim the shards to process
+            when ingesters on several servers share the cache
+        sizer: BatchSizer object that adjusts the number of files per batch
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    config = Config()
+    max_files = config.event_max_files()
+    max_age = config.event_max_age()
+    interval = config.ingester_interval()
+    pending = 0
+    first = None
+    count = 0
+    reader = None
+
+    # Watch for sealed segments or completed files
+    api_config = ConfigAgentAPId()
+    if api_config.cache_backend() == 'segment':
+        watcher = Watcher([api_config.segment_directory()], suffix=SEALED)
+        reader = SegmentReader(
+            api_config.segment_directory(), max_age=api_config.segment_age())
+    else:
+        watcher = Watcher(
+            api_config.cache_directories(), suffix=serialize.SUFFIXES)
+
+    # Process data that arrived before starting
+    files.process_cache(
+        fileage=0, pool=pool, coordinator=coordinator, sizer=sizer)
+    last_sweep = time.time()
+
+    while batches is None or count < batches:
+        # Wait until the next deadline
+        now = time.time()
+        if first is None:
+            timeout = interval - (now - last_sweep)
+        else:
+            timeout = min(max_age - (now - first), interval - (
+                now - last_sweep))
+
+        # Seal idle active segments. The watcher finds them once sealed.
+        if reader is not None:
+            reader.seal()
+            timeout = min(timeout, api_config.segment_age())
+        found = watcher.wait(timeout)
+
+        # Track the unprocessed files
+        now = time.time()
+        if bool(found) is True:
+            pending += found
+            if first is None:
+                first = now
+
+        # Ingest a micro-batch if required
+        if (pending >= max_files) or (
+                first is not None and now - first >= max_age) or (
+                    now - last_sweep >= interval):
+            log_message = ('''\
+Ingesting micro-batch of {} new cache files'''.format(pending))
+            log.log2debug(20221, log_message)
+            files.process_cache(
+                fileage=0, pool=pool, coordinator=coordinator, sizer=sizer)
+            pending = 0
+            first = None
+            last_sweep = time.time()
+            count += 1
+
+    # Stop watching
+    watcher.close()
+
+
+def _inotify(directories):
+    """Create an inotify file descriptor watching directories.
+
+    Args:
+        directories: List of directories to watch
+
+    Returns:
+        result: File descriptor
+
+    """
+    # Initialize key variables
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+
+    # Create the file descriptor
+    result = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if result < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+    # Watch files being closed after writing or moved into the directories
+    for directory in directories:
+        if libc.inotify_add_watch(
+                result, os.fsencode(directory),
+                IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(result)
+            raise OSError(errno, os.strerror(errno))
+    return result
@@ -0,0 +1,429 @@
+"""Append-only segment log used for the agent API cache.
+
+The pattoo_api_agentd daemon appends each agent posting to a segment file as
+a length prefixed record. Every API process has its own active segment which
+is sealed once it is large or old enough. The ingester only reads sealed
+segments, and saves the offset of the next unread record so that it can
+resume after a crash.
+
+"""
+
+# Standard imports
+import fcntl
+import os
+import struct
+import threading
+import time
+import uuid
+import zlib
+
+# Import project libraries
+from pattoo_shared import log
+from pattoo import serialize
+
+# Each record is preceded by the length and CRC32 of its JSON payload
+HEADER = struct.Struct('>II')
+
+# Filename extensions of segment files
+ACTIVE = '.active'
+SEALED = '.segment'
+OFFSET = '.offset'
+
+
+class SegmentWriter():
+    """Append records to the active segment file of a process."""
+
+    def __init__(
+            self, directory, max_bytes=16777216, max_age=10, binary=False):
+        """Initialize the class.
+
+        Args:
+            directory: Segment directory
+            max_bytes: Size in bytes at which the active segment is sealed
+            max_age: Age in seconds at which the active segment is sealed
+            binary: Encode records using the binary cache format if True
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._binary = binary
+        self._lock = threading.Lock()
+        self._fd = None
+        self._filepath = None
+        self._created = 0
+        self._size = 0
+
+    def append(self, data):
+        """Append a record to the active segment.
+
+        Args:
+            data: JSON serializable data
+
+        Returns:
+            None
+
+        """
+        # Append
+        self.extend([data])
+
+    def extend(self, items):
+        """Append records to the active segment using a single write.
+
+        Args:
+            items: List of JSON serializable data
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        record = b''.join(
+            [encode(data, binary=self._binary) for data in items])
+        if bool(record) is False:
+            return
+
+        with self._lock:
+            # Seal the active segment if it is too old
+            if self._fd is not None and (
+                    time.time() - self._created >= self._max_age):
+                self._seal()
+
+            # Write the entire records using a single system call
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                # The ingester may have sealed an idle active segment
+                if os.path.exists(self._filepath) is False:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                    self._close()
+                    self._open()
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+                os.write(self._fd, record)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._size += len(record)
+
+            # Seal the active segment if it is too large
+            if self._size >= self._max_bytes:
+                self._seal()
+
+    def close(self):
+        """Seal the active segment.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Seal
+        with self._lock:
+            self._seal()
+
+    def _open(self):
+        """Create a new active segment if required.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Do nothing if there is an active segment
+        if self._fd is not None:
+            return
+
+        # Segment filenames sort in order of creation
+        self._created = time.time()
+        self._size = 0
+        self._filepath = os.path.join(
+            self._directory, '{}_{}_{}{}'.format(
+                int(self._created * 1000), os.getpid(), uuid.uuid4().hex,
+                ACTIVE))
+        self._fd = os.open(
+            self._filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+
+    def _close(self):
+        """Close the active segment.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Close
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = None
+        self._filepath = None
+
+    def _seal(self):
+        """Seal the active segment so that the ingester can read it.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Do nothing if there is no active segment
+        if self._fd is None:
+            return
+
+        # Rename the file
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.path.exists(self._filepath) is True:
+                os.rename(self._filepath, _sealed(self._filepath))
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._close()
+
+
+class SegmentReader():
+    """Read records from sealed segment files."""
+
+    def __init__(self, directory, max_age=10):
+        """Initialize the class.
+
+        Args:
+            directory: Segment directory
+            max_age: Age in seconds at which idle active segments are sealed
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._directory = directory
+        self._max_age = max_age
+        self._positions = {}
+
+    def read(self, count=None):
+        """Read records from sealed segments.
+
+        Args:
+            count: Maximum number of records to read
+
+        Returns:
+            result: List of (segment path, data) tuples
+
+        """
+        # Initialize key variables
+        result = []
+        self._positions = {}
+
+        # Make sure data from idle API processes can be read
+        self.seal()
+
+        # Read records
+        for filepath in self.segments():
+            offset = _offset(filepath)
+            complete = True
+            for data, position in records(filepath, offset=offset):
+                result.append((filepath, data))
+                offset = position
+                if bool(count) is True and len(result) >= count:
+                    complete = position >= os.path.getsize(filepath)
+                    break
+            self._positions[filepath] = (offset, complete)
+
+            # Stop when enough records are read
+            if bool(count) is True and len(result) >= count:
+                break
+
+        # Return
+        return result
+
+    def commit(self):
+        """Record the progress of the previous read.
+
+        Completely read segments are deleted. The offset of the next unread
+        record is saved for the others.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Process
+        for filepath, (offset, complete) in sorted(self._positions.items()):
+            if bool(complete) is True:
+                for path in [filepath, '{}{}'.format(filepath, OFFSET)]:
+                    if os.path.exists(path) is True:
+                        os.remove(path)
+            else:
+                # Write the offset atomically
+                path = '{}{}'.format(filepath, OFFSET)
+                temp = '{}.tmp'.format(path)
+                with open(temp, 'w') as f_handle:
+                    f_handle.write(str(offset))
+                os.replace(temp, path)
+        self._positions = {}
+
+    def segments(self):
+        """Get the sealed segment files in order of creation.
+
+        Args:
+            None
+
+        Returns:
+            result: List of file paths
+
+        """
+        # Return
+        result = [
+            os.path.join(self._directory, _) for _ in sorted(
+                os.listdir(self._directory)) if _.endswith(SEALED)]
+        return result
+
+    def seal(self):
+        """Seal active segments that have not been written to recently.
+
+        Segments still in use by an API process are sealed by the API process
+        itself.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        now = time.time()
+
+        # Process
+        for filename in sorted(os.listdir(self._directory)):
+            if filename.endswith(ACTIVE) is False:
+                continue
+            filepath = os.path.join(self._directory, filename)
+            try:
+                if now - os.path.getmtime(filepath) < self._max_age:
+                    continue
+                f_handle = open(filepath, 'a')
+            except OSError:
+                # The segment may have been sealed by its API process
+                continue
+
+            # Skip segments that are being written to
+            try:
+                fcntl.flock(f_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f_handle.close()
+                continue
+
+            # Seal
+            try:
+                if os.path.exists(filepath) is True:
+                    os.rename(filepath, _sealed(filepath))
+            finally:
+                fcntl.flock(f_handle, fcntl.LOCK_UN)
+                f_handle.close()
+
+
+def encode(data, binary=False):
+    """Create a segment record.
+
+    Args:
+        data: JSON serializable data
+        binary: Encode the data using the binary cache format if True
+
+    Returns:
+        result: Record bytes
+
+    """
+    # Return
+    payload = serialize.encode(data, binary=binary)
+    result = HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+    return result
+
+
+def records(filepath, offset=0):
+    """Read records from a segment file.
+
+    Reading stops at the first incomplete or corrupt record.
+
+    Args:
+        filepath: Segment file path
+        offset: Offset of the first record to read
+
+    Yields:
+        (data, position): Record data and the offset of the next record
+
+    """
+    with open(filepath, 'rb') as f_handle:
+        f_handle.seek(offset)
+        while True:
+            header = f_handle.read(HEADER.size)
+            if len(header) < HEADER.size:
+                break
+            (length, checksum) = HEADER.unpack(header)
+            payload = f_handle.read(length)
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                log_message = ('''\
+Segment {} has a corrupt record at offset {}. Skipping the rest of the \
+segment.'''.format(filepath, offset))
+                log.log2warning(20217, log_message)
+                break
+            offset += HEADER.size + length
+            try:
+                data = serialize.decode(payload)
+            except ValueError:
+                log_message = ('''\
+Segment {} has invalid JSON data at offset {}. It will not be processed\
+'''.format(filepath, offset))
+                log.log2info(20218, log_message)
+                continue
+            yield (data, offset)
+
+
+def _offset(filepath):
+    """Get the saved offset of the next unread record in a segment.
+
+    Args:
+        filepath: Segment file path
+
+    Returns:
+        result: Offset
+
+    """
+    # Initialize key variables
+    result = 0
+    path = '{}{}'.format(filepath, OFFSET)
+
+    # Read the offset
+    if os.path.isfile(path) is True:
+        try:
+            with open(path, 'r') as f_handle:
+                result = int(f_handle.read().strip())
+        except:
+            result = 0
+    return result
+
+
+def _sealed(filepath):
+    """Get the file path of an active segment once sealed.
+
+    Args:
+        filepath: Active segment file path
+
+    Returns:
+        result: Sealed segment file path
+
+    """
+    # Return
+    result = '{}{}'.format(filepath[:-len(ACTIVE)], SEALED)
+    return result
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Serialization of pattoo agent cache data.
+
+The fastest available JSON library is used. orjson is preferred, followed
+by ujson, then the standard library json module. All of them read and
+write standard JSON, so cache files can be exchanged between systems with
+different libraries installed.
+
+Cache data can also be saved in a more compact msgpack based binary format
+if the msgpack library is installed. Binary data starts with a versioned
+header, so the format of each file is detected when it is read. Cache
+files are also named with the extension of their format.
+
+"""
+
+# Standard imports
+import json
+
+# Use a C based JSON library if one is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Header of binary cache data. Magic bytes followed by the format version.
+# JSON data can't start with a null byte.
+MAGIC = b'\x00PTO'
+VERSION = 1
+
+# Filename extensions of JSON and binary cache files
+SUFFIXES = ('.json', '.msgpack')
+
+
+def backend():
+    """Get the name of the JSON library in use.
+
+    Args:
+        None
+
+    Returns:
+        result: Name of the library
+
+    """
+    # Return
+    if orjson is not None:
+        result = 'orjson'
+    elif ujson is not None:
+        result = 'ujson'
+    else:
+        result = 'json'
+    return result
+
+
+def loads(data):
+    """Decode JSON data.
+
+    Args:
+        data: JSON str or UTF-8 encoded bytes
+
+    Returns:
+        result: Decoded data
+
+    """
+    # Decode. Fall back to the json module for data that only it accepts,
+    # such as NaN values.
+    try:
+        if orjson is not None:
+            result = orjson.loads(data)
+        elif ujson is not None:
+            result = ujson.loads(data)
+        else:
+            result = json.loads(data)
+    except ValueError:
+        result = json.loads(data)
+    return result
+
+
+def dumps(data):
+    """Encode data as JSON.
+
+    Args:
+        data: JSON serializable data
+
+    Returns:
+        result: JSON str
+
+    """
+    # Encode. Fall back to the json module for data the faster libraries
+    # can't encode, such as integers larger than 64 bits.
+    try:
+        if orjson is not None:
+            result = orjson.dumps(data).decode()
+        elif ujson is not None:
+            result = ujson.dumps(data)
+        else:
+            result = json.dumps(data)
+    except (TypeError, OverflowError):
+        result = json.dumps(data)
+    return result
+
+
+def binary_supported():
+    """Determine whether the binary cache format can be used.
+
+    Args:
+        None
+
+    Returns:
+        result: True if msgpack is installed
+
+    """
+    # Return
+    result = msgpack is not None
+    return result
+
+
+def encode(data, binary=False):
+    """Encode cache data.
+
+    Args:
+        data: Data to encode
+        binary: Use the binary format if True. JSON is used if msgpack is
+            not installed or can't encode the data.
+
+    Returns:
+        result: Encoded bytes
+
+    """
+    # Encode using the binary format
+    if bool(binary) is True and msgpack is not None:
+        try:
+            result = MAGIC + bytes([VERSION]) + msgpack.packb(
+                data, use_bin_type=True)
+            return result
+        except (TypeError, ValueError, OverflowError):
+            pass
+
+    # Encode using JSON
+    result = dumps(data).encode()
+    return result
+
+
+def suffix(data):
+    """Get the filename extension of encoded cache data.
+
+    Args:
+        data: Encoded bytes
+
+    Returns:
+        result: Filename extension
+
+    """
+    # Return
+    if data.startswith(MAGIC) is True:
+        result = SUFFIXES[1]
+    else:
+        result = SUFFIXES[0]
+    return result
+
+
+def decode(data):
+    """Decode cache data in either format.
+
+    Args:
+        data: Encoded str or bytes
+
+    Returns:
+        result: Decoded data
+
+    """
+    # Decode JSON
+    if isinstance(data, bytes) is False or data.startswith(MAGIC) is False:
+        result = loads(data)
+        return result
+
+    # Decode the binary format
+    version = data[len(MAGIC):len(MAGIC) + 1]
+    if version != bytes([VERSION]):
+        raise ValueError(
+            'Unsupported binary cache format version {}'.format(version))
+    if msgpack is None:
+        raise ValueError(
+            'The msgpack library is required to read binary cache data')
+    result = msgpack.unpackb(data[len(MAGIC) + 1:], raw=False)
+    return result
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Script to compare the Data table insertion methods.
+
+Run this against the unittest database only. It creates new DataPoint
+entries and inserts time series data for them using both the executemany
+based data.insert_rows() function and the LOAD DATA LOCAL INFILE based
+data.load_rows() function.
+
+The "local_infile" option must be enabled on the database server and the
+"bulk_load_threshold" configuration parameter must be non-zero for
+data.load_rows() to use LOAD DATA LOCAL INFILE.
+
+"""
+
+from __future__ import print_function
+from random import random
+import os
+import sys
+import time
+import argparse
+
+# Try to create a working PYTHONPATH
+DEV_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(DEV_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}bin'.format(os.sep)
+if DEV_DIR.endswith(_EXPECTED) is True:
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# pattoo libraries
+from pattoo_shared import data as lib_data
+from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
+from pattoo.constants import IDXTimestampValue
+from pattoo.db.table import data, datapoint
+
+
+def main():
+    """Compare the Data table insertion methods.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Set up parser
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--datapoints', '-d', help='Number of DataPoints to create',
+        type=int, default=100)
+    parser.add_argument(
+        '--values', '-v', help='Number of values per DataPoint',
+        type=int, default=1000)
+    args = parser.parse_args()
+
+    # Run the benchmarks
+    print('Inserting {} rows per method'.format(args.datapoints * args.values))
+    for name, method in [
+            ('executemany', data.insert_rows),
+            ('LOAD DATA LOCAL INFILE', data.load_rows)]:
+        items = _items(args.datapoints, args.values)
+        start = time.time()
+        rows = method(items)
+        duration = time.time() - start
+        print('{0:<25}: {1:10.2f} rows / second'.format(
+            name, rows / duration))
+
+
+def _items(datapoints, values):
+    """Create IDXTimestampValue objects for new DataPoints.
+
+    Args:
+        datapoints: Number of DataPoints to create
+        values: Number of values per DataPoint
+
+    Returns:
+        result: List of IDXTimestampValue objects
+
+    """
+    # Initialize key variables
+    result = []
+    polling_interval = 10000
+    agent_id = lib_data.hashstring(str(random()))
+    timestamp = int(time.time() * 1000) - (values * polling_interval)
+
+    # Create the DataPoints
+    records = [
+        PattooDBrecord(
+            pattoo_checksum=lib_data.hashstring(str(random())),
+            pattoo_metadata=[],
+            pattoo_data_type=DATA_FLOAT,
+            pattoo_key='benchmark',
+            pattoo_value=0,
+            pattoo_timestamp=timestamp,
+            pattoo_agent_polled_target='benchmark',
+            pattoo_agent_program='benchmark',
+            pattoo_agent_hostname='benchmark',
+            pattoo_agent_id=agent_id,
+            pattoo_agent_polling_interval=polling_interval)
+        for _ in range(0, datapoints)]
+    idx_datapoints = datapoint.idx_datapoints(records)
+
+    # Create the values
+    for idx_datapoint in idx_datapoints.values():
+        for count in range(0, values):
+            result.append(IDXTimestampValue(
+                idx_datapoint=idx_datapoint,
+                polling_interval=polling_interval,
+                timestamp=timestamp + (count * polling_interval),
+                value=random()))
+    return result
+
+
+if __name__ == '__main__':
+    main()
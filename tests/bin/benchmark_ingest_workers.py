@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Script to measure the ingest rate of the worker processes.
+
+Run this against the unittest database only. It creates new agents, each
+with its own DataPoints, and processes their data in a WorkerPool with and
+without the random 100 - 200ms delay that ingest worker tasks previously
+used to work around SQLAlchemy hangs on subprocess startup.
+
+"""
+
+from __future__ import print_function
+from random import random
+import os
+import sys
+import time
+import argparse
+
+# Try to create a working PYTHONPATH
+DEV_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(DEV_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}bin'.format(os.sep)
+if DEV_DIR.endswith(_EXPECTED) is True:
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# pattoo libraries
+from pattoo_shared import data as lib_data
+from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
+from pattoo.ingest import records
+from pattoo.ingest.pool import WorkerPool
+
+
+def main():
+    """Measure the ingest rate of the worker processes.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Set up parser
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--agents', '-a', help='Number of agents to create',
+        type=int, default=500)
+    parser.add_argument(
+        '--datapoints', '-d', help='Number of DataPoints per agent',
+        type=int, default=10)
+    parser.add_argument(
+        '--processes', '-p', help='Number of worker processes',
+        type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    # Run the benchmarks using the same worker processes
+    pool = WorkerPool(processes=args.processes)
+    pool.start()
+    print('Processing {} agents with {} worker processes'.format(
+        args.agents, args.processes))
+    for name, func in [
+            ('Random delay', _delayed),
+            ('No delay', records._process_data_exception)]:
+        arguments = [
+            (_records(args.datapoints), ) for _ in range(0, args.agents)]
+        start = time.time()
+        pool.starmap(func, arguments)
+        duration = time.time() - start
+        print('{0:<15}: {1:8.2f} seconds, {2:10.2f} agents / second'.format(
+            name, duration, args.agents / duration))
+    pool.stop()
+
+
+def _delayed(pattoo_db_records):
+    """Process agent data after the previously used random delay.
+
+    Args:
+        pattoo_db_records: List of PattooDBrecord objects for an agent
+
+    Returns:
+        result: Result of records._process_data_exception
+
+    """
+    # Process
+    time.sleep((random() / 10) + 0.1)
+    result = records._process_data_exception(pattoo_db_records)
+    return result
+
+
+def _records(datapoints):
+    """Create PattooDBrecord objects for a new agent.
+
+    Args:
+        datapoints: Number of DataPoints to create
+
+    Returns:
+        result: List of PattooDBrecord objects
+
+    """
+    # Initialize key variables
+    agent_id = lib_data.hashstring(str(random()))
+    timestamp = int(time.time() * 1000)
+
+    # Create the records
+    result = [
+        PattooDBrecord(
+            pattoo_checksum=lib_data.hashstring(str(random())),
+            pattoo_metadata=[],
+            pattoo_data_type=DATA_FLOAT,
+            pattoo_key='benchmark',
+            pattoo_value=random(),
+            pattoo_timestamp=timestamp,
+            pattoo_agent_polled_target='benchmark',
+            pattoo_agent_program='benchmark',
+            pattoo_agent_hostname='benchmark',
+            pattoo_agent_id=agent_id,
+            pattoo_agent_polling_interval=10000)
+        for _ in range(0, datapoints)]
+    return result
+
+
+if __name__ == '__main__':
+    main()
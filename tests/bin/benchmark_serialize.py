@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Script to measure the speed of cache formats on agent cache data.
+
+Agent cache data is created the same way agents create it, then encoded and
+decoded by each JSON library that is installed, and by the msgpack based
+binary cache format if msgpack is installed.
+
+"""
+
+from __future__ import print_function
+from random import random, uniform
+import os
+import sys
+import time
+import json
+import argparse
+
+# Try to create a working PYTHONPATH
+DEV_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(DEV_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}bin'.format(os.sep)
+if DEV_DIR.endswith(_EXPECTED) is True:
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# pattoo libraries
+from pattoo_shared import converter
+from pattoo_shared import data as lib_data
+from pattoo_shared.variables import (
+    DataPoint, TargetDataPoints, AgentPolledData)
+from pattoo_shared.constants import DATA_FLOAT
+from pattoo import serialize
+
+
+def main():
+    """Measure the speed of JSON libraries on agent cache data.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Set up parser
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--files', '-f', help='Number of cache files to create',
+        type=int, default=1000)
+    parser.add_argument(
+        '--datapoints', '-d', help='Number of DataPoints per cache file',
+        type=int, default=50)
+    args = parser.parse_args()
+
+    # Create the cache data
+    payloads = [_payload(args.datapoints) for _ in range(0, args.files)]
+    print('Processing {} cache files'.format(args.files))
+
+    # Run the benchmarks
+    for name, (dumps, loads) in sorted(_libraries().items()):
+        start = time.time()
+        encoded = [dumps(_) for _ in payloads]
+        encode = time.time() - start
+        start = time.time()
+        for item in encoded:
+            loads(item)
+        decode = time.time() - start
+        size = sum([len(_) for _ in encoded]) / len(encoded)
+        print('''\
+{0:<10}: encode {1:10.2f} files / second, decode {2:10.2f} files / second, \
+{3:8.0f} bytes / file\
+'''.format(name, args.files / encode, args.files / decode, size))
+    print('Library used by pattoo: {}'.format(serialize.backend()))
+
+
+def _libraries():
+    """Get the encode and decode functions of the installed libraries.
+
+    Args:
+        None
+
+    Returns:
+        result: Dict of (dumps, loads) tuples keyed by library name
+
+    """
+    # Initialize key variables
+    result = {'json': (json.dumps, json.loads)}
+
+    # Add the optional libraries
+    if serialize.orjson is not None:
+        result['orjson'] = (
+            serialize.orjson.dumps, serialize.orjson.loads)
+    if serialize.ujson is not None:
+        result['ujson'] = (serialize.ujson.dumps, serialize.ujson.loads)
+    if serialize.binary_supported() is True:
+        result['msgpack'] = (
+            lambda _: serialize.encode(_, binary=True), serialize.decode)
+    return result
+
+
+def _payload(datapoints):
+    """Create the cache data of an agent posting.
+
+    Args:
+        datapoints: Number of DataPoints to create
+
+    Returns:
+        result: Cache data dict
+
+    """
+    # Setup AgentPolledData
+    apd = AgentPolledData(lib_data.hashstring(str(random())), 10)
+    ddv = TargetDataPoints('benchmark.example.org')
+
+    # Add DataPoints with metadata
+    for index in range(0, datapoints):
+        variable = DataPoint(
+            'benchmark_{}'.format(index), round(uniform(1, 100), 5),
+            data_type=DATA_FLOAT)
+        variable.add({'interface': 'eth{}'.format(index)})
+        ddv.add(variable)
+    apd.add(ddv)
+
+    # Return
+    result = converter.posting_data_points(converter.agentdata_to_post(apd))
+    return result
+
+
+if __name__ == '__main__':
+    main()
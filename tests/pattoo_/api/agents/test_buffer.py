@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Test pattoo agent API write buffer."""
+
+import os
+import unittest
+import sys
+import time
+import tempfile
+import shutil
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+            os.path.abspath(os.path.join(
+                EXEC_DIR,
+                os.pardir)), os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}api{0}agents'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo.configuration import ConfigAgentAPId
+from pattoo.segment import SegmentWriter, SegmentReader
+from pattoo.api.agents import buffer as lib_buffer
+from tests.libraries.configuration import UnittestConfig
+
+
+class TestBuffer(unittest.TestCase):
+    """Checks all Buffer methods."""
+
+    def setUp(self):
+        """Create a segment directory."""
+        self.directory = tempfile.mkdtemp()
+        self.writer = SegmentWriter(self.directory)
+
+    def tearDown(self):
+        """Delete the segment directory."""
+        shutil.rmtree(self.directory)
+
+    def _read(self):
+        """Read the records written to the segment directory."""
+        self.writer.close()
+        reader = SegmentReader(self.directory)
+        result = [data for _, data in reader.read()]
+        return result
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_put(self):
+        """Testing method / function put."""
+        # Postings are written in the background
+        buffer = lib_buffer.Buffer(self.writer, flush_age=0.1)
+        for value in range(0, 3):
+            self.assertTrue(buffer.put({'value': value}))
+        time.sleep(1)
+        self.assertEqual(
+            self._read(), [{'value': _} for _ in range(0, 3)])
+        buffer.close()
+
+    def test_flush(self):
+        """Testing method / function flush."""
+        # Fill the buffer without writing in the background
+        buffer = lib_buffer.Buffer(self.writer, max_items=2)
+        buffer._start = lambda: None
+        self.assertTrue(buffer.put({'value': 0}))
+        self.assertTrue(buffer.put({'value': 1}))
+
+        # Full buffers reject postings
+        self.assertFalse(buffer.put({'value': 2}))
+
+        # Test
+        self.assertEqual(buffer.flush(), 2)
+        self.assertTrue(buffer.put({'value': 2}))
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(
+            self._read(), [{'value': _} for _ in range(0, 3)])
+
+    def test_close(self):
+        """Testing method / function close."""
+        # Queued postings are written
+        buffer = lib_buffer.Buffer(self.writer, flush_age=3600)
+        buffer.put({'value': 0})
+        buffer.close()
+        self.assertEqual(self._read(), [{'value': 0}])
+
+        # Closing again does nothing
+        buffer.close()
+
+    def test__start(self):
+        """Testing method / function _start."""
+        # Tested by test_put
+        pass
+
+    def test__run(self):
+        """Testing method / function _run."""
+        # Tested by test_put
+        pass
+
+    def test__write(self):
+        """Testing method / function _write."""
+        # Initialize key variables
+        saved = []
+        items = [{'value': _} for _ in range(0, 3)]
+
+        # Postings are saved one at a time if the writer fails
+        buffer = lib_buffer.Buffer(
+            _FailingWriter(), fallback=lambda data: saved.append(data) or True)
+        buffer._write(items)
+        self.assertEqual(saved, items)
+
+        # Fallback failures don't stop the remaining postings being saved
+        saved = []
+        buffer = lib_buffer.Buffer(
+            _FailingWriter(), fallback=lambda data: saved.append(data) or (
+                data['value'] != 1))
+        buffer._write(items)
+        self.assertEqual(saved, items)
+
+        # Postings are written by the writer otherwise
+        saved = []
+        buffer = lib_buffer.Buffer(
+            self.writer, fallback=lambda data: saved.append(data) or True)
+        buffer._write(items)
+        self.assertEqual(saved, [])
+        self.assertEqual(self._read(), items)
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_buffer(self):
+        """Testing method / function buffer."""
+        # Initialize key variables
+        directory = tempfile.mkdtemp()
+        config = ConfigAgentAPId()
+
+        # Test
+        result = lib_buffer.buffer(SegmentWriter(directory), config)
+        self.assertTrue(isinstance(result, lib_buffer.Buffer))
+        result.close()
+        shutil.rmtree(directory)
+
+
+class _FailingWriter():
+    """SegmentWriter that fails to write."""
+
+    def extend(self, items):
+        """Fail.
+
+        Args:
+            items: List of JSON serializable data
+
+        Returns:
+            None
+
+        """
+        raise OSError('Disk full')
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
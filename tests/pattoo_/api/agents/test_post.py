@@ -4,6 +4,7 @@
 import os
 import unittest
 import sys
+from unittest.mock import patch
 
 
 # PIP3 imports
@@ -36,7 +37,10 @@ from pattoo_shared.configuration import Config, ServerConfig
 from pattoo_shared.variables import (
     DataPoint, TargetDataPoints, AgentPolledData)
 from pattoo.api.agents import PATTOO_API_AGENT as APP
+from pattoo.api.agents import post as lib_post
+from pattoo.configuration import ConfigAgentAPId
 from pattoo.constants import PATTOO_API_AGENT_NAME
+from pattoo.db.table import datapoint
 from tests.libraries.configuration import UnittestConfig
 
 
@@ -93,6 +97,10 @@ class TestBasicFunctions(LiveServerTestCase):
         self.assertEqual(len(cache_data[0]), 2)
         result = cache_data[0][1]
 
+        # No temporary files should remain
+        self.assertFalse(bool([
+            _ for _ in os.listdir(cache_directory) if _.endswith('.tmp')]))
+
         # Result and expected are not quite the same. 'expected' will have
         # lists of tuples where 'result' will have lists of lists
         for key, value in result.items():
@@ -117,6 +125,28 @@ class TestBasicFunctions(LiveServerTestCase):
                 filepath = '{}{}{}'.format(cache_directory, os.sep, filename)
                 os.remove(filepath)
 
+    def test__save_data(self):
+        """Testing method / function _save_data."""
+        # Initialize key variables
+        posting = converter.posting_data_points(
+            converter.agentdata_to_post(_create_apd()))
+        pdbr = converter.cache_to_keypairs(posting)[0]
+        self.assertFalse(datapoint.checksum_exists(pdbr.pattoo_checksum))
+
+        # Add the posting directly to the database
+        with patch.object(
+                ConfigAgentAPId, 'direct_ingest', return_value=True):
+            self.assertTrue(lib_post._save_data(posting, 'test__save_data'))
+        lib_post._DIRECT.close()
+
+        # Test (Single data entry should exist)
+        idx_datapoint = datapoint.checksum_exists(pdbr.pattoo_checksum)
+        self.assertTrue(bool(idx_datapoint))
+        obj = datapoint.DataPoint(idx_datapoint)
+        result = obj.data(pdbr.pattoo_timestamp, pdbr.pattoo_timestamp)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]['value'], pdbr.pattoo_value)
+
 
 def _create_apd():
     """Testing method / function records."""
@@ -86,6 +86,50 @@ class TestBasicFunctions(unittest.TestCase):
         result = agent.idx_exists(idx_agent)
         self.assertTrue(result)
 
+    def test_idx_agents(self):
+        """Testing method / function idx_agents."""
+        # Initialize key variables
+        items = []
+        for _ in range(0, 3):
+            agent_id = data.hashstring(str(random()))
+            agent_target = data.hashstring(str(random()))
+            agent_program = data.hashstring(str(random()))
+            items.append((agent_id, agent_target, agent_program))
+
+        # Create one of the entries beforehand
+        agent.insert_row(*items[0])
+
+        # Test creation
+        result = agent.idx_agents(items + items)
+        self.assertEqual(len(result), len(items))
+        for agent_id, agent_target, _ in items:
+            self.assertEqual(
+                result[(agent_id, agent_target)],
+                agent.exists(agent_id, agent_target))
+
+        # Test after creation
+        self.assertEqual(agent.idx_agents(items), result)
+
+    def test_exists_lookup(self):
+        """Testing method / function exists_lookup."""
+        # Initialize key variables
+        agent_id = data.hashstring(str(random()))
+        agent_target = data.hashstring(str(random()))
+        agent_program = data.hashstring(str(random()))
+
+        # Make sure it does not exist
+        result = agent.exists_lookup([(agent_id, agent_target)])
+        self.assertEqual(result, {})
+
+        # Add database row
+        agent.insert_row(agent_id, agent_target, agent_program)
+
+        # Make sure it exists
+        result = agent.exists_lookup([(agent_id, agent_target)])
+        self.assertEqual(
+            result,
+            {(agent_id, agent_target): agent.exists(agent_id, agent_target)})
+
     def test_assign(self):
         """Testing method / function assign."""
         # Add an entry to the database
@@ -81,6 +81,38 @@ class TestBasicFunctions(unittest.TestCase):
         result = chart.idx_exists(idx_chart)
         self.assertTrue(result)
 
+    def test_exists_lookup(self):
+        """Testing method or function named exists_lookup."""
+        # Create a translation
+        chart_name = data.hashstring(str(random()))
+        chart_checksum = data.hashstring(str(random()))
+
+        # Make sure it does not exist
+        result = chart.exists_lookup([chart_checksum])
+        self.assertEqual(result, {})
+
+        # Add database row
+        chart.insert_row(
+            DbRowChart(name=chart_name, checksum=chart_checksum, enabled=0))
+
+        # Make sure it exists
+        result = chart.exists_lookup([chart_checksum])
+        self.assertEqual(
+            result, {chart_checksum: chart.exists(chart_checksum)})
+
+    def test_insert_rows(self):
+        """Testing method or function named insert_rows."""
+        # Add entries to the database
+        checksums = [data.hashstring(str(random())) for _ in range(0, 3)]
+        chart.insert_rows(
+            [DbRowChart(name='', checksum=_, enabled=1) for _ in checksums])
+
+        # Verify the indexes exist
+        for checksum in checksums:
+            idx_chart = chart.exists(checksum)
+            result = chart.idx_exists(idx_chart)
+            self.assertTrue(result)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
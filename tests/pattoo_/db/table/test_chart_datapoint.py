@@ -155,6 +155,31 @@ class TestBasicFunctions(unittest.TestCase):
         result = chart_datapoint.idx_exists(idx_chart_datapoint)
         self.assertTrue(result)
 
+    def test_insert_rows(self):
+        """Testing method or function named "insert_rows"."""
+        # Add chart entry to database
+        chart_checksum = data.hashstring(str(random()))
+        chart.insert_row(
+            DbRowChart(name='', checksum=chart_checksum, enabled=0))
+        idx_chart = chart.exists(chart_checksum)
+
+        # Create idx datapoints
+        idx_datapoints = [_idx_datapoint() for _ in range(0, 3)]
+
+        # Add chart datapoint entries to database. Duplicates are ignored.
+        rows = [
+            DbRowChartDataPoint(
+                idx_datapoint=idx_datapoint, idx_chart=idx_chart, enabled=1)
+            for idx_datapoint in idx_datapoints]
+        chart_datapoint.insert_rows(rows + rows)
+
+        # Make sure the chart datapoints exist
+        for idx_datapoint in idx_datapoints:
+            idx_chart_datapoint = chart_datapoint.exists(
+                idx_chart, idx_datapoint)
+            result = chart_datapoint.idx_exists(idx_chart_datapoint)
+            self.assertTrue(result)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
@@ -77,7 +77,12 @@ class TestBasicFunctions(unittest.TestCase):
             polling_interval=polling_interval,
             timestamp=timestamp,
             value=pattoo_value)]
-        data.insert_rows(_data)
+        result = data.insert_rows(_data)
+        self.assertEqual(result, 1)
+
+        # Replays must not fail
+        result = data.insert_rows(_data, chunk_size=1)
+        self.assertEqual(result, 1)
 
         # Verify that the data is there
         with db.db_query(20015) as session:
@@ -88,6 +93,100 @@ class TestBasicFunctions(unittest.TestCase):
         for row in rows:
             self.assertEqual(row.value, pattoo_value)
 
+        # Verify that the DataPoint was updated
+        _dp = datapoint.DataPoint(idx_datapoint)
+        self.assertEqual(_dp.last_timestamp(), timestamp)
+        self.assertEqual(_dp.polling_interval(), polling_interval)
+
+    def test_insert_rows_multiple(self):
+        """Testing method / function insert_rows with many datapoints."""
+        # Initialize key variables
+        agent_id = lib_data.hashstring(str(random()))
+        timestamp = int(time.time() * 1000)
+        expected = {}
+        _data = []
+
+        # Create DataPoint entries with different polling intervals
+        for polling_interval in range(10, 15):
+            insert = PattooDBrecord(
+                pattoo_checksum=lib_data.hashstring(str(random())),
+                pattoo_key=lib_data.hashstring(str(random())),
+                pattoo_agent_id=agent_id,
+                pattoo_agent_polling_interval=polling_interval,
+                pattoo_timestamp=timestamp,
+                pattoo_data_type=DATA_FLOAT,
+                pattoo_value=polling_interval,
+                pattoo_agent_polled_target='pattoo_agent_polled_target',
+                pattoo_agent_program='pattoo_agent_program',
+                pattoo_agent_hostname='pattoo_agent_hostname',
+                pattoo_metadata=[]
+            )
+            idx_datapoint = datapoint.idx_datapoint(insert)
+            expected[idx_datapoint] = (
+                timestamp + polling_interval, polling_interval)
+
+            # Add two values per DataPoint
+            for offset in [0, polling_interval]:
+                _data.append(IDXTimestampValue(
+                    idx_datapoint=idx_datapoint,
+                    polling_interval=polling_interval,
+                    timestamp=timestamp + offset,
+                    value=polling_interval))
+        result = data.insert_rows(_data, chunk_size=3)
+        self.assertEqual(result, len(_data))
+
+        # Verify that each DataPoint has its own most recent timestamp
+        for idx_datapoint, (last_timestamp, polling_interval) in sorted(
+                expected.items()):
+            _dp = datapoint.DataPoint(idx_datapoint)
+            self.assertEqual(_dp.last_timestamp(), last_timestamp)
+            self.assertEqual(_dp.polling_interval(), polling_interval)
+
+    def test_load_rows(self):
+        """Testing method / function load_rows."""
+        # Initialize key variables
+        polling_interval = 10
+        pattoo_value = 27.5
+        timestamp = int(time.time() * 1000)
+        insert = PattooDBrecord(
+            pattoo_checksum=lib_data.hashstring(str(random())),
+            pattoo_key=lib_data.hashstring(str(random())),
+            pattoo_agent_id=lib_data.hashstring(str(random())),
+            pattoo_agent_polling_interval=polling_interval,
+            pattoo_timestamp=timestamp,
+            pattoo_data_type=DATA_FLOAT,
+            pattoo_value=pattoo_value,
+            pattoo_agent_polled_target='pattoo_agent_polled_target',
+            pattoo_agent_program='pattoo_agent_program',
+            pattoo_agent_hostname='pattoo_agent_hostname',
+            pattoo_metadata=[]
+        )
+
+        # Create checksum entry in the DB, then update the data table.
+        # Regular inserts are used if bulk loading isn't possible.
+        idx_datapoint = datapoint.idx_datapoint(insert)
+        _data = [IDXTimestampValue(
+            idx_datapoint=idx_datapoint,
+            polling_interval=polling_interval,
+            timestamp=timestamp,
+            value=pattoo_value)]
+        result = data.load_rows(_data)
+        self.assertEqual(result, 1)
+
+        # Verify that the data is there
+        with db.db_query(20015) as session:
+            rows = session.query(
+                Data.value).filter(and_(
+                    Data.idx_datapoint == idx_datapoint,
+                    Data.timestamp == timestamp))
+        self.assertEqual(rows.count(), 1)
+        for row in rows:
+            self.assertEqual(float(row.value), pattoo_value)
+
+        # Verify that the DataPoint was updated
+        _dp = datapoint.DataPoint(idx_datapoint)
+        self.assertEqual(_dp.last_timestamp(), timestamp)
+
 
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
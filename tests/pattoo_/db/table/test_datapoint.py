@@ -7,6 +7,9 @@ import sys
 from random import random
 import time
 
+# PIP3 imports
+import numpy as np
+
 # Try to create a working PYTHONPATH
 EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
 ROOT_DIR = os.path.abspath(os.path.join(
@@ -26,11 +29,12 @@ else:
     sys.exit(2)
 
 from pattoo_shared import data, times
-from pattoo_shared.constants import DATA_FLOAT, PattooDBrecord
+from pattoo_shared.constants import DATA_FLOAT, DATA_COUNT, PattooDBrecord
 from pattoo.db.table import datapoint, agent
 from pattoo.db.table import data as lib_data
 from pattoo.db.table.datapoint import DataPoint
 from pattoo.db.models import DataPoint as _DataPoint
+from pattoo.db.models import ChartDataPoint
 from pattoo.db import db
 from pattoo.constants import IDXTimestampValue
 
@@ -74,6 +78,75 @@ class TestBasicFunctions(unittest.TestCase):
         expected = datapoint.checksum_exists(checksum)
         self.assertEqual(result, expected)
 
+    def test_idx_datapoints(self):
+        """Testing method / function idx_datapoints."""
+        # Initialize key variables
+        checksums = []
+        pattoo_db_records = []
+        agent_id = data.hashstring(str(random()))
+        for pattoo_value in range(0, 5):
+            checksum = data.hashstring(str(random()))
+            checksums.append(checksum)
+            pattoo_db_records.append(PattooDBrecord(
+                pattoo_checksum=checksum,
+                pattoo_metadata=[('key', 'value')],
+                pattoo_data_type=32,
+                pattoo_key='polar_bear',
+                pattoo_value=pattoo_value,
+                pattoo_timestamp=1575789070108,
+                pattoo_agent_polled_target='panda_bear',
+                pattoo_agent_program='koala_bear',
+                pattoo_agent_hostname='grizzly_bear',
+                pattoo_agent_id=agent_id,
+                pattoo_agent_polling_interval=10000))
+
+        # Create one of the entries beforehand
+        expected = {}
+        expected[checksums[0]] = datapoint.idx_datapoint(pattoo_db_records[0])
+
+        # Test creation
+        result = datapoint.idx_datapoints(
+            pattoo_db_records + pattoo_db_records)
+        for checksum in checksums:
+            expected[checksum] = datapoint.checksum_exists(checksum)
+        self.assertEqual(result, expected)
+
+        # Every new DataPoint must have an agent and a chart
+        for checksum in checksums:
+            _dp = DataPoint(expected[checksum])
+            self.assertTrue(agent.idx_exists(_dp.idx_agent()))
+        with db.db_query(20199) as session:
+            rows = session.query(ChartDataPoint.idx_datapoint).filter(
+                ChartDataPoint.idx_datapoint.in_(list(expected.values())))
+            self.assertEqual(rows.count(), len(expected))
+
+        # Test after creation
+        result = datapoint.idx_datapoints(pattoo_db_records)
+        self.assertEqual(result, expected)
+
+    def test_checksums_exist(self):
+        """Testing method / function checksums_exist."""
+        # Initialize key variables
+        polling_interval = 1
+        checksums = [data.hashstring(str(random())) for _ in range(0, 3)]
+        self.assertEqual(datapoint.checksums_exist(checksums), {})
+
+        # Create a new Agent entry
+        agent_id = data.hashstring(str(random()))
+        agent_target = data.hashstring(str(random()))
+        agent_program = data.hashstring(str(random()))
+        agent.insert_row(agent_id, agent_target, agent_program)
+        idx_agent = agent.exists(agent_id, agent_target)
+
+        # Create entries and check
+        datapoint.insert_rows(
+            [(_, DATA_FLOAT, polling_interval, idx_agent) for _ in checksums])
+        result = datapoint.checksums_exist(checksums)
+        self.assertEqual(len(result), len(checksums))
+        for checksum in checksums:
+            self.assertEqual(
+                result[checksum], datapoint.checksum_exists(checksum))
+
     def test_checksum_exists(self):
         """Testing method / function checksum_exists."""
         # Initialize key variables
@@ -121,34 +194,63 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertTrue(bool(result))
         self.assertTrue(isinstance(result, int))
 
+    def test_insert_rows(self):
+        """Testing method / function insert_rows."""
+        # Initialize key variables
+        polling_interval = 1
+
+        # Create a new Agent entry
+        agent_id = data.hashstring(str(random()))
+        agent_target = data.hashstring(str(random()))
+        agent_program = data.hashstring(str(random()))
+        agent.insert_row(agent_id, agent_target, agent_program)
+        idx_agent = agent.exists(agent_id, agent_target)
+
+        # Create entries and check. Duplicates are ignored.
+        checksums = [data.hashstring(str(random())) for _ in range(0, 3)]
+        items = [
+            (_, DATA_FLOAT, polling_interval, idx_agent) for _ in checksums]
+        datapoint.insert_rows(items + items)
+        for checksum in checksums:
+            result = datapoint.checksum_exists(checksum)
+            self.assertTrue(bool(result))
+            self.assertTrue(isinstance(result, int))
+
     def test__counters(self):
         """Testing method / function _counters."""
-        # Create a counter-like dict
+        # Create counter-like arrays
         increment = 2
-        inputs = {}
-        for item in range(0, 20, increment):
-            inputs[item] = item
+        timestamps = np.arange(0, 20, increment)
+        values = timestamps.astype(np.float64)
 
-        result = datapoint._counters(inputs, 1, 1)
-        self.assertEqual(len(inputs) - 1, len(result))
-        for item in result:
-            self.assertTrue(item['timestamp'] in inputs)
+        result = datapoint._counters(timestamps, values, 1, 1)
+        self.assertEqual(len(timestamps) - 1, len(result))
+        for index, item in enumerate(result):
+            self.assertEqual(item['timestamp'], timestamps[index + 1])
             self.assertEqual(item['value'], increment * 1000)
 
+        # Absent values mean no change
+        values[3] = np.nan
+        result = datapoint._counters(timestamps, values, 1, 1)
+        self.assertIsNone(result[2]['value'])
+        self.assertIsNone(result[3]['value'])
+        self.assertEqual(result[4]['value'], increment * 1000)
+
     def test__response(self):
         """Testing method / function _response."""
         # Initialize variables
-        inputs = {
-            1: 1 * 3,
-            2: 2 * 3,
-            3: 3 * 3,
-            4: 4 * 3
-        }
-        result = datapoint._response(inputs)
-        self.assertEqual(len(inputs), len(result))
+        timestamps = np.array([1, 2, 3, 4])
+        values = np.array([1 * 3, 2 * 3, np.nan, 4 * 3])
+        expected = [
+            {'timestamp': 1, 'value': 3},
+            {'timestamp': 2, 'value': 6},
+            {'timestamp': 3, 'value': None},
+            {'timestamp': 4, 'value': 12}
+        ]
+        result = datapoint._response(timestamps, values)
+        self.assertEqual(result, expected)
         for item in result:
-            timestamp = item['timestamp']
-            self.assertEqual(item['value'], inputs[timestamp])
+            self.assertTrue(isinstance(item['timestamp'], int))
 
 
 class TestDataPoint(unittest.TestCase):
@@ -292,6 +394,90 @@ class TestDataPoint(unittest.TestCase):
         result = obj.data(ts_start, ts_stop)
         self.assertEqual(result, expected)
 
+        # Values must be python types for JSON serialization
+        for item in result:
+            self.assertTrue(isinstance(item['timestamp'], int))
+            self.assertTrue(isinstance(item['value'], float))
+
+    def test_data_gaps(self):
+        """Testing method / function data with missing values."""
+        # Initialize key variables
+        polling_interval = 300 * 1000
+        (idx_datapoint, timestamps) = _insert_data(
+            DATA_FLOAT, polling_interval, [(0, 10), (1, 20), (3, 40), (4, 50)])
+        expected = [
+            {'timestamp': timestamps[0], 'value': 10},
+            {'timestamp': timestamps[0] + polling_interval, 'value': 20},
+            {'timestamp': timestamps[0] + polling_interval * 2,
+             'value': None},
+            {'timestamp': timestamps[0] + polling_interval * 3, 'value': 40},
+            {'timestamp': timestamps[0] + polling_interval * 4, 'value': 50}
+        ]
+
+        # Test
+        obj = DataPoint(idx_datapoint)
+        result = obj.data(timestamps[0], timestamps[-1])
+        self.assertEqual(result, expected)
+
+    def test_data_range(self):
+        """Testing method / function data with rows outside the range."""
+        # Initialize key variables
+        polling_interval = 300 * 1000
+        (idx_datapoint, timestamps) = _insert_data(
+            DATA_FLOAT, polling_interval,
+            [(_, _ * 10) for _ in range(0, 10)])
+
+        # Only rows within the range are returned
+        obj = DataPoint(idx_datapoint)
+        result = obj.data(timestamps[3], timestamps[6])
+        self.assertEqual(
+            result,
+            [{'timestamp': timestamps[_], 'value': _ * 10}
+             for _ in range(3, 7)])
+
+        # Values are absent when the range has no rows
+        result = obj.data(
+            timestamps[-1] + polling_interval,
+            timestamps[-1] + polling_interval * 3)
+        self.assertEqual(
+            [_['value'] for _ in result], [None, None, None])
+
+        # Nothing is returned when the range is reversed
+        result = obj.data(timestamps[6], timestamps[3])
+        self.assertEqual(result, [])
+
+    def test_data_counter(self):
+        """Testing method / function data with counter values."""
+        # Initialize key variables
+        polling_interval = 300 * 1000
+
+        # The counter wraps around to zero after the third value
+        (idx_datapoint, timestamps) = _insert_data(
+            DATA_COUNT, polling_interval,
+            [(0, 1000), (1, 4000), (2, 7000), (3, 1000), (5, 7000)])
+        expected = [
+            {'timestamp': timestamps[1],
+             'value': 3000 / polling_interval * 1000},
+            {'timestamp': timestamps[2],
+             'value': 3000 / polling_interval * 1000},
+            {'timestamp': timestamps[3],
+             'value': 6000 / polling_interval * 1000},
+            {'timestamp': timestamps[3] + polling_interval, 'value': None},
+            {'timestamp': timestamps[4], 'value': None}
+        ]
+
+        # Test
+        obj = DataPoint(idx_datapoint)
+        result = obj.data(timestamps[0], timestamps[-1])
+        self.assertEqual(len(result), len(expected))
+        for index, item in enumerate(result):
+            self.assertEqual(item['timestamp'], expected[index]['timestamp'])
+            if expected[index]['value'] is None:
+                self.assertIsNone(item['value'])
+            else:
+                self.assertAlmostEqual(
+                    item['value'], expected[index]['value'])
+
 
 def _idx_datapoint():
     """Create a new DataPoint db entry.
@@ -322,6 +508,57 @@ def _idx_datapoint():
     return result
 
 
+def _insert_data(data_type, polling_interval, values):
+    """Create a new DataPoint db entry with data.
+
+    Args:
+        data_type: Type of data
+        polling_interval: Polling interval
+        values: List of (number of polling intervals after the start, value)
+            tuples
+
+    Returns:
+        result: Tuple of (idx_datapoint, list of data timestamps)
+
+    """
+    # Initialize key variables
+    _data = []
+    timestamps = []
+    checksum = data.hashstring(str(random()))
+    start = times.normalized_timestamp(
+        polling_interval, int(time.time() * 1000))
+
+    # Create checksum entry in the DB
+    idx_datapoint = datapoint.idx_datapoint(PattooDBrecord(
+        pattoo_checksum=checksum,
+        pattoo_key=data.hashstring(str(random())),
+        pattoo_agent_id=data.hashstring(str(random())),
+        pattoo_agent_polling_interval=polling_interval,
+        pattoo_timestamp=start,
+        pattoo_data_type=data_type,
+        pattoo_value=0,
+        pattoo_agent_polled_target='pattoo_agent_polled_target',
+        pattoo_agent_program='pattoo_agent_program',
+        pattoo_agent_hostname='pattoo_agent_hostname',
+        pattoo_metadata=[]
+    ))
+
+    # Insert rows of new data
+    for count, value in values:
+        timestamp = start + (polling_interval * count)
+        timestamps.append(timestamp)
+        _data.append(IDXTimestampValue(
+            idx_datapoint=idx_datapoint,
+            polling_interval=polling_interval,
+            timestamp=timestamp,
+            value=value))
+    lib_data.insert_rows(_data)
+
+    # Return
+    result = (idx_datapoint, timestamps)
+    return result
+
+
 if __name__ == '__main__':
     # Make sure the environment is OK to run unittests
     UnittestConfig().create()
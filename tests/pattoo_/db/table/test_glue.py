@@ -96,6 +96,43 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertTrue(bool(result))
         self.assertTrue(isinstance(result, int))
 
+    def test_insert_batch(self):
+        """Testing method / function insert_batch."""
+        # Initialize key variables
+        polling_interval = 1
+        keypairs = []
+        checksums = []
+        items = []
+        for _ in range(0, 5):
+            key = data.hashstring(str(random()))
+            value = data.hashstring(str(random()))
+            keypairs.append((key, value))
+            checksums.append(data.hashstring(str(random())))
+
+        # Create a new Agent entry
+        agent_id = data.hashstring(str(random()))
+        agent_target = data.hashstring(str(random()))
+        agent_program = data.hashstring(str(random()))
+        agent.insert_row(agent_id, agent_target, agent_program)
+        idx_agent = agent.exists(agent_id, agent_target)
+
+        # Insert values in tables
+        lookup = pair.insert_rows(keypairs)
+        for checksum in checksums:
+            datapoint.insert_row(
+                checksum, DATA_FLOAT, polling_interval, idx_agent)
+            idx_datapoint = datapoint.checksum_exists(checksum)
+            for idx_pair in lookup.values():
+                items.append((idx_pair, idx_datapoint))
+
+        # Create entries and check. Pre-existing entries must be ignored.
+        idx_pair, idx_datapoint = items[0]
+        glue.insert_rows(idx_datapoint, idx_pair)
+        glue.insert_batch(items + items)
+        for idx_pair, idx_datapoint in items:
+            result = glue.glue_exists(idx_datapoint, idx_pair)
+            self.assertTrue(bool(result))
+
     def test_idx_pairs(self):
         """Testing method / function idx_pairs."""
         # Initialize key variables
@@ -5,6 +5,7 @@ import os
 import unittest
 import sys
 import time
+import multiprocessing
 from random import random
 
 # Try to create a working PYTHONPATH
@@ -31,6 +32,94 @@ from tests.libraries.configuration import UnittestConfig
 from pattoo.db.table import pair
 
 
+class TestPairCache(unittest.TestCase):
+    """Checks all PairCache methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Test
+        _cache = pair.PairCache(size=10)
+        self.assertEqual(len(_cache), 0)
+        self.assertEqual(_cache.hits, 0)
+        self.assertEqual(_cache.misses, 0)
+
+    def test_get(self):
+        """Testing method / function get."""
+        # Initialize key variables
+        _cache = pair.PairCache(size=10)
+        _cache.update({('k1', 'v1'): 1, ('k2', 'v2'): 2})
+
+        # Test
+        result = _cache.get([('k1', 'v1'), ('k3', 'v3')])
+        self.assertEqual(result, {('k1', 'v1'): 1})
+        self.assertEqual(_cache.hits, 1)
+        self.assertEqual(_cache.misses, 1)
+
+    def test_update(self):
+        """Testing method / function update."""
+        # Initialize key variables
+        _cache = pair.PairCache(size=2)
+        _cache.update({('k1', 'v1'): 1, ('k2', 'v2'): 2})
+
+        # Make ('k1', 'v1') the most recently used entry
+        _cache.get([('k1', 'v1')])
+
+        # Test eviction of the least recently used entry
+        _cache.update({('k3', 'v3'): 3})
+        self.assertEqual(len(_cache), 2)
+        result = _cache.get([('k1', 'v1'), ('k2', 'v2'), ('k3', 'v3')])
+        self.assertEqual(result, {('k1', 'v1'): 1, ('k3', 'v3'): 3})
+
+        # Test disabled cache
+        _cache = pair.PairCache(size=0)
+        _cache.update({('k1', 'v1'): 1})
+        self.assertEqual(len(_cache), 0)
+
+    def test_share(self):
+        """Testing method / function share."""
+        # Initialize key variables
+        hits = multiprocessing.Value('Q', 0)
+        misses = multiprocessing.Value('Q', 0)
+        _cache = pair.PairCache(size=10)
+        _cache.update({('k1', 'v1'): 1})
+
+        # Counters are shared after calling share
+        _cache.get([('k1', 'v1')])
+        _cache.share(hits, misses)
+        _cache.get([('k1', 'v1'), ('k2', 'v2'), ('k3', 'v3')])
+        self.assertEqual(hits.value, 1)
+        self.assertEqual(misses.value, 2)
+        self.assertEqual(_cache.hits, 2)
+        self.assertEqual(_cache.misses, 2)
+
+    def test_warm(self):
+        """Testing method / function warm."""
+        # Initialize key variables
+        key = data.hashstring(str(random()))
+        value = data.hashstring(str(random()))
+        pair.insert_rows((key, value))
+        idx_pair = pair.pair_exists(key, value)
+
+        # Test
+        _cache = pair.PairCache(size=10)
+        _cache.warm()
+        self.assertTrue(1 <= len(_cache) <= 10)
+        result = _cache.get([(key, value)])
+        self.assertEqual(result, {(key, value): idx_pair})
+
+    def test_stats(self):
+        """Testing method / function stats."""
+        # Initialize key variables
+        _cache = pair.PairCache(size=10)
+        _cache.update({('k1', 'v1'): 1})
+        _cache.get([('k1', 'v1'), ('k2', 'v2')])
+
+        # Test
+        result = _cache.stats()
+        self.assertEqual(
+            result, {'size': 10, 'entries': 1, 'hits': 1, 'misses': 1})
+
+
 class TestBasicFunctions(unittest.TestCase):
     """Checks all functions and methods."""
 
@@ -61,10 +150,51 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertFalse(result)
 
         # Create entry and check
-        pair.insert_rows((key, value))
+        lookup = pair.insert_rows((key, value))
         result = pair.pair_exists(key, value)
         self.assertTrue(bool(result))
         self.assertTrue(isinstance(result, int))
+        self.assertEqual(lookup, {(key, value): result})
+
+        # Reinserting returns the same pre-existing idx_pair values
+        lookup = pair.insert_rows([(key, value), (key, value)])
+        self.assertEqual(lookup, {(key, value): result})
+
+    def test_cache(self):
+        """Testing method / function cache."""
+        # Test
+        result = pair.cache()
+        self.assertTrue(isinstance(result, pair.PairCache))
+        self.assertEqual(result, pair.cache())
+
+        # Inserted pairs are cached
+        key = data.hashstring(str(random()))
+        value = data.hashstring(str(random()))
+        lookup = pair.insert_rows((key, value))
+        self.assertEqual(result.get([(key, value)]), lookup)
+
+    def test_idx_pairs_lookup(self):
+        """Testing method / function idx_pairs_lookup."""
+        # Initialize key variables
+        keypairs = []
+        for _ in range(0, 10):
+            key = data.hashstring(str(random()))
+            value = data.hashstring(str(random()))
+            keypairs.append((key, value))
+
+        # Nothing should be found before insertion
+        result = pair.idx_pairs_lookup(keypairs)
+        self.assertEqual(result, {})
+
+        # Insert values in tables
+        pair.insert_rows(keypairs)
+
+        # Test
+        result = pair.idx_pairs_lookup(keypairs)
+        self.assertEqual(len(result), len(keypairs))
+        for key, value in keypairs:
+            self.assertEqual(
+                result[(key, value)], pair.pair_exists(key, value))
 
     def test_idx_pairs(self):
         """Testing method / function idx_pairs."""
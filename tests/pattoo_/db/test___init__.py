@@ -8,6 +8,9 @@ from random import random, randint
 import multiprocessing
 from collections import namedtuple
 
+# PIP3 imports
+from pymysql.constants import CLIENT
+
 # Try to create a working PYTHONPATH
 EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
 ROOT_DIR = os.path.abspath(os.path.join(
@@ -28,6 +31,7 @@ else:
 from tests.libraries.configuration import UnittestConfig
 from pattoo_shared import data
 from pattoo.db.table import language
+from pattoo import db as pattoo_db
 
 
 class TestBasicFunctions(unittest.TestCase):
@@ -87,6 +91,53 @@ Test for multiprocessing database update is hanging. Please check possible \
 causes.''')
             sys.exit(2)
 
+    def test__add_engine_pidguard(self):
+        """Testing method / function _add_engine_pidguard."""
+        # Initialize key variables
+        process_count = 50
+        timeout = 120
+        code = data.hashstring(str(random()))
+        name = data.hashstring(str(random()))
+
+        # Add an entry to the database. This leaves an open connection in
+        # the pool of the parent process
+        language.insert_row(code, name)
+        idx_language = language.exists(code)
+        self.assertTrue(bool(idx_language))
+
+        # Start many forked workers at once without any delays. Each must
+        # discard the inherited connection and create its own.
+        with multiprocessing.get_context(
+                'fork').Pool(processes=process_count) as pool:
+            results = pool.map_async(
+                language.exists, [code] * process_count * 4).get(timeout)
+        self.assertEqual(results, [idx_language] * process_count * 4)
+
+        # The parent process connections must remain usable
+        self.assertEqual(language.exists(code), idx_language)
+
+    def test_bulk_pool(self):
+        """Testing method / function bulk_pool."""
+        # The pool is created once, separately from the regular pool
+        result = pattoo_db.bulk_pool()
+        self.assertEqual(result, pattoo_db.bulk_pool())
+        self.assertNotEqual(result, pattoo_db.POOL)
+
+        # Only the connections of the bulk pool allow local files
+        session = result()
+        connection = session.connection().connection
+        self.assertTrue(connection.client_flag & CLIENT.LOCAL_FILES)
+        session.close()
+        session = pattoo_db.POOL()
+        connection = session.connection().connection
+        self.assertFalse(connection.client_flag & CLIENT.LOCAL_FILES)
+        session.close()
+
+    def test__pool(self):
+        """Testing method / function _pool."""
+        # Tested by test_bulk_pool
+        pass
+
 
 def run_(arguments):
     """Run multiprocessing database updates.
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Test pattoo adaptive ingest batch sizing."""
+
+import os
+import unittest
+import sys
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}ingest'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from tests.libraries.configuration import UnittestConfig
+from pattoo.ingest import batch as lib_batch
+from pattoo.ingest.pool import WorkerPool
+
+
+class TestBatchSizer(unittest.TestCase):
+    """Checks all BatchSizer methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        # Sizes are kept within the limits
+        sizer = lib_batch.BatchSizer(0)
+        self.assertEqual(sizer.size(), 1)
+        sizer = lib_batch.BatchSizer(5000, maximum=1000)
+        self.assertEqual(sizer.size(), 1000)
+
+    def test_size(self):
+        """Testing method / function size."""
+        # Test
+        sizer = lib_batch.BatchSizer(500)
+        self.assertEqual(sizer.size(), 500)
+
+    def test_update(self):
+        """Testing method / function update."""
+        # The size is fixed without a target duration or memory limit
+        sizer = lib_batch.BatchSizer(500)
+        sizer.update(500, 100, records=1000)
+        self.assertEqual(sizer.size(), 500)
+
+        # Batches that are too slow get smaller
+        sizer = lib_batch.BatchSizer(500, duration=10)
+        sizer.update(500, 20, records=1000)
+        self.assertEqual(sizer.size(), 250)
+
+        # Batches that are too fast get larger, at most doubling each time
+        sizer = lib_batch.BatchSizer(500, duration=10)
+        sizer.update(500, 8, records=1000)
+        self.assertEqual(sizer.size(), 625)
+        sizer.update(625, 0.1, records=1000)
+        self.assertEqual(sizer.size(), 1250)
+
+        # Partial batches don't change the size
+        sizer.update(10, 0.1, records=20)
+        self.assertEqual(sizer.size(), 1250)
+
+        # The size is halved when the memory limit is exceeded
+        sizer = lib_batch.BatchSizer(500, duration=10, memory=1)
+        sizer.update(500, 1, records=1000)
+        self.assertEqual(sizer.size(), 250)
+
+        # The size doesn't grow when close to the memory limit
+        memory = int(lib_batch._rss() * 1.1)
+        sizer = lib_batch.BatchSizer(500, duration=10, memory=memory)
+        sizer.update(500, 1, records=1000)
+        self.assertEqual(sizer.size(), 500)
+        sizer.update(500, 20, records=1000)
+        self.assertEqual(sizer.size(), 250)
+
+        # The memory of the worker processes counts towards the limit
+        pool = WorkerPool(processes=2, database=False)
+        pool.start()
+        memory = int(lib_batch._rss() * 1.1)
+        sizer = lib_batch.BatchSizer(500, duration=10, memory=memory)
+        sizer.update(500, 1, records=1000, pool=pool)
+        self.assertEqual(sizer.size(), 250)
+        pool.stop()
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions."""
+
+    def test__rss(self):
+        """Testing method / function _rss."""
+        # Test
+        result = lib_batch._rss()
+        self.assertTrue(isinstance(result, int))
+        self.assertTrue(result > 0)
+
+        # Worker processes are added
+        pool = WorkerPool(processes=2, database=False)
+        pool.start()
+        self.assertTrue(lib_batch._rss(pids=pool.pids()) > result)
+        pool.stop()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Test pattoo direct database ingestion."""
+
+import os
+import unittest
+import sys
+import time
+from random import random
+from unittest.mock import patch
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}ingest'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo_shared import converter, files, times
+from pattoo_shared.constants import DATA_INT
+from pattoo_shared.configuration import Config
+from pattoo_shared.variables import (
+    DataPoint, TargetDataPoints, AgentPolledData)
+from tests.libraries.configuration import UnittestConfig
+from pattoo.configuration import ConfigAgentAPId
+from pattoo.db.table import datapoint
+from pattoo.api.agents import post
+from pattoo import serialize
+from pattoo.ingest import direct as lib_direct
+
+
+class TestWriter(unittest.TestCase):
+    """Checks all Writer methods."""
+
+    def setUp(self):
+        """Track the postings that are cached."""
+        self.cached = []
+        self.writer = lib_direct.Writer(
+            lambda data, source: self.cached.append((source, data)))
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_extend(self):
+        """Testing method / function extend."""
+        # Invalid postings are neither written nor cached
+        self.writer.extend([('source', {'test': 1})])
+        self.assertEqual(self.cached, [])
+
+        # Postings are cached after database failures
+        self.writer._failed = time.time()
+        self.writer.extend([('source', {'test': 1})])
+        self.assertEqual(self.cached, [('source', {'test': 1})])
+
+    def test_extend_database(self):
+        """Testing method / function extend writing to the database."""
+        # Initialize key variables
+        data = _posting()
+        pdbrs = converter.cache_to_keypairs(data)
+        self.assertEqual(len(pdbrs), 1)
+        pdbr = pdbrs[0]
+        self.assertFalse(datapoint.checksum_exists(pdbr.pattoo_checksum))
+
+        # Write the posting
+        self.writer.extend([(str(random()), data)])
+        self.assertEqual(self.cached, [])
+
+        # Test (Single data entry should exist)
+        idx_datapoint = datapoint.checksum_exists(pdbr.pattoo_checksum)
+        self.assertTrue(bool(idx_datapoint))
+        obj = datapoint.DataPoint(idx_datapoint)
+        result = obj.data(pdbr.pattoo_timestamp, pdbr.pattoo_timestamp)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(
+            result[0]['timestamp'], times.normalized_timestamp(
+                int(pdbr.pattoo_agent_polling_interval),
+                pdbr.pattoo_timestamp))
+        self.assertEqual(result[0]['value'], pdbr.pattoo_value)
+
+    def test_extend_fallback(self):
+        """Testing method / function extend when the database fails."""
+        # Initialize key variables
+        source = str(random()).replace('.', '')
+        data = _posting()
+        pdbr = converter.cache_to_keypairs(data)[0]
+        writer = lib_direct.Writer(post._cache)
+
+        # Database failures cache the posting
+        with patch.object(
+                lib_direct, 'process_db_records',
+                side_effect=ValueError('Database unavailable')):
+            writer.extend([(source, data)])
+        self.assertTrue(writer._failed > 0)
+        self.assertFalse(datapoint.checksum_exists(pdbr.pattoo_checksum))
+
+        # The posting is cached without losing data
+        filepaths = _filepaths(source)
+        self.assertEqual(len(filepaths), 1)
+        with open(filepaths[0], 'rb') as f_handle:
+            result = serialize.decode(f_handle.read())
+        self.assertEqual(
+            converter.cache_to_keypairs(result)[0].pattoo_checksum,
+            pdbr.pattoo_checksum)
+        self.assertEqual(
+            converter.cache_to_keypairs(result)[0].pattoo_value,
+            pdbr.pattoo_value)
+        os.remove(filepaths[0])
+
+    def test__cache(self):
+        """Testing method / function _cache."""
+        # Test
+        items = [('source_{}'.format(_), {'value': _}) for _ in range(0, 3)]
+        self.writer._cache(items)
+        self.assertEqual(self.cached, items)
+
+
+def _filepaths(source):
+    """Get the paths of the cache files of a source.
+
+    Args:
+        source: Unique Identifier of an pattoo agent
+
+    Returns:
+        result: List of cache file paths
+
+    """
+    # Initialize key variables
+    result = []
+
+    # Find the files
+    for directory in ConfigAgentAPId().cache_directories():
+        result.extend([
+            os.path.join(directory, _) for _ in os.listdir(directory)
+            if '_{}_'.format(source) in _])
+    return result
+
+
+def _posting():
+    """Create the data of an agent posting.
+
+    Args:
+        None
+
+    Returns:
+        result: Data dict of the posting
+
+    """
+    # Initialize key variables
+    config = Config()
+    polling_interval = 20
+    pattoo_agent_program = str(random())
+
+    # We want to make sure we get a different AgentID each time
+    filename = files.agent_id_file(pattoo_agent_program, config)
+    if os.path.isfile(filename) is True:
+        os.remove(filename)
+
+    # Setup AgentPolledData
+    apd = AgentPolledData(pattoo_agent_program, polling_interval)
+    ddv = TargetDataPoints(str(random()))
+    ddv.add(DataPoint(str(random()), 4, data_type=DATA_INT))
+    apd.add(ddv)
+
+    # Return
+    result = converter.posting_data_points(converter.agentdata_to_post(apd))
+    return result
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -6,6 +6,9 @@ import unittest
 import sys
 import json
 import socket
+import tempfile
+import shutil
+from collections import deque
 from random import random, uniform
 
 # Try to create a working PYTHONPATH
@@ -31,6 +34,8 @@ from pattoo_shared.constants import DATA_INT
 from pattoo_shared.configuration import ServerConfig
 from pattoo.constants import PATTOO_API_AGENT_NAME, PATTOO_INGESTER_NAME
 from pattoo.db.table import datapoint
+from pattoo.segment import SegmentWriter, SegmentReader
+from pattoo import serialize
 from pattoo.ingest.files import Cache
 from pattoo.ingest import files as files_test
 
@@ -46,7 +51,21 @@ class TestCache(unittest.TestCase):
 
     def test___init__(self):
         """Testing method / function __init__."""
-        pass
+        # Initialize key variables
+        _ = create_cache()
+
+        # Files outside the requested shards are not read
+        cache = Cache(shards=[1])
+        self.assertEqual(cache.files, 0)
+
+        # The owner of shard 0 reads files in the agent cache directory
+        cache = Cache(shards=[0])
+        self.assertEqual(cache.files, 1)
+
+        # Read all files
+        cache = Cache()
+        self.assertEqual(cache.files, 1)
+        cache.purge()
 
     def test_records(self):
         """Testing method / function records."""
@@ -92,6 +111,66 @@ class TestCache(unittest.TestCase):
         # Purge cache to make sure there are no extraneous files
         cache.purge()
 
+        # Read several records from the same segment
+        directory = tempfile.mkdtemp()
+        postings = [create_posting() for _ in range(0, 3)]
+        writer = SegmentWriter(directory)
+        writer.extend([cache_dict for _, cache_dict in postings])
+        writer.close()
+        cache = Cache(shards=[])
+        cache._reader = SegmentReader(directory)
+        cache._data = cache._reader.read()
+        all_records = cache.records()
+
+        # Test
+        self.assertEqual(len(all_records), 3)
+        self.assertEqual(
+            sorted([_[0].pattoo_agent_id for _ in all_records]),
+            sorted([values['pattoo_agent_id'] for values, _ in postings]))
+        for pdbrs in all_records:
+            self.assertEqual(len(pdbrs), 1)
+
+        # Ingest the records. The segment is deleted afterwards.
+        self.assertEqual(cache.ingest(), 3)
+        for pdbrs in all_records:
+            self.assertTrue(
+                bool(datapoint.checksum_exists(pdbrs[0].pattoo_checksum)))
+        self.assertEqual(os.listdir(directory), [])
+        shutil.rmtree(directory)
+
+    def test_stream(self):
+        """Testing method / function stream."""
+        # Initialize key variables
+        pattoo_values = create_cache()
+
+        # Test
+        cache = Cache()
+        result = list(cache.stream())
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(result[0]), 1)
+        self.assertEqual(
+            result[0][0].pattoo_agent_id, pattoo_values['pattoo_agent_id'])
+        self.assertEqual(
+            result[0][0].pattoo_value, pattoo_values['pattoo_value'])
+
+        # Records are yielded when the limit is reached
+        result = list(cache.stream(max_records=1))
+        self.assertEqual(len(result), 1)
+        cache.purge()
+
+    def test_sources(self):
+        """Testing method / function sources."""
+        # Initialize key variables
+        _ = create_cache()
+
+        # Test
+        cache = Cache()
+        result = cache.sources()
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(result[0]), 1)
+        self.assertTrue(result[0][0].endswith('cache_test.json'))
+        cache.purge()
+
     def test_purge(self):
         """Testing method / function purge."""
         # Initialize key variables
@@ -183,9 +262,17 @@ class TestBasicFunctions(unittest.TestCase):
         value = pdbr.pattoo_value
         self.assertFalse(datapoint.checksum_exists(checksum))
 
-        # Ingest using process_cache
+        # Nothing is ingested while another ingester holds the lock
+        self.assertTrue(files_test._lock())
+        result = files_test.process_cache(fileage=0)
+        self.assertFalse(result)
+        self.assertTrue(files_test._lock(delete=True))
+        self.assertFalse(datapoint.checksum_exists(checksum))
+
+        # Ingest using process_cache. The lock is released afterwards.
         result = files_test.process_cache(fileage=0)
         self.assertTrue(result)
+        self.assertFalse(files_test.locked())
 
         # Test (checksum should exist)
         idx_datapoint = datapoint.checksum_exists(checksum)
@@ -200,6 +287,103 @@ class TestBasicFunctions(unittest.TestCase):
             key_pair['timestamp'], times.normalized_timestamp(_pi, timestamp))
         self.assertEqual(key_pair['value'], value)
 
+        # The lock is released when ingesting fails
+        with self.assertRaises(ValueError):
+            files_test.process_cache(fileage=0, sizer=_FailingSizer())
+        self.assertFalse(files_test.locked())
+
+    def test__filepaths(self):
+        """Testing method / function _filepaths."""
+        # Initialize key variables
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        _ = create_cache()
+
+        # Test
+        result = files_test._filepaths(cache_directory)
+        self.assertEqual(len(result), 1)
+        self.assertTrue(result[0].endswith('cache_test.json'))
+
+        # Test with a file age that is too recent
+        result = files_test._filepaths(cache_directory, age=3600)
+        self.assertFalse(bool(result))
+
+        # Delete the file
+        os.remove('{}{}cache_test.json'.format(cache_directory, os.sep))
+
+    def test__read_json_files(self):
+        """Testing method / function _read_json_files."""
+        # Initialize key variables
+        config = ServerConfig()
+        directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        valid = os.path.join(directory, 'cache_test.json')
+        invalid = os.path.join(directory, 'cache_test_invalid.json')
+        binary = os.path.join(directory, 'cache_test_binary.msgpack')
+        with open(valid, 'w') as f_handle:
+            json.dump({'key': 'value'}, f_handle)
+        with open(invalid, 'w') as f_handle:
+            f_handle.write('{')
+        with open(binary, 'wb') as f_handle:
+            f_handle.write(serialize.encode({'key': 'binary'}, binary=True))
+
+        # Test. Invalid files are returned with empty data to be purged.
+        result = files_test._read_json_files(directory)
+        self.assertEqual(
+            result, [(valid, {'key': 'value'}), (binary, {'key': 'binary'}),
+                     (invalid, {})])
+        result = files_test._read_json_files(directory, count=1)
+        self.assertEqual(result, [(valid, {'key': 'value'})])
+
+        # Clean up
+        os.remove(valid)
+        os.remove(invalid)
+        os.remove(binary)
+
+    def test__source(self):
+        """Testing method / function _source."""
+        # Test
+        result = files_test._source('/tmp/1580000000000_agent_id_012345.json')
+        self.assertEqual(result, 'agent_id')
+        result = files_test._source('/tmp/1580000000000_source_012345.json')
+        self.assertEqual(result, 'source')
+        result = files_test._source('/tmp/cache_test.json')
+        self.assertEqual(result, 'cache_test')
+
+    def test__pending(self):
+        """Testing method / function _pending."""
+        # Initialize key variables
+        pending = deque([('agent_1', 'first'), ('agent_1', 'second')])
+        agents = {'agent_1': 'second'}
+
+        # The agent is only forgotten after its most recent task
+        result = files_test._pending(pending, agents)
+        self.assertEqual(result, 'first')
+        self.assertEqual(agents, {'agent_1': 'second'})
+        result = files_test._pending(pending, agents)
+        self.assertEqual(result, 'second')
+        self.assertEqual(agents, {})
+        self.assertFalse(bool(pending))
+
+    def test_locked(self):
+        """Testing method / function locked."""
+        # Initialize key variables
+        config = ServerConfig()
+        lockfile = files.lock_file(PATTOO_INGESTER_NAME, config)
+
+        # Test
+        self.assertFalse(files_test.locked())
+        self.assertTrue(files_test._lock())
+        self.assertTrue(files_test.locked())
+        self.assertTrue(files_test._lock(delete=True))
+        self.assertFalse(files_test.locked())
+
+        # Lock files left by ingesters that stopped unexpectedly are ignored
+        with open(lockfile, 'w') as f_handle:
+            f_handle.write('1')
+        self.assertFalse(files_test.locked())
+        self.assertTrue(files_test._lock())
+        self.assertTrue(files_test._lock(delete=True))
+
     def test__lock(self):
         """Testing method / function _lock."""
         # Initialize key variables
@@ -229,13 +413,51 @@ class TestBasicFunctions(unittest.TestCase):
         self.assertTrue(result)
 
 
+class _FailingSizer():
+    """BatchSizer that fails when asked for the batch size."""
+
+    def size(self):
+        """Fail.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        raise ValueError('Batch size unavailable')
+
+
 def create_cache():
     """Testing method / function records."""
     # Initialize key variables
     config = ServerConfig()
-    polling_interval = 20
     cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
-    result = {
+    result, cache_dict = create_posting()
+
+    # Write data to cache
+    cache_file = '{}{}cache_test.json'.format(cache_directory, os.sep)
+    with open(cache_file, 'w') as _fp:
+        json.dump(cache_dict, _fp)
+
+    return result
+
+
+def create_posting():
+    """Create agent posting data.
+
+    Args:
+        None
+
+    Returns:
+        result: Tuple of (values, posting data)
+
+    """
+    # Initialize key variables
+    config = ServerConfig()
+    polling_interval = 20
+    values = {
         'pattoo_agent_program': data.hashstring(str(random())),
         'pattoo_agent_polled_target': socket.getfqdn(),
         'pattoo_key': data.hashstring(str(random())),
@@ -245,36 +467,33 @@ def create_cache():
 
     # We want to make sure we get a different AgentID each time
     filename = files.agent_id_file(
-        result['pattoo_agent_program'],
+        values['pattoo_agent_program'],
         config)
     if os.path.isfile(filename) is True:
         os.remove(filename)
-    result['pattoo_agent_id'] = files.get_agent_id(
-        result['pattoo_agent_program'],
+    values['pattoo_agent_id'] = files.get_agent_id(
+        values['pattoo_agent_program'],
         config)
 
     # Setup AgentPolledData
-    apd = AgentPolledData(result['pattoo_agent_program'], polling_interval)
+    apd = AgentPolledData(values['pattoo_agent_program'], polling_interval)
 
     # Initialize TargetDataPoints
-    ddv = TargetDataPoints(result['pattoo_agent_hostname'])
+    ddv = TargetDataPoints(values['pattoo_agent_hostname'])
 
     # Setup DataPoint
     data_type = DATA_INT
     variable = DataPoint(
-        result['pattoo_key'], result['pattoo_value'], data_type=data_type)
+        values['pattoo_key'], values['pattoo_value'], data_type=data_type)
 
     # Add data to TargetDataPoints
     ddv.add(variable)
 
-    # Write data to cache
+    # Create the posting
     apd.add(ddv)
     cache_dict = converter.posting_data_points(
         converter.agentdata_to_post(apd))
-    cache_file = '{}{}cache_test.json'.format(cache_directory, os.sep)
-    with open(cache_file, 'w') as _fp:
-        json.dump(cache_dict, _fp)
-
+    result = (values, cache_dict)
     return result
 
 
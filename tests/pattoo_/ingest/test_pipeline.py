@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Test pattoo ingest pipeline."""
+
+import os
+import unittest
+import sys
+import time
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}ingest'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from tests.libraries.configuration import UnittestConfig
+from tests.pattoo_.ingest.test_files import create_cache
+from pattoo.db.table import datapoint
+from pattoo.ingest.files import Cache
+from pattoo.ingest import pipeline as lib_pipeline
+
+
+class TestStage(unittest.TestCase):
+    """Checks all Stage methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_update(self):
+        """Testing method / function update."""
+        # Test
+        stage = lib_pipeline.Stage('test')
+        stage.update(depth=5)
+        stage.update(items=2, depth=3)
+        self.assertEqual(stage.items, 3)
+        self.assertEqual(stage.depth, 5)
+
+    def test_rate(self):
+        """Testing method / function rate."""
+        # Nothing processed
+        stage = lib_pipeline.Stage('test')
+        self.assertEqual(stage.rate(), 0)
+
+        # Test
+        stage.update(items=0)
+        time.sleep(0.1)
+        stage.update(items=10)
+        self.assertTrue(0 < stage.rate() <= 100)
+
+    def test_summary(self):
+        """Testing method / function summary."""
+        # Test
+        stage = lib_pipeline.Stage('test')
+        stage.update(depth=4)
+        result = stage.summary()
+        self.assertTrue(result.startswith('test: 1 items'))
+        self.assertTrue(result.endswith('maximum queue depth 4'))
+
+
+class TestPipeline(unittest.TestCase):
+    """Checks all Pipeline methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_run(self):
+        """Testing method / function run."""
+        # Initialize key variables
+        _ = create_cache()
+        cache = Cache()
+        all_records = cache.records()
+        self.assertEqual(len(all_records), 1)
+        checksum = all_records[0][0].pattoo_checksum
+        self.assertFalse(datapoint.checksum_exists(checksum))
+
+        # Test
+        pipeline = lib_pipeline.Pipeline(cache)
+        result = pipeline.run()
+        self.assertEqual(result, 1)
+        self.assertTrue(bool(datapoint.checksum_exists(checksum)))
+
+        # Every stage processed the data
+        for stage in pipeline.stages:
+            self.assertEqual(stage.items, 1)
+        cache.purge()
+
+    def test__read(self):
+        """Testing method / function _read."""
+        # Tested by test_run
+        pass
+
+    def test__parsed(self):
+        """Testing method / function _parsed."""
+        # Tested by test_run
+        pass
+
+    def test__write(self):
+        """Testing method / function _write."""
+        # Tested by test_run
+        pass
+
+    def test__written(self):
+        """Testing method / function _written."""
+        # Tested by test_run
+        pass
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_parser_pool(self):
+        """Testing method / function parser_pool."""
+        # The same processes are reused
+        result = lib_pipeline.parser_pool(2)
+        self.assertEqual(result.processes(), 2)
+        self.assertIs(lib_pipeline.parser_pool(2), result)
+
+        # The processes are replaced if the number changes
+        other = lib_pipeline.parser_pool(1)
+        self.assertEqual(other.processes(), 1)
+        self.assertIsNot(other, result)
+        other.stop()
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
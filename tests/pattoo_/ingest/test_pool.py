@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Test pattoo WorkerPool."""
+
+import os
+import unittest
+import sys
+import multiprocessing
+from random import random
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}ingest'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from tests.libraries.configuration import UnittestConfig
+from pattoo.ingest import pool as lib_pool
+from pattoo.db.table import pair
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Checks all WorkerPool methods."""
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_processes(self):
+        """Testing method / function processes."""
+        # Test
+        pool = lib_pool.WorkerPool(processes=3)
+        self.assertEqual(pool.processes(), 3)
+        pool = lib_pool.WorkerPool(processes=0)
+        self.assertEqual(pool.processes(), 1)
+
+    def test_start(self):
+        """Testing method / function start."""
+        # Test
+        pool = lib_pool.WorkerPool(processes=2)
+        self.assertFalse(pool.healthy())
+        pool.start()
+        self.assertTrue(pool.healthy())
+        pool.stop()
+
+    def test_stop(self):
+        """Testing method / function stop."""
+        # Test
+        pool = lib_pool.WorkerPool(processes=2)
+        pool.start()
+        pool.stop()
+        self.assertFalse(pool.healthy())
+
+        # Stopping twice must not fail
+        pool.stop()
+
+    def test_restart(self):
+        """Testing method / function restart."""
+        # Test
+        pool = lib_pool.WorkerPool(processes=2)
+        pool.start()
+        pool.restart()
+        self.assertTrue(pool.healthy())
+        pool.stop()
+
+    def test_pids(self):
+        """Testing method / function pids."""
+        # Test
+        pool = lib_pool.WorkerPool(processes=2, database=False)
+        self.assertEqual(pool.pids(), [])
+        pool.start()
+        result = pool.pids()
+        self.assertEqual(len(set(result)), 2)
+        self.assertFalse(os.getpid() in result)
+        pool.stop()
+        self.assertEqual(pool.pids(), [])
+
+    def test_pair_stats(self):
+        """Testing method / function pair_stats."""
+        # Test
+        pool = lib_pool.WorkerPool(processes=2)
+        self.assertEqual(pool.pair_stats(), {'hits': 0, 'misses': 0})
+
+    def test_healthy(self):
+        """Testing method / function healthy."""
+        # Test
+        pool = lib_pool.WorkerPool(processes=2)
+        self.assertFalse(pool.healthy())
+        pool.start()
+        self.assertTrue(pool.healthy())
+        pool.stop()
+        self.assertFalse(pool.healthy())
+
+    def test_starmap(self):
+        """Testing method / function starmap."""
+        # Workers are started automatically and reused for each call
+        pool = lib_pool.WorkerPool(processes=2, max_tasks=100)
+        for _ in range(0, 3):
+            result = pool.starmap(pow, [(2, 3), (3, 2)])
+            self.assertEqual(result, [8, 9])
+        pool.stop()
+
+        # Health checks use up worker tasks. Workers replaced after every
+        # task still run the tasks when checked before each call.
+        pool = lib_pool.WorkerPool(processes=2, max_tasks=1, interval=0)
+        for _ in range(0, 3):
+            result = pool.starmap(pow, [(2, 3), (3, 2)])
+            self.assertEqual(result, [8, 9])
+        pool.stop()
+
+    def test_apply_async(self):
+        """Testing method / function apply_async."""
+        # Workers are started automatically
+        pool = lib_pool.WorkerPool(processes=2)
+        results = [pool.apply_async(pow, (2, _)) for _ in range(0, 4)]
+        self.assertEqual([_.get() for _ in results], [1, 2, 4, 8])
+        pool.stop()
+
+        # Workers that don't use the database
+        pool = lib_pool.WorkerPool(processes=2, database=False)
+        results = [pool.apply_async(pow, (3, _)) for _ in range(0, 3)]
+        self.assertEqual([_.get() for _ in results], [1, 3, 9])
+        pool.stop()
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test__initialize(self):
+        """Testing method / function _initialize."""
+        # Test
+        lib_pool._initialize()
+
+        # The Pair cache counters are shared
+        hits = multiprocessing.Value('Q', 0)
+        misses = multiprocessing.Value('Q', 0)
+        lib_pool._initialize(hits, misses)
+        pair.cache().get([('pattoo_test_key', str(random()))])
+        self.assertEqual(misses.value, 1)
+
+    def test__ping(self):
+        """Testing method / function _ping."""
+        # Test
+        result = lib_pool._ping()
+        self.assertEqual(result, os.getpid())
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
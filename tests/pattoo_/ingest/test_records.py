@@ -105,6 +105,38 @@ class TestRecords(unittest.TestCase):
             self.assertEqual(result['value'], expected[index]['value'])
             self.assertEqual(result['timestamp'], expected[index]['timestamp'])
 
+    def test_multiprocess_shards(self):
+        """Testing method / function multiprocess_shards."""
+        # Initialize key variables
+        items = make_records()
+        timestamps = items['timestamps']
+        records = items['records']
+        expected = items['expected']
+        checksum = items['checksum']
+
+        # Entry should not exist
+        result = datapoint.checksum_exists(checksum)
+        self.assertFalse(result)
+
+        # Test
+        process = ingest_data.Records([records])
+        process.multiprocess_shards()
+        self.assertEqual(process.counters.agents, 1)
+        self.assertEqual(process.counters.records, len(records))
+        self.assertEqual(process.counters.rows, len(expected))
+
+        # Get data from database
+        idx_datapoint = datapoint.checksum_exists(checksum)
+        _dp = datapoint.DataPoint(idx_datapoint)
+        ts_start = min(timestamps)
+        ts_stop = max(timestamps)
+        results = _dp.data(ts_start, ts_stop)
+
+        # Test
+        for index, result in enumerate(results):
+            self.assertEqual(result['value'], expected[index]['value'])
+            self.assertEqual(result['timestamp'], expected[index]['timestamp'])
+
     def test_singleprocess_pairs(self):
         """Testing method / function singleprocess_pairs."""
         # Initialize key variables
@@ -206,6 +238,52 @@ class TestBasicFunctions(unittest.TestCase):
         # Tested by TestProcess class unittests in this file
         pass
 
+    def test__process_shard_exception(self):
+        """Testing method / function _process_shard_exception."""
+        # Initialize key variables
+        items = make_records()
+        records = items['records']
+
+        # Test
+        result = ingest_data._process_shard_exception([records, []])
+        self.assertEqual(result.agents, 1)
+        self.assertEqual(result.records, len(records))
+        self.assertEqual(result.rows, len(items['expected']))
+
+        # Bulk load the shard
+        items = make_records()
+        records = items['records']
+        result = ingest_data._process_shard_exception(
+            [records, []], bulk=True)
+        self.assertEqual(result.agents, 1)
+        self.assertEqual(result.records, len(records))
+        self.assertEqual(result.rows, len(items['expected']))
+
+    def test__data_rows_exception(self):
+        """Testing method / function _data_rows_exception."""
+        # Initialize key variables
+        items = make_records()
+        records = items['records']
+
+        # Test
+        result = ingest_data._data_rows_exception([records, []])
+        self.assertEqual(len(result), len(items['expected']))
+        self.assertEqual(
+            sorted([_.timestamp for _ in result]), sorted(items['timestamps']))
+
+    def test__process_files_exception(self):
+        """Testing method / function _process_files_exception."""
+        # Tested by test_process_files
+        pass
+
+    def test_process_files(self):
+        """Testing method / function process_files."""
+        # Files that can't be read are skipped
+        result = ingest_data.process_files(['/tmp/does-not-exist.json'])
+        self.assertEqual(result.agents, 0)
+        self.assertEqual(result.records, 0)
+        self.assertEqual(result.rows, 0)
+
     def test__multiprocess_pairs(self):
         """Testing method / function _multiprocess_pairs."""
         # Tested by TestProcess class unittests in this file
@@ -216,6 +294,63 @@ class TestBasicFunctions(unittest.TestCase):
         # Tested by TestProcess class unittests in this file
         pass
 
+    def test_read_file(self):
+        """Testing method / function read_file."""
+        # Files that can't be read return no records
+        result = ingest_data.read_file('/tmp/does-not-exist.json')
+        self.assertEqual(result, [])
+
+    def test_parse(self):
+        """Testing method / function parse."""
+        # Invalid JSON returns no records
+        result = ingest_data.parse('/tmp/test.json', '{')
+        self.assertEqual(result, [])
+
+        # Data without pattoo information returns no records
+        result = ingest_data.parse('/tmp/test.json', '{"test": 1}')
+        self.assertEqual(result, [])
+
+    def test_process_db_records_lists(self):
+        """Testing method / function process_db_records_lists."""
+        # Test both the regular inserts and the single bulk load
+        for bulk in [False, True]:
+            items = [make_records() for _ in range(0, 2)]
+            result = ingest_data.process_db_records_lists(
+                [_['records'] for _ in items] + [[]], bulk=bulk)
+            self.assertEqual(
+                result, sum([len(_['expected']) for _ in items]))
+
+            # The data of every agent is in the database
+            for item in items:
+                idx_datapoint = datapoint.checksum_exists(item['checksum'])
+                _dp = datapoint.DataPoint(idx_datapoint)
+                results = _dp.data(
+                    min(item['timestamps']), max(item['timestamps']))
+                self.assertEqual(
+                    [_['value'] for _ in results],
+                    [_['value'] for _ in item['expected']])
+
+    def test_data_rows(self):
+        """Testing method / function data_rows."""
+        # Initialize key variables
+        items = make_records()
+
+        # DataPoints are created, but no data is inserted
+        result = ingest_data.data_rows(items['records'])
+        self.assertEqual(len(result), len(items['expected']))
+        idx_datapoint = datapoint.checksum_exists(items['checksum'])
+        self.assertTrue(bool(idx_datapoint))
+        for item in result:
+            self.assertEqual(item.idx_datapoint, idx_datapoint)
+        _dp = datapoint.DataPoint(idx_datapoint)
+        results = _dp.data(
+            min(items['timestamps']), max(items['timestamps']))
+        self.assertEqual(
+            [_['value'] for _ in results if _['value'] is not None], [])
+
+        # Nothing to process
+        self.assertEqual(ingest_data.data_rows([]), [])
+
     def test_process_db_records(self):
         """Testing method / function process_db_records."""
         # Initialize key variables
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Test pattoo event driven ingestion."""
+
+import os
+import unittest
+import sys
+import time
+import tempfile
+import shutil
+import threading
+from unittest.mock import patch
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(
+        os.path.abspath(os.path.join(
+                EXEC_DIR, os.pardir)), os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_{0}ingest'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+from pattoo_shared.configuration import ServerConfig
+from tests.libraries.configuration import UnittestConfig
+from pattoo.constants import PATTOO_API_AGENT_NAME
+from pattoo.configuration import ConfigAgentAPId
+from pattoo.segment import SegmentWriter, ACTIVE
+from pattoo.ingest import watch
+
+
+class TestWatcher(unittest.TestCase):
+    """Checks all Watcher methods."""
+
+    def setUp(self):
+        """Create a directory to watch."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Delete the directory."""
+        shutil.rmtree(self.directory)
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_inotify(self):
+        """Testing method / function inotify."""
+        # Test
+        watcher = watch.Watcher([self.directory])
+        self.assertTrue(watcher.inotify())
+        watcher.close()
+        self.assertFalse(watcher.inotify())
+
+    def test_wait(self):
+        """Testing method / function wait."""
+        # Test with and without inotify
+        for use_inotify in [True, False]:
+            watcher = watch.Watcher(
+                [self.directory], interval=0.1, use_inotify=use_inotify)
+            self.assertEqual(watcher.inotify(), use_inotify)
+
+            # Nothing found
+            self.assertEqual(watcher.wait(0.1), 0)
+
+            # Only completed files are found
+            for index in range(0, 3):
+                _create(self.directory, '{}_{}.json'.format(
+                    use_inotify, index))
+            self.assertEqual(watcher.wait(2), 3)
+            watcher.close()
+
+    def test_close(self):
+        """Testing method / function close."""
+        # Tested by test_inotify
+        pass
+
+    def test__events(self):
+        """Testing method / function _events."""
+        # Tested by test_wait
+        pass
+
+    def test__poll(self):
+        """Testing method / function _poll."""
+        # Tested by test_wait
+        pass
+
+    def test__scan(self):
+        """Testing method / function _scan."""
+        # Test
+        watcher = watch.Watcher([self.directory])
+        _create(self.directory, 'test.json')
+        result = watcher._scan()
+        self.assertEqual(
+            result, set([os.path.join(self.directory, 'test.json')]))
+        watcher.close()
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def test_process_events(self):
+        """Testing method / function process_events."""
+        # Initialize key variables
+        config = ServerConfig()
+        cache_directory = config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+        filename = 'event_test.json'
+
+        # Create a cache file without data after starting
+        timer = threading.Timer(
+            0.5, _create, args=(cache_directory, filename))
+        timer.start()
+
+        # A micro-batch must be processed soon after the file arrives
+        start = time.time()
+        watch.process_events(batches=1)
+        self.assertLess(time.time() - start, 30)
+
+        # Files without data are not deleted
+        os.remove(os.path.join(cache_directory, filename))
+
+    def test_process_events_segment(self):
+        """Testing method / function process_events with segments."""
+        # Initialize key variables
+        directory = tempfile.mkdtemp()
+        writer = SegmentWriter(directory, max_age=3600)
+
+        # Write to an active segment that is then left idle
+        timer = threading.Timer(0.5, writer.append, args=({}, ))
+        timer.start()
+
+        # Idle active segments are sealed and ingested without waiting for
+        # the next sweep of the cache after "ingester_interval" seconds
+        backend = patch.object(
+            ConfigAgentAPId, 'cache_backend', return_value='segment')
+        segments = patch.object(
+            ConfigAgentAPId, 'segment_directory', return_value=directory)
+        age = patch.object(ConfigAgentAPId, 'segment_age', return_value=1)
+        start = time.time()
+        with backend, segments, age:
+            watch.process_events(batches=1)
+        self.assertLess(time.time() - start, 20)
+        self.assertFalse(
+            [_ for _ in os.listdir(directory) if _.endswith(ACTIVE)])
+
+        # Clean up
+        writer.close()
+        shutil.rmtree(directory)
+
+    def test__inotify(self):
+        """Testing method / function _inotify."""
+        # Test
+        directory = tempfile.mkdtemp()
+        result = watch._inotify([directory])
+        self.assertTrue(result >= 0)
+        os.close(result)
+        shutil.rmtree(directory)
+
+        # Test with a directory that doesn't exist
+        with self.assertRaises(OSError):
+            watch._inotify([directory])
+
+
+def _create(directory, filename):
+    """Atomically create a file with an empty JSON dict.
+
+    Args:
+        directory: Directory
+        filename: Filename
+
+    Returns:
+        None
+
+    """
+    # Create
+    filepath = os.path.join(directory, filename)
+    with open('{}.tmp'.format(filepath), 'w') as f_handle:
+        f_handle.write('{}')
+    os.replace('{}.tmp'.format(filepath), filepath)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
@@ -20,7 +20,9 @@ else:
     sys.exit(2)
 
 from tests.libraries.configuration import UnittestConfig
+from pattoo import configuration
 from pattoo.configuration import ConfigAPId, ConfigAgentAPId, ConfigIngester
+from pattoo.constants import PATTOO_API_AGENT_NAME
 
 
 class TestConfiguration(unittest.TestCase):
@@ -190,6 +192,135 @@ class TestConfigAgentAPId(unittest.TestCase):
         result = self.config.ip_bind_port()
         self.assertEqual(result, expected)
 
+    def test_cache_shards(self):
+        """Testing function cache_shards."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.cache_shards()
+        self.assertEqual(result, expected)
+
+    def test_cache_shard_directory(self):
+        """Testing function cache_shard_directory."""
+        # Initialize key values
+        expected = '{}{}007'.format(
+            self.config.agent_cache_directory(PATTOO_API_AGENT_NAME), os.sep)
+
+        # Test
+        result = self.config.cache_shard_directory(7)
+        self.assertEqual(result, expected)
+        self.assertTrue(os.path.isdir(result))
+
+        # The directory is only created once per process
+        self.assertTrue(result in configuration._SHARD_DIRECTORIES)
+
+    def test_cache_directories(self):
+        """Testing function cache_directories."""
+        # Initialize key values
+        directory = self.config.agent_cache_directory(PATTOO_API_AGENT_NAME)
+
+        # Test
+        result = self.config.cache_directories()
+        self.assertEqual(result, [directory])
+        result = self.config.cache_directories(shards=[1, 2])
+        self.assertEqual(
+            result, ['{}{}001'.format(directory, os.sep),
+                     '{}{}002'.format(directory, os.sep)])
+
+        # The owner of shard 0 also ingests the agent cache directory
+        result = self.config.cache_directories(shards=[0, 2])
+        self.assertEqual(
+            result, [directory, '{}{}000'.format(directory, os.sep),
+                     '{}{}002'.format(directory, os.sep)])
+
+    def test_cache_backend(self):
+        """Testing function cache_backend."""
+        # Initialize key values
+        expected = 'file'
+
+        # Test
+        result = self.config.cache_backend()
+        self.assertEqual(result, expected)
+
+    def test_cache_format(self):
+        """Testing function cache_format."""
+        # Initialize key values
+        expected = 'json'
+
+        # Test
+        result = self.config.cache_format()
+        self.assertEqual(result, expected)
+
+    def test_buffer(self):
+        """Testing function buffer."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.buffer()
+        self.assertEqual(result, expected)
+
+    def test_buffer_size(self):
+        """Testing function buffer_size."""
+        # Initialize key values
+        expected = 10000
+
+        # Test
+        result = self.config.buffer_size()
+        self.assertEqual(result, expected)
+
+    def test_buffer_flush_size(self):
+        """Testing function buffer_flush_size."""
+        # Initialize key values
+        expected = 1000
+
+        # Test
+        result = self.config.buffer_flush_size()
+        self.assertEqual(result, expected)
+
+    def test_buffer_flush_age(self):
+        """Testing function buffer_flush_age."""
+        # Initialize key values
+        expected = 0.5
+
+        # Test
+        result = self.config.buffer_flush_age()
+        self.assertEqual(result, expected)
+
+    def test_direct_ingest(self):
+        """Testing function direct_ingest."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.direct_ingest()
+        self.assertEqual(result, expected)
+
+    def test_segment_size(self):
+        """Testing function segment_size."""
+        # Initialize key values
+        expected = 16777216
+
+        # Test
+        result = self.config.segment_size()
+        self.assertEqual(result, expected)
+
+    def test_segment_age(self):
+        """Testing function segment_age."""
+        # Initialize key values
+        expected = 10
+
+        # Test
+        result = self.config.segment_age()
+        self.assertEqual(result, expected)
+
+    def test_segment_directory(self):
+        """Testing function segment_directory."""
+        # Test
+        result = self.config.segment_directory()
+        self.assertTrue(os.path.isdir(result))
+
     def test_daemon_directory(self):
         """Test pattoo_shared.Config inherited method daemon_directory."""
         # Nothing should happen. Directory exists in testing.
@@ -286,6 +417,114 @@ class TestConfigIngester(unittest.TestCase):
         result = self.config.multiprocessing()
         self.assertEqual(result, expected)
 
+    def test_single_pass(self):
+        """Testing function single_pass."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.single_pass()
+        self.assertEqual(result, expected)
+
+    def test_parse_in_workers(self):
+        """Testing function parse_in_workers."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.parse_in_workers()
+        self.assertEqual(result, expected)
+
+    def test_streaming(self):
+        """Testing function streaming."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.streaming()
+        self.assertEqual(result, expected)
+
+    def test_stream_max_records(self):
+        """Testing function stream_max_records."""
+        # Initialize key values
+        expected = 100000
+
+        # Test
+        result = self.config.stream_max_records()
+        self.assertEqual(result, expected)
+
+    def test_pipeline(self):
+        """Testing function pipeline."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.pipeline()
+        self.assertEqual(result, expected)
+
+    def test_pipeline_parsers(self):
+        """Testing function pipeline_parsers."""
+        # Initialize key values
+        expected = 2
+
+        # Test
+        result = self.config.pipeline_parsers()
+        self.assertEqual(result, expected)
+
+    def test_pipeline_writers(self):
+        """Testing function pipeline_writers."""
+        # Initialize key values
+        expected = os.cpu_count() or 1
+
+        # Test
+        result = self.config.pipeline_writers()
+        self.assertEqual(result, expected)
+
+    def test_pipeline_queue_size(self):
+        """Testing function pipeline_queue_size."""
+        # Initialize key values
+        expected = 100
+
+        # Test
+        result = self.config.pipeline_queue_size()
+        self.assertEqual(result, expected)
+
+    def test_coordinate(self):
+        """Testing function coordinate."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.coordinate()
+        self.assertEqual(result, expected)
+
+    def test_event_mode(self):
+        """Testing function event_mode."""
+        # Initialize key values
+        expected = False
+
+        # Test
+        result = self.config.event_mode()
+        self.assertEqual(result, expected)
+
+    def test_event_max_files(self):
+        """Testing function event_max_files."""
+        # Initialize key values
+        expected = 100
+
+        # Test
+        result = self.config.event_max_files()
+        self.assertEqual(result, expected)
+
+    def test_event_max_age(self):
+        """Testing function event_max_age."""
+        # Initialize key values
+        expected = 2
+
+        # Test
+        result = self.config.event_max_age()
+        self.assertEqual(result, expected)
+
     def test_batch_size(self):
         """Testing function batch_size."""
         # Initialize key values
@@ -295,6 +534,69 @@ class TestConfigIngester(unittest.TestCase):
         result = self.config.batch_size()
         self.assertEqual(result, expected)
 
+    def test_batch_duration(self):
+        """Testing function batch_duration."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.batch_duration()
+        self.assertEqual(result, expected)
+
+    def test_batch_max_memory(self):
+        """Testing function batch_max_memory."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.batch_max_memory()
+        self.assertEqual(result, expected)
+
+    def test_fileage(self):
+        """Testing function fileage."""
+        # Initialize key values
+        expected = 10
+
+        # Test
+        result = self.config.fileage()
+        self.assertEqual(result, expected)
+
+    def test_pair_cache_size(self):
+        """Testing function pair_cache_size."""
+        # Initialize key values
+        expected = 100000
+
+        # Test
+        result = self.config.pair_cache_size()
+        self.assertEqual(result, expected)
+
+    def test_data_chunk_size(self):
+        """Testing function data_chunk_size."""
+        # Initialize key values
+        expected = 1000
+
+        # Test
+        result = self.config.data_chunk_size()
+        self.assertEqual(result, expected)
+
+    def test_bulk_load_threshold(self):
+        """Testing function bulk_load_threshold."""
+        # Initialize key values
+        expected = 0
+
+        # Test
+        result = self.config.bulk_load_threshold()
+        self.assertEqual(result, expected)
+
+    def test_worker_max_tasks(self):
+        """Testing function worker_max_tasks."""
+        # Initialize key values
+        expected = 1000
+
+        # Test
+        result = self.config.worker_max_tasks()
+        self.assertEqual(result, expected)
+
     def test_daemon_directory(self):
         """Test pattoo_shared.Config inherited method daemon_directory."""
         # Nothing should happen. Directory exists in testing.
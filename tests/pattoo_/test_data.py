@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Test the data module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from tests.libraries.configuration import UnittestConfig
+from pattoo import data
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_integerize(self):
+        """Testing method / function integerize."""
+        # Test
+        self.assertEqual(data.integerize('1'), 1)
+        self.assertEqual(data.integerize(1.5), 1)
+        self.assertIsNone(data.integerize(True))
+        self.assertIsNone(data.integerize(False))
+        self.assertIsNone(data.integerize('a'))
+
+    def test_chunks(self):
+        """Testing method / function chunks."""
+        # Initialize key variables
+        items = list(range(0, 10))
+
+        # Test
+        result = data.chunks(items, 3)
+        self.assertEqual(result, [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]])
+        result = data.chunks(items, 10)
+        self.assertEqual(result, [items])
+        result = data.chunks([], 3)
+        self.assertEqual(result, [])
+
+        # Sizes less than one are treated as one
+        result = data.chunks(items[:2], 0)
+        self.assertEqual(result, [[0], [1]])
+
+    def test_shard(self):
+        """Testing method / function shard."""
+        # Test
+        for shards in range(1, 10):
+            result = data.shard('agent_id', shards)
+            self.assertEqual(result, data.shard('agent_id', shards))
+            self.assertTrue(0 <= result < shards)
+
+        # Shard counts less than one are treated as one
+        self.assertEqual(data.shard('agent_id', 0), 0)
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
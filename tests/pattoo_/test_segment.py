@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Test the segment module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import time
+import tempfile
+import shutil
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from tests.libraries.configuration import UnittestConfig
+from pattoo import segment
+from pattoo import serialize
+
+
+class TestSegmentWriter(unittest.TestCase):
+    """Checks all SegmentWriter methods."""
+
+    def setUp(self):
+        """Create a segment directory."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Delete the segment directory."""
+        shutil.rmtree(self.directory)
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_append(self):
+        """Testing method / function append."""
+        # Records are appended to a single active segment
+        writer = segment.SegmentWriter(self.directory)
+        for value in range(0, 10):
+            writer.append({'value': value})
+        filenames = os.listdir(self.directory)
+        self.assertEqual(len(filenames), 1)
+        self.assertTrue(filenames[0].endswith(segment.ACTIVE))
+
+        # Test the contents
+        result = [data for data, _ in segment.records(
+            os.path.join(self.directory, filenames[0]))]
+        self.assertEqual(result, [{'value': _} for _ in range(0, 10)])
+
+        # Segments are sealed when they are too large
+        writer = segment.SegmentWriter(self.directory, max_bytes=1)
+        writer.append({'value': 0})
+        filenames = [
+            _ for _ in os.listdir(self.directory) if _.endswith(
+                segment.SEALED)]
+        self.assertEqual(len(filenames), 1)
+
+    def test_extend(self):
+        """Testing method / function extend."""
+        # Test
+        writer = segment.SegmentWriter(self.directory)
+        writer.extend([{'value': _} for _ in range(0, 10)])
+        writer.extend([])
+        filenames = os.listdir(self.directory)
+        self.assertEqual(len(filenames), 1)
+        result = [data for data, _ in segment.records(
+            os.path.join(self.directory, filenames[0]))]
+        self.assertEqual(result, [{'value': _} for _ in range(0, 10)])
+
+    def test_close(self):
+        """Testing method / function close."""
+        # Test
+        writer = segment.SegmentWriter(self.directory)
+        writer.append({'value': 0})
+        writer.close()
+        filenames = os.listdir(self.directory)
+        self.assertEqual(len(filenames), 1)
+        self.assertTrue(filenames[0].endswith(segment.SEALED))
+
+        # Closing again does nothing
+        writer.close()
+
+
+class TestSegmentReader(unittest.TestCase):
+    """Checks all SegmentReader methods."""
+
+    def setUp(self):
+        """Create a segment directory."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Delete the segment directory."""
+        shutil.rmtree(self.directory)
+
+    def test___init__(self):
+        """Testing method / function __init__."""
+        pass
+
+    def test_read(self):
+        """Testing method / function read."""
+        # Create a sealed segment
+        writer = segment.SegmentWriter(self.directory)
+        for value in range(0, 10):
+            writer.append({'value': value})
+        writer.close()
+
+        # Records from active segments are not read
+        writer.append({'value': 10})
+
+        # Test
+        reader = segment.SegmentReader(self.directory)
+        result = reader.read(count=4)
+        self.assertEqual(
+            [data for _, data in result], [{'value': _} for _ in range(0, 4)])
+
+        # Without a commit the same records are read again
+        result = reader.read()
+        self.assertEqual(
+            [data for _, data in result], [{'value': _} for _ in range(0, 10)])
+
+    def test_commit(self):
+        """Testing method / function commit."""
+        # Create a sealed segment
+        writer = segment.SegmentWriter(self.directory)
+        for value in range(0, 10):
+            writer.append({'value': value})
+        writer.close()
+
+        # Reading resumes from the last commit, even with a new reader
+        reader = segment.SegmentReader(self.directory)
+        reader.read(count=4)
+        reader.commit()
+        reader = segment.SegmentReader(self.directory)
+        result = reader.read(count=4)
+        self.assertEqual(
+            [data for _, data in result], [{'value': _} for _ in range(4, 8)])
+        reader.commit()
+
+        # Completely read segments are deleted
+        result = reader.read()
+        self.assertEqual(
+            [data for _, data in result], [{'value': _} for _ in range(8, 10)])
+        reader.commit()
+        self.assertFalse(bool(os.listdir(self.directory)))
+
+    def test_segments(self):
+        """Testing method / function segments."""
+        # Test
+        reader = segment.SegmentReader(self.directory)
+        self.assertFalse(bool(reader.segments()))
+        for _ in range(0, 3):
+            writer = segment.SegmentWriter(self.directory)
+            writer.append({})
+            writer.close()
+        result = reader.segments()
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result, sorted(result))
+
+    def test_seal(self):
+        """Testing method / function seal."""
+        # Create an active segment
+        writer = segment.SegmentWriter(self.directory)
+        writer.append({'value': 0})
+
+        # Recently updated active segments are not sealed
+        reader = segment.SegmentReader(self.directory, max_age=3600)
+        reader.seal()
+        self.assertFalse(bool(reader.segments()))
+
+        # Idle active segments are sealed
+        time.sleep(1)
+        reader = segment.SegmentReader(self.directory, max_age=0)
+        reader.seal()
+        self.assertEqual(len(reader.segments()), 1)
+
+        # The writer creates a new active segment
+        writer.append({'value': 1})
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        reader = segment.SegmentReader(self.directory, max_age=3600)
+        result = reader.read()
+        self.assertEqual([data for _, data in result], [{'value': 0}])
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    def setUp(self):
+        """Create a segment directory."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Delete the segment directory."""
+        shutil.rmtree(self.directory)
+
+    def test_encode(self):
+        """Testing method / function encode."""
+        # Test
+        result = segment.encode({'value': 1})
+        self.assertEqual(
+            len(result), segment.HEADER.size + len(
+                serialize.dumps({'value': 1}).encode()))
+
+        # Records using the binary cache format are read the same way
+        filepath = os.path.join(self.directory, 'test.segment')
+        with open(filepath, 'wb') as f_handle:
+            f_handle.write(segment.encode({'value': 1}, binary=True))
+        result = list(segment.records(filepath))
+        self.assertEqual(result[0][0], {'value': 1})
+
+    def test_records(self):
+        """Testing method / function records."""
+        # Initialize key variables
+        filepath = os.path.join(self.directory, 'test.segment')
+        first = segment.encode({'value': 0})
+        second = segment.encode({'value': 1})
+
+        # Create a segment with an incomplete final record
+        with open(filepath, 'wb') as f_handle:
+            f_handle.write(first + second + second[:-1])
+
+        # Test
+        result = list(segment.records(filepath))
+        self.assertEqual(
+            result, [({'value': 0}, len(first)),
+                     ({'value': 1}, len(first) + len(second))])
+
+        # Test with offset
+        result = list(segment.records(filepath, offset=len(first)))
+        self.assertEqual(
+            result, [({'value': 1}, len(first) + len(second))])
+
+    def test__offset(self):
+        """Testing method / function _offset."""
+        # Initialize key variables
+        filepath = os.path.join(self.directory, 'test.segment')
+
+        # Test
+        self.assertEqual(segment._offset(filepath), 0)
+        with open('{}{}'.format(filepath, segment.OFFSET), 'w') as f_handle:
+            f_handle.write('100')
+        self.assertEqual(segment._offset(filepath), 100)
+
+    def test__sealed(self):
+        """Testing method / function _sealed."""
+        # Test
+        result = segment._sealed('/tmp/1_2_3.active')
+        self.assertEqual(result, '/tmp/1_2_3.segment')
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()
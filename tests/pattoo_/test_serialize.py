@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Test the serialize module."""
+
+# Standard imports
+import unittest
+import os
+import sys
+import json
+
+# Try to create a working PYTHONPATH
+EXEC_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(
+    os.path.abspath(os.path.join(EXEC_DIR, os.pardir)), os.pardir))
+_EXPECTED = '{0}pattoo{0}tests{0}pattoo_'.format(os.sep)
+if EXEC_DIR.endswith(_EXPECTED) is True:
+    # We need to prepend the path in case the repo has been installed
+    # elsewhere on the system using PIP. This could corrupt expected results
+    sys.path.insert(0, ROOT_DIR)
+else:
+    print('''This script is not installed in the "{0}" directory. Please fix.\
+'''.format(_EXPECTED))
+    sys.exit(2)
+
+# Pattoo imports
+from tests.libraries.configuration import UnittestConfig
+from pattoo import serialize
+
+
+class TestBasicFunctions(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    def test_backend(self):
+        """Testing method / function backend."""
+        # Test
+        result = serialize.backend()
+        self.assertIn(result, ['orjson', 'ujson', 'json'])
+
+    def test_loads(self):
+        """Testing method / function loads."""
+        # Initialize key variables
+        expected = {'key': [1, 2.5, 'value', None, True]}
+        text = json.dumps(expected)
+
+        # Test
+        self.assertEqual(serialize.loads(text), expected)
+        self.assertEqual(serialize.loads(text.encode()), expected)
+
+        # Data only the json module accepts
+        result = serialize.loads('{"key": NaN}')
+        self.assertNotEqual(result['key'], result['key'])
+
+        # Invalid data
+        with self.assertRaises(ValueError):
+            serialize.loads('{')
+
+    def test_dumps(self):
+        """Testing method / function dumps."""
+        # Initialize key variables
+        expected = {'key': [1, 2.5, 'value', None, True]}
+
+        # The result is standard JSON
+        result = serialize.dumps(expected)
+        self.assertTrue(isinstance(result, str))
+        self.assertEqual(json.loads(result), expected)
+
+        # Data only the json module can encode
+        expected = {'key': 2 ** 70}
+        result = serialize.dumps(expected)
+        self.assertEqual(json.loads(result), expected)
+
+    def test_binary_supported(self):
+        """Testing method / function binary_supported."""
+        # Test
+        result = serialize.binary_supported()
+        self.assertEqual(result, serialize.msgpack is not None)
+
+    def test_encode(self):
+        """Testing method / function encode."""
+        # Initialize key variables
+        expected = {'key': [1, 2.5, 'value', None, True]}
+
+        # JSON
+        result = serialize.encode(expected)
+        self.assertEqual(json.loads(result.decode()), expected)
+
+        # Binary format. JSON is used if msgpack isn't installed.
+        result = serialize.encode(expected, binary=True)
+        if serialize.binary_supported() is True:
+            self.assertTrue(result.startswith(serialize.MAGIC))
+        else:
+            self.assertEqual(json.loads(result.decode()), expected)
+
+    def test_suffix(self):
+        """Testing method / function suffix."""
+        # Initialize key variables
+        expected = {'key': 'value'}
+
+        # Test
+        result = serialize.suffix(serialize.encode(expected))
+        self.assertEqual(result, '.json')
+        result = serialize.suffix(serialize.encode(expected, binary=True))
+        if serialize.binary_supported() is True:
+            self.assertEqual(result, '.msgpack')
+        else:
+            self.assertEqual(result, '.json')
+
+    def test_decode(self):
+        """Testing method / function decode."""
+        # Initialize key variables
+        expected = {'key': [1, 2.5, 'value', None, True]}
+
+        # Test both formats
+        for binary in [False, True]:
+            encoded = serialize.encode(expected, binary=binary)
+            self.assertEqual(serialize.decode(encoded), expected)
+        self.assertEqual(serialize.decode(json.dumps(expected)), expected)
+
+        # Unsupported versions
+        with self.assertRaises(ValueError):
+            serialize.decode(serialize.MAGIC + bytes([255]))
+
+
+if __name__ == '__main__':
+    # Make sure the environment is OK to run unittests
+    UnittestConfig().create()
+
+    # Do the unit test
+    unittest.main()